@@ -1,16 +1,233 @@
+import ast
+import inspect
 import random
-from typing import Optional, Tuple
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
+from .bitboard import BitBoard
+from .bitops import get_moves_mask, iter_bits, iter_squares
 from .board import Board
+from .endgame import EXACT_MODE, EndgameSolver
+from .eval_state import EvalState
 from .game import Game
+from .opening_book import OpeningBook
+from .pattern_eval import PATTERN_SCALE, get_pattern_evaluator
+from .stability import count_stable
+from .transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+POSITION_VALUES = [
+    [100, -20, 10, 5, 5, 10, -20, 100],
+    [-20, -50, -2, -2, -2, -2, -50, -20],
+    [10, -2, 1, 0, 0, 1, -2, 10],
+    [5, -2, 0, 0, 0, 0, -2, 5],
+    [5, -2, 0, 0, 0, 0, -2, 5],
+    [10, -2, 1, 0, 0, 1, -2, 10],
+    [-20, -50, -2, -2, -2, -2, -50, -20],
+    [100, -20, 10, 5, 5, 10, -20, 100],
+]
+# マスのビット位置で引ける POSITION_VALUES
+SQUARE_VALUES = [value for row in POSITION_VALUES for value in row]
+
+# evaluate_board の評価関数
+POSITION_EVALUATOR = "position"  # マスの評価値の合計
+PATTERN_EVALUATOR = "pattern"  # パターンの重み表 (pattern_eval)
+
+MAX_PLY = 128
+KILLER_BONUS = 1 << 20
+TT_MOVE_BONUS = 1 << 30
+
+# spec に書ける AI の引数と、その値を持つ属性
+SPEC_OPTIONS = (
+    ("tt_size", "_tt_size"),
+    ("time_limit", "time_limit"),
+    ("node_limit", "node_limit"),
+    ("max_depth", "max_depth"),
+    ("move_ordering", "move_ordering"),
+    ("endgame_empties", "endgame_empties"),
+    ("endgame_mode", "endgame_mode"),
+    ("workers", "workers"),
+    ("evaluator", "evaluator"),
+    ("incremental_eval", "incremental_eval"),
+    ("book", "_book_path"),
+)
+# spec に書けない評価の重み
+WEIGHT_ATTRIBUTES = (
+    "corner_weight",
+    "edge_weight",
+    "mobility_weight",
+    "stability_weight",
+)
+
+
+def parse_ai_spec(spec: str) -> Tuple[str, Dict]:
+    """AI の指定を (難易度, AI の引数) に分ける
+
+    指定は難易度だけか、"hard:max_depth=4,evaluator=pattern" のように
+    コロンの後にコンストラクタ引数を並べたもの。
+
+    値は Python のリテラルとして読めればその値、読めなければ文字列にする。
+    """
+    difficulty, _, options_text = spec.partition(":")
+    options = {}
+    for item in filter(None, options_text.split(",")):
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid AI option: {item}")
+        options[name.strip()] = _parse_spec_value(value.strip())
+    return difficulty, options
+
+
+def _parse_spec_value(text: str):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def _format_spec_value(value) -> str:
+    """parse_ai_spec で value に戻る文字列。文字列は読み違えなければ引用符を省く"""
+    if isinstance(value, str) and _parse_spec_value(value) == value:
+        return value
+    return repr(value)
+
+
+class SearchAborted(Exception):
+    """探索の時間またはノード数の予算を使い切った"""
 
 
 class AI:
-    def __init__(self, difficulty: str = "easy"):
+    def __init__(
+        self,
+        difficulty: str = "easy",
+        tt_size: int = 1 << 16,
+        time_limit: Optional[float] = 0.5,
+        node_limit: Optional[int] = None,
+        max_depth: int = 60,
+        move_ordering: bool = True,
+        endgame_empties: int = 10,
+        endgame_mode: str = EXACT_MODE,
+        workers: int = 1,
+        evaluator: str = POSITION_EVALUATOR,
+        incremental_eval: bool = True,
+        book: Optional[Union[str, Path, OpeningBook]] = None,
+    ):
         self.difficulty = difficulty
+        # from_spec で作ったときの難易度以外の部分 ("max_depth=4" など)。
+        # 引数が変わっていなければ spec はこの書き方のまま返す
+        self._spec_options = ""
         self.corner_weight = 100
         self.edge_weight = 10
         self.mobility_weight = 5
+        # 確定石1つあたりの重み。0 なら確定石を数えない
+        self.stability_weight = 10
+        self.evaluator = evaluator
+        self.pattern_evaluator = (
+            get_pattern_evaluator(tuple(SQUARE_VALUES))
+            if evaluator == PATTERN_EVALUATOR
+            else None
+        )
+        # 探索中は評価の状態を着手ごとに差分更新する
+        self.incremental_eval = incremental_eval
+        self._incremental: Optional[EvalState] = None
+        self._eval_state: Optional[EvalState] = None
+        # tt_size=0 で置換表を使わない。置換表と終盤ソルバーは探索する AI だけが
+        # 使うので、最初に使うときに作る
+        self._tt_size = tt_size
+        self._tt: Optional[TranspositionTable] = None
+        self._endgame_solver: Optional[EndgameSolver] = None
+        # hard の1手あたりの予算 (秒 / ノード数)。None なら制限しない
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        # 置換表の手・キラー手・ヒストリー・静的評価による手順並べ替え
+        self.move_ordering = move_ordering
+        self._killers: List[List[Optional[Tuple[int, int]]]] = [
+            [None, None] for _ in range(MAX_PLY)
+        ]
+        self._history = {Board.BLACK: [0] * 64, Board.WHITE: [0] * 64}
+        # 空きマスが endgame_empties 以下なら評価関数を使わずに読み切る
+        self.endgame_empties = endgame_empties
+        self.endgame_mode = endgame_mode
+        # workers > 1 ならルートの手をプロセスプールで並列に読む
+        self.workers = workers
+        # hard は探索の前に定石ブックを引く。パスを渡したときは自分で開いて閉じる
+        self._owns_book = book is not None and not isinstance(book, OpeningBook)
+        self._book_path = str(book) if self._owns_book else None
+        self.book: Optional[OpeningBook] = (
+            OpeningBook(book) if self._owns_book else book
+        )
+        self._parallel_search = None
+        self.nodes = 0
+        self.last_search: Dict = {}
+        self._deadline: Optional[float] = None
+        self._node_budget: Optional[int] = None
+        self._root_best: Optional[Tuple[Tuple[int, int], float]] = None
+
+    @property
+    def tt(self) -> Optional[TranspositionTable]:
+        if self._tt is None and self._tt_size > 0:
+            self._tt = TranspositionTable(self._tt_size)
+        return self._tt
+
+    @tt.setter
+    def tt(self, table: Optional[TranspositionTable]):
+        self._tt = table
+        if table is None:
+            self._tt_size = 0
+
+    @property
+    def endgame_solver(self) -> EndgameSolver:
+        if self._endgame_solver is None:
+            self._endgame_solver = EndgameSolver()
+        return self._endgame_solver
+
+    def get_spec_options(self) -> Dict:
+        """今の設定のうち、既定値と違う AI の引数"""
+        options = {}
+        for name, attribute in SPEC_OPTIONS:
+            value = getattr(self, attribute)
+            if value != SPEC_DEFAULTS[name]:
+                options[name] = value
+        return options
+
+    @property
+    def spec(self) -> str:
+        """同じ設定の AI を作り直すための指定 (from_spec)
+
+        difficulty や引数に当たる属性を後から変えたときも、今の値から作る。
+        """
+        options = self.get_spec_options()
+        if not options:
+            return self.difficulty
+        if parse_ai_spec(f":{self._spec_options}")[1] != options:
+            self._spec_options = ",".join(
+                f"{name}={_format_spec_value(value)}" for name, value in options.items()
+            )
+        return f"{self.difficulty}:{self._spec_options}"
+
+    def can_rebuild_from_spec(self) -> bool:
+        """spec から同じ AI を作り直せるか
+
+        定石ブックのオブジェクトを渡したときや、評価の重みを変えたときは
+        spec に書けないので作り直せない。
+        """
+        if self.book is not None and not self._owns_book:
+            return False
+        default = AI()
+        if any(
+            getattr(self, name) != getattr(default, name) for name in WEIGHT_ATTRIBUTES
+        ):
+            return False
+        return parse_ai_spec(self.spec) == (self.difficulty, self.get_spec_options())
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "AI":
+        """parse_ai_spec の形式の指定から AI を作る"""
+        difficulty, options = parse_ai_spec(spec)
+        ai = cls(difficulty=difficulty, **options)
+        ai._spec_options = spec.partition(":")[2]
+        return ai
 
     def get_move(self, game: Game) -> Optional[Tuple[int, int]]:
         valid_moves = game.get_valid_moves()
@@ -22,7 +239,7 @@ class AI:
         elif self.difficulty == "medium":
             return self.get_greedy_move(game, valid_moves)
         else:
-            return self.get_smart_move(game, valid_moves)
+            return self.get_search_move(game, valid_moves)
 
     def get_random_move(self, valid_moves: list) -> Tuple[int, int]:
         return random.choice(valid_moves)
@@ -51,6 +268,290 @@ class AI:
 
         return best_move
 
+    def get_search_move(self, game: Game, valid_moves: list) -> Tuple[int, int]:
+        if len(valid_moves) == 1:
+            return valid_moves[0]
+
+        if self.book is not None:
+            book_move = self.book.get_move(game.board, game.current_player)
+            if book_move is not None:
+                move, score = book_move
+                self.last_search = {
+                    "move": move,
+                    "score": float(score),
+                    "depth": 0,
+                    "nodes": 0,
+                    "book": True,
+                }
+                return move
+
+        # 探索は作業用の BitBoard 上で行い、ゲームの盤面には触れない
+        black, white = game.board.get_bits(Board.BLACK)
+        board = BitBoard()
+        board.set_bits(black, white)
+        if board.empties <= self.endgame_empties:
+            move, _ = self.solve_endgame(board, game.current_player)
+        elif self.workers > 1:
+            move, _ = self.parallel_iterative_deepening(board, game.current_player)
+        else:
+            move, _ = self.iterative_deepening(board, game.current_player)
+        return move if move is not None else valid_moves[0]
+
+    def parallel_iterative_deepening(
+        self, board: Board, player: int
+    ) -> Tuple[Optional[Tuple[int, int]], float]:
+        """ParallelSearch による反復深化。プロセスプールは close() まで使い回す"""
+        if self._parallel_search is None:
+            from .parallel_search import ParallelSearch
+
+            # ワーカーごとに置換表を持たず、共有メモリ上の1つの表を使う。
+            # tt_size=0 なら共有の表も作らない
+            self._parallel_search = ParallelSearch(
+                self.workers,
+                {
+                    "tt_size": 0,
+                    "move_ordering": self.move_ordering,
+                    "evaluator": self.evaluator,
+                },
+                shared_tt_size=self._tt_size,
+            )
+        result = self._parallel_search.iterative_deepening(
+            board, player, self.time_limit, self.max_depth
+        )
+        self.last_search = dict(self._parallel_search.last_search)
+        return result
+
+    def close(self):
+        """並列探索のプロセスプールと、自分で開いた定石ブックを閉じる"""
+        if self._parallel_search is not None:
+            self._parallel_search.close()
+            self._parallel_search = None
+        if self._owns_book and self.book is not None:
+            self.book.close()
+            self.book = None
+
+    def solve_endgame(
+        self, board: Board, player: int
+    ) -> Tuple[Optional[Tuple[int, int]], float]:
+        """終盤ソルバーで読み切り、最善手と石差を返す"""
+        start = time.perf_counter()
+        score, move = self.endgame_solver.solve(board, player, self.endgame_mode)
+        self.last_search = {
+            "move": move,
+            "score": float(score),
+            "depth": board.empties,
+            "nodes": self.endgame_solver.nodes,
+            "solved": self.endgame_mode,
+            "time": time.perf_counter() - start,
+        }
+        return move, float(score)
+
+    def iterative_deepening(
+        self,
+        board: Board,
+        player: int,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> Tuple[Optional[Tuple[int, int]], float]:
+        """予算内で深さを1ずつ増やして探索し、見つかった最善手と評価値を返す
+
+        予算切れで途中の深さを打ち切った場合も、その深さで既に評価し終えた
+        ルートの手が前回の最善手を上回っていればそちらを返す。
+        """
+        time_limit = self.time_limit if time_limit is None else time_limit
+        node_limit = self.node_limit if node_limit is None else node_limit
+        max_depth = self.max_depth if max_depth is None else max_depth
+
+        start = time.perf_counter()
+        self.begin_search(time_limit, node_limit)
+        self._reset_ordering()
+        root_mask = board.get_valid_moves_mask(player)
+        best_move = next(iter_squares(root_mask), None)
+        best_score = float("-inf")
+        completed_depth = 0
+        iteration_nodes = []
+
+        try:
+            for depth in range(1, max_depth + 1):
+                self._root_best = None
+                nodes_before = self.nodes
+                try:
+                    best_score, best_move = self._search_root(
+                        board, depth, player, root_mask, best_move
+                    )
+                except SearchAborted:
+                    if self._root_best is not None:
+                        best_move, best_score = self._root_best
+                    break
+                completed_depth = depth
+                iteration_nodes.append(self.nodes - nodes_before)
+                if depth >= board.empties:
+                    break
+        finally:
+            self.end_search()
+
+        self.last_search = {
+            "move": best_move,
+            "score": best_score,
+            "depth": completed_depth,
+            "nodes": self.nodes,
+            "iteration_nodes": iteration_nodes,
+            "ebf": self.effective_branching_factor(iteration_nodes),
+            "time": time.perf_counter() - start,
+        }
+        return best_move, best_score
+
+    @staticmethod
+    def effective_branching_factor(iteration_nodes: List[int]) -> float:
+        """最後に完了した深さ d のノード数 N から N ** (1 / d) を求める"""
+        if not iteration_nodes:
+            return 0.0
+        return iteration_nodes[-1] ** (1 / len(iteration_nodes))
+
+    def _search_root(
+        self,
+        board: Board,
+        depth: int,
+        player: int,
+        root_mask: int,
+        first_move: Optional[Tuple[int, int]],
+    ) -> Tuple[float, Optional[Tuple[int, int]]]:
+        root_moves = self._get_ordered_root_moves(root_mask, player, first_move)
+        alpha = float("-inf")
+        best_score = float("-inf")
+        best_move = None
+        for move in root_moves:
+            score = self.search_root_move(board, player, move, depth, alpha)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                self._root_best = (move, score)
+            alpha = max(alpha, score)
+
+        return best_score, best_move
+
+    def get_root_moves(
+        self,
+        board: Board,
+        player: int,
+        first_move: Optional[Tuple[int, int]] = None,
+    ) -> List[Tuple[int, int]]:
+        """ルートで読む順に並べた合法手。first_move があれば先頭に置く"""
+        return self._get_ordered_root_moves(
+            board.get_valid_moves_mask(player), player, first_move
+        )
+
+    def _get_ordered_root_moves(
+        self, root_mask: int, player: int, first_move: Optional[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        root_moves = self._order_moves(root_mask, player, 0, first_move)
+        if first_move in root_moves and root_moves[0] != first_move:
+            root_moves.remove(first_move)
+            root_moves.insert(0, first_move)
+        return root_moves
+
+    def search_root_move(
+        self,
+        board: Board,
+        player: int,
+        move: Tuple[int, int],
+        depth: int,
+        alpha: float = float("-inf"),
+    ) -> float:
+        """ルートで move を打った後を読み、player から見た評価値を返す
+
+        alpha 以下になった場合の戻り値は正確な値ではなく上限値になる。
+        """
+        attached = self._attach_eval(board)
+        state = self._eval_state
+        record = board.apply_move(move[0], move[1], player)
+        if state is not None:
+            state.apply(record)
+        try:
+            score, _ = self._negamax(
+                board, depth - 1, board.get_opponent(player), float("-inf"), -alpha, 1
+            )
+        finally:
+            board.unmake_move(record)
+            if state is not None:
+                state.undo(record)
+            if attached:
+                self._eval_state = None
+        return -score
+
+    def _attach_eval(self, board: Board) -> bool:
+        """board を読む間の差分評価を始める。新たに始めたときだけ True"""
+        if not self.incremental_eval:
+            return False
+        if self._eval_state is not None and self._eval_state.board is board:
+            return False
+        if self._incremental is None:
+            self._incremental = EvalState(SQUARE_VALUES, self.pattern_evaluator)
+        self._incremental.reset(board)
+        self._eval_state = self._incremental
+        return True
+
+    def begin_search(
+        self, time_limit: Optional[float] = None, node_limit: Optional[int] = None
+    ):
+        """ノード数を数え直し、探索の予算を設定する"""
+        self.nodes = 0
+        self._deadline = time.perf_counter() + time_limit if time_limit else None
+        self._node_budget = node_limit
+
+    def end_search(self):
+        self._deadline = None
+        self._node_budget = None
+
+    def _reset_ordering(self):
+        for killers in self._killers:
+            killers[0] = killers[1] = None
+        # 前回の探索のヒストリーは半分に減衰させて引き継ぐ
+        for table in self._history.values():
+            for index in range(64):
+                table[index] >>= 1
+
+    def _order_moves(
+        self,
+        moves_mask: int,
+        player: int,
+        ply: int,
+        tt_move: Optional[Tuple[int, int]],
+    ) -> List[Tuple[int, int]]:
+        moves = list(iter_squares(moves_mask))
+        if not self.move_ordering or len(moves) < 2:
+            return moves
+
+        killers = self._killers[ply] if ply < MAX_PLY else (None, None)
+        history = self._history[player]
+
+        def priority(move: Tuple[int, int]) -> int:
+            if move == tt_move:
+                return TT_MOVE_BONUS
+            square = move[0] * 8 + move[1]
+            score = history[square] + SQUARE_VALUES[square]
+            if move == killers[0] or move == killers[1]:
+                score += KILLER_BONUS
+            return score
+
+        moves.sort(key=priority, reverse=True)
+        return moves
+
+    def _record_cutoff(self, move: Tuple[int, int], player: int, depth: int, ply: int):
+        if ply < MAX_PLY:
+            killers = self._killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self._history[player][move[0] * 8 + move[1]] += depth * depth
+
+    def _check_budget(self):
+        if self._node_budget is not None and self.nodes >= self._node_budget:
+            raise SearchAborted()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchAborted()
+
     def evaluate_move(self, game: Game, move: Tuple[int, int]) -> float:
         row, col = move
         score = 0
@@ -79,15 +580,16 @@ class AI:
         if (row, col) in bad_positions:
             score -= self.edge_weight * 2
 
-        temp_board = game.board.copy()
-        temp_board.place_stone(row, col, game.current_player)
+        board = game.board
+        record = board.apply_move(row, col, game.current_player)
 
-        opponent = game.board.get_opponent(game.current_player)
-        opponent_moves = temp_board.get_valid_moves(opponent)
-        score -= len(opponent_moves) * self.mobility_weight
+        opponent = board.get_opponent(game.current_player)
+        opponent_mobility = board.get_valid_moves_mask(opponent).bit_count()
+        score -= opponent_mobility * self.mobility_weight
 
-        flips = len(game.board.get_flips(row, col, game.current_player))
-        score += flips * 2
+        if record is not None:
+            board.unmake_move(record)
+            score += record[3].bit_count() * 2
 
         return score
 
@@ -100,94 +602,134 @@ class AI:
         beta: float,
         maximizing: bool,
     ) -> Tuple[float, Optional[Tuple[int, int]]]:
+        """alpha-beta 探索。maximizing=False なら相手視点の値を符号反転して返す"""
+        attached = self._attach_eval(board)
+        try:
+            if maximizing:
+                return self._negamax(board, depth, player, alpha, beta)
+
+            score, move = self._negamax(board, depth, player, -beta, -alpha)
+            return -score, move
+        finally:
+            if attached:
+                self._eval_state = None
+
+    def _negamax(
+        self,
+        board: Board,
+        depth: int,
+        player: int,
+        alpha: float,
+        beta: float,
+        ply: int = 0,
+    ) -> Tuple[float, Optional[Tuple[int, int]]]:
+        """手番 player から見た評価値と最善手を返す"""
+        self.nodes += 1
+        if self.nodes & 255 == 0:
+            self._check_budget()
+        alpha_orig = alpha
+        key = 0
+        tt_move = None
+        tt = self.tt
+
+        if tt is not None:
+            key = board.position_hash(player)
+            entry = tt.probe(key)
+            if entry is not None:
+                tt_move = entry[4]
+            if entry is not None and entry[1] >= depth:
+                _, _, score, flag, move = entry
+                if flag == EXACT:
+                    return score, move
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score, move
+
         if depth == 0:
             return self.evaluate_board(board, player), None
 
-        valid_moves = board.get_valid_moves(player)
-        if not valid_moves:
-            opponent = board.get_opponent(player)
-            opponent_moves = board.get_valid_moves(opponent)
-            if not opponent_moves:
+        opponent = board.get_opponent(player)
+        moves_mask = board.get_valid_moves_mask(player)
+        if not moves_mask:
+            if not board.get_valid_moves_mask(opponent):
                 return self.evaluate_board(board, player), None
-            else:
-                score, _ = self.minimax(
-                    board, depth - 1, opponent, alpha, beta, not maximizing
-                )
-                return score, None
+            score, _ = self._negamax(board, depth - 1, opponent, -beta, -alpha, ply + 1)
+            return -score, None
 
+        state = self._eval_state
+        best_score = float("-inf")
         best_move = None
-
-        if maximizing:
-            max_eval = float("-inf")
-            for move in valid_moves:
-                temp_board = board.copy()
-                temp_board.place_stone(move[0], move[1], player)
-
-                eval_score, _ = self.minimax(
-                    temp_board,
-                    depth - 1,
-                    board.get_opponent(player),
-                    alpha,
-                    beta,
-                    False,
+        for move in self._order_moves(moves_mask, player, ply, tt_move):
+            record = board.apply_move(move[0], move[1], player)
+            if state is not None:
+                state.apply(record)
+            try:
+                score, _ = self._negamax(
+                    board, depth - 1, opponent, -beta, -alpha, ply + 1
                 )
+            finally:
+                board.unmake_move(record)
+                if state is not None:
+                    state.undo(record)
+            score = -score
 
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = move
-
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-
-            return max_eval, best_move
-        else:
-            min_eval = float("inf")
-            for move in valid_moves:
-                temp_board = board.copy()
-                temp_board.place_stone(move[0], move[1], player)
-
-                eval_score, _ = self.minimax(
-                    temp_board, depth - 1, board.get_opponent(player), alpha, beta, True
-                )
-
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_move = move
-
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if self.move_ordering:
+                    self._record_cutoff(move, player, depth, ply)
+                break
+
+        if tt is not None:
+            if best_score <= alpha_orig:
+                flag = UPPER
+            elif best_score >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, depth, best_score, flag, best_move)
 
-            return min_eval, best_move
+        return best_score, best_move
 
     def evaluate_board(self, board: Board, player: int) -> float:
-        score = 0.0
-        opponent = board.get_opponent(player)
+        own, opp = board.get_bits(player)
+        player_mobility = get_moves_mask(own, opp).bit_count()
+        opponent_mobility = get_moves_mask(opp, own).bit_count()
+        # 可動性と確定石は差分更新できないため毎回数える
+        extra = (player_mobility - opponent_mobility) * self.mobility_weight
+        if self.stability_weight:
+            stable = count_stable(own, opp) - count_stable(opp, own)
+            extra += stable * self.stability_weight
+        if self.pattern_evaluator is not None:
+            extra *= PATTERN_SCALE
+
+        # 探索中の盤面なら差分更新した値を使う
+        state = self._eval_state
+        if state is not None and state.board is board:
+            return float(state.get_score(player) + extra)
+
+        if self.pattern_evaluator is not None:
+            return float(self.pattern_evaluator.evaluate(own, opp) + extra)
 
-        for row in range(8):
-            for col in range(8):
-                cell = board.get_cell(row, col)
-                if cell == player:
-                    score += self.get_position_value(row, col)
-                elif cell == opponent:
-                    score -= self.get_position_value(row, col)
+        score = 0
+        for square in iter_bits(own):
+            score += SQUARE_VALUES[square]
+        for square in iter_bits(opp):
+            score -= SQUARE_VALUES[square]
+        return float(score + extra)
 
-        player_mobility = len(board.get_valid_moves(player))
-        opponent_mobility = len(board.get_valid_moves(opponent))
-        score += (player_mobility - opponent_mobility) * self.mobility_weight
+    def get_position_value(self, row: int, col: int) -> int:
+        return POSITION_VALUES[row][col]
 
-        return float(score)
 
-    def get_position_value(self, row: int, col: int) -> int:
-        position_values = [
-            [100, -20, 10, 5, 5, 10, -20, 100],
-            [-20, -50, -2, -2, -2, -2, -50, -20],
-            [10, -2, 1, 0, 0, 1, -2, 10],
-            [5, -2, 0, 0, 0, 0, -2, 5],
-            [5, -2, 0, 0, 0, 0, -2, 5],
-            [10, -2, 1, 0, 0, 1, -2, 10],
-            [-20, -50, -2, -2, -2, -2, -50, -20],
-            [100, -20, 10, 5, 5, 10, -20, 100],
-        ]
-        return position_values[row][col]
+# SPEC_OPTIONS の既定値 (AI.__init__ の引数の既定値)
+SPEC_DEFAULTS = {
+    name: inspect.signature(AI.__init__).parameters[name].default
+    for name, _ in SPEC_OPTIONS
+}
@@ -1,11 +1,13 @@
 import asyncio
-from dataclasses import dataclass
+import json
+from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Callable, Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
 
 from .ai import AI
 from .board import Board
 from .game import Game
+from .online_stats import QuantileSketch, RunningStats
 
 
 class PlayMode(Enum):
@@ -27,8 +29,23 @@ class GameResult:
     black_score: int
     white_score: int
     total_moves: int
+    # AI の指定 (AI.spec)。引数なしなら難易度そのもの
     black_ai_difficulty: str
     white_ai_difficulty: str
+    # 着手の記録 (row, col, player)。定石ブックの作成に使う。記録しなければ None
+    moves: Optional[List[Tuple[int, int, int]]] = None
+
+
+@dataclass
+class PairingStats:
+    """(黒の AI, 白の AI) の組み合わせごとの集計"""
+
+    games: int = 0
+    black_wins: int = 0
+    white_wins: int = 0
+    draws: int = 0
+    # 黒から見た石差
+    margin: RunningStats = field(default_factory=RunningStats)
 
 
 @dataclass
@@ -43,6 +60,19 @@ class Statistics:
     min_moves: int = float("inf")
     max_moves: int = 0
     results: list = None
+    # False なら results に結果を残さず、下の集計だけを更新する (メモリ一定)
+    keep_results: bool = True
+    # 指定すると結果を1行ずつ JSON でこのファイルに追記する
+    spill_path: Optional[str] = None
+    move_stats: RunningStats = field(default_factory=RunningStats)
+    # 黒から見た石差
+    margin_stats: RunningStats = field(default_factory=RunningStats)
+    move_sketch: QuantileSketch = field(default_factory=lambda: QuantileSketch(0, 60))
+    margin_sketch: QuantileSketch = field(
+        default_factory=lambda: QuantileSketch(-64, 64)
+    )
+    pairings: Dict[Tuple[str, str], PairingStats] = field(default_factory=dict)
+    _spill_file: Optional[TextIO] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         if self.results is None:
@@ -54,16 +84,56 @@ class Statistics:
         self.total_black_score += result.black_score
         self.total_white_score += result.white_score
 
+        key = (result.black_ai_difficulty, result.white_ai_difficulty)
+        pairing = self.pairings.get(key)
+        if pairing is None:
+            pairing = self.pairings[key] = PairingStats()
+        pairing.games += 1
+
         if result.winner == Board.BLACK:
             self.black_wins += 1
+            pairing.black_wins += 1
         elif result.winner == Board.WHITE:
             self.white_wins += 1
+            pairing.white_wins += 1
         else:
             self.draws += 1
+            pairing.draws += 1
 
         self.min_moves = min(self.min_moves, result.total_moves)
         self.max_moves = max(self.max_moves, result.total_moves)
-        self.results.append(result)
+
+        margin = result.black_score - result.white_score
+        self.move_stats.add(result.total_moves)
+        self.margin_stats.add(margin)
+        self.move_sketch.add(result.total_moves)
+        self.margin_sketch.add(margin)
+        pairing.margin.add(margin)
+
+        if self.keep_results:
+            self.results.append(result)
+        if self.spill_path is not None:
+            self._spill(result)
+
+    def _spill(self, result: GameResult):
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+        self._spill_file.write(json.dumps(asdict(result), separators=(",", ":")))
+        self._spill_file.write("\n")
+        self._spill_file.flush()
+
+    def close(self):
+        """書き出し先のファイルを閉じる"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def get_move_quantile(self, q: float) -> int:
+        return self.move_sketch.quantile(q)
+
+    def get_margin_quantile(self, q: float) -> int:
+        """黒から見た石差の q 分位点"""
+        return self.margin_sketch.quantile(q)
 
     def get_win_rate(self, player: int) -> float:
         if self.total_games == 0:
@@ -88,8 +158,8 @@ class Statistics:
 
 
 class AutoPlayManager:
-    def __init__(self):
-        self.game = Game()
+    def __init__(self, use_bitboard: bool = False):
+        self.game = Game(use_bitboard=use_bitboard)
         self.black_ai: Optional[AI] = None
         self.white_ai: Optional[AI] = None
         self.state = AutoPlayState.IDLE
@@ -104,13 +174,29 @@ class AutoPlayManager:
         self.on_all_games_end: Optional[Callable] = None
         self._play_task: Optional[asyncio.Task] = None
         self._stop_requested = False
+        # 設定すると終局ごとに棋譜を渡す (BookBuilder など)
+        self.book_builder = None
+        # True なら GameResult に棋譜を残す。book_builder があれば常に残す
+        self.record_moves = False
+        # False なら Statistics に結果を残さず集計だけする。spill_path に書き出せる
+        self.keep_results = True
+        self.spill_path: Optional[str] = None
+        # 瞬間実行で easy/medium 同士なら BoardBatch で複数局をまとめて進める
+        self.lockstep = False
+        self.lockstep_lanes = 256
+        # 2以上なら瞬間実行の対局をプロセスプールで分担する
+        self.workers = 1
+        # 直近の並列実行でのワーカー (pid) ごとの稼働率
+        self.worker_utilisation: Dict[int, float] = {}
+        # lockstep/並列実行で使う乱数の種
+        self.seed: Optional[int] = None
 
     def set_ai_players(
         self, black_difficulty: str = "medium", white_difficulty: str = "medium"
     ):
-        """AI プレイヤーを設定"""
-        self.black_ai = AI(difficulty=black_difficulty)
-        self.white_ai = AI(difficulty=white_difficulty)
+        """AI プレイヤーを設定 ("hard:max_depth=4" のような引数付きの指定も可)"""
+        self.black_ai = AI.from_spec(black_difficulty)
+        self.white_ai = AI.from_spec(white_difficulty)
 
     def set_play_mode(self, mode: PlayMode):
         """プレイモードを設定"""
@@ -131,17 +217,37 @@ class AutoPlayManager:
 
         if not self.black_ai or not self.white_ai:
             raise ValueError("Both black and white AI must be set")
+        if (
+            self.play_mode == PlayMode.INSTANT
+            and self.workers > 1
+            and not self._can_play_lockstep()
+        ):
+            self._check_worker_ais()
 
         self.state = AutoPlayState.PLAYING
         self._stop_requested = False
         self.current_game_number = 0
-        self.statistics = Statistics()
+        self.statistics = self.create_statistics()
 
         if self.play_mode == PlayMode.INSTANT:
             await self._play_instant()
         else:
             self._play_task = asyncio.create_task(self._play_loop())
 
+    def _check_worker_ais(self):
+        """ワーカーは spec から AI を作り直すので、作り直せない AI は断る"""
+        for ai in (self.black_ai, self.white_ai):
+            if not ai.can_rebuild_from_spec():
+                raise ValueError(
+                    f"AI {ai.spec!r} cannot be rebuilt from its spec for workers"
+                )
+
+    def _should_record_moves(self) -> bool:
+        return self.record_moves or self.book_builder is not None
+
+    def create_statistics(self) -> Statistics:
+        return Statistics(keep_results=self.keep_results, spill_path=self.spill_path)
+
     async def pause(self):
         """自動プレイを一時停止"""
         if self.state == AutoPlayState.PLAYING:
@@ -225,33 +331,97 @@ class AutoPlayManager:
         except asyncio.CancelledError:
             pass
         finally:
+            self.statistics.close()
             self.state = AutoPlayState.IDLE
 
     async def _play_instant(self):
         """瞬間実行モード"""
-        for game_num in range(self.target_games):
-            if self._stop_requested:
-                break
-
-            self.game.reset()
-            self.current_game_number = game_num + 1
-
-            # ゲームが終了するまで即座に実行
-            while not self.game.is_game_over():
+        if self._can_play_lockstep():
+            await self._play_lockstep()
+        elif self.workers > 1:
+            await self._play_parallel()
+        else:
+            for game_num in range(self.target_games):
                 if self._stop_requested:
                     break
-                await self._make_next_move()
 
-            if not self._stop_requested:
-                await self._handle_game_end()
+                self.game.reset()
+                self.current_game_number = game_num + 1
+
+                # ゲームが終了するまで即座に実行
+                while not self.game.is_game_over():
+                    if self._stop_requested:
+                        break
+                    await self._make_next_move()
+
+                if not self._stop_requested:
+                    await self._handle_game_end()
 
         if not self._stop_requested:
             self.state = AutoPlayState.FINISHED
             if self.on_all_games_end:
                 self.on_all_games_end(self.statistics)
 
+        self.statistics.close()
         self.state = AutoPlayState.IDLE
 
+    def _can_play_lockstep(self) -> bool:
+        if not self.lockstep:
+            return False
+        try:
+            from .lockstep import SUPPORTED_DIFFICULTIES
+        except ImportError:
+            # NumPy (batch extra) がなければ1局ずつ打つ
+            return False
+
+        return (
+            self.black_ai.difficulty in SUPPORTED_DIFFICULTIES
+            and self.white_ai.difficulty in SUPPORTED_DIFFICULTIES
+        )
+
+    async def _play_lockstep(self):
+        """複数局を1手ずつ揃えて進め、終局した順に記録する"""
+        from .lockstep import LockstepSelfPlay
+
+        driver = LockstepSelfPlay(
+            self.black_ai.difficulty,
+            self.white_ai.difficulty,
+            lanes=self.lockstep_lanes,
+            seed=self.seed,
+            record_moves=self._should_record_moves(),
+        )
+        for result in driver.play(self.target_games):
+            if self._stop_requested:
+                break
+            # 他の打ち方と同じく、結果には AI の指定を残す
+            result.black_ai_difficulty = self.black_ai.spec
+            result.white_ai_difficulty = self.white_ai.spec
+            self.current_game_number += 1
+            self._record_result(result)
+            if self.on_update:
+                self.on_update()
+
+    async def _play_parallel(self):
+        """プロセスプールで分担して打ち、届いた順に記録する (on_move は呼ばない)"""
+        from .parallel_play import GamePool
+
+        with GamePool(self.workers) as pool:
+            async for result in pool.play(
+                self.black_ai.spec,
+                self.white_ai.spec,
+                self.target_games,
+                use_bitboard=self.game.use_bitboard,
+                seed=self.seed,
+                record_moves=self._should_record_moves(),
+            ):
+                if self._stop_requested:
+                    break
+                self.current_game_number += 1
+                self._record_result(result)
+                if self.on_update:
+                    self.on_update()
+            self.worker_utilisation = pool.get_utilisation()
+
     async def _make_next_move(self):
         """次の手を実行"""
         current_player = self.game.get_current_player()
@@ -284,11 +454,16 @@ class AutoPlayManager:
             black_score=score[Board.BLACK],
             white_score=score[Board.WHITE],
             total_moves=len(self.game.history),
-            black_ai_difficulty=self.black_ai.difficulty,
-            white_ai_difficulty=self.white_ai.difficulty,
+            black_ai_difficulty=self.black_ai.spec,
+            white_ai_difficulty=self.white_ai.spec,
+            moves=list(self.game.history) if self._should_record_moves() else None,
         )
+        self._record_result(result)
 
+    def _record_result(self, result: GameResult):
         self.statistics.add_result(result)
+        if self.book_builder is not None:
+            self.book_builder.add_result(result)
 
         if self.on_game_end:
             self.on_game_end(result)
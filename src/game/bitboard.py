@@ -0,0 +1,159 @@
+from typing import List, Optional, Tuple
+
+from .bitops import FULL_MASK, bits_to_squares, get_flips_mask, transform_bits
+from .board import Board, MoveRecord
+from .zobrist import FLIP_KEYS, PIECE_KEYS, compute_hash
+
+
+class _BitBoardRow(list):
+    """BitBoard.grid の1行分のビュー。要素の書き換えは盤面へ反映される"""
+
+    def __init__(self, board: "BitBoard", row: int):
+        super().__init__(board.get_cell(row, col) for col in range(Board.BOARD_SIZE))
+        self._board = board
+        self._row = row
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        for col, cell in enumerate(self):
+            self._board.set_cell(self._row, col, cell)
+
+
+class BitBoard(Board):
+    """黒と白をそれぞれ64ビット整数で保持する Board 互換の盤面"""
+
+    def __init__(self):
+        self.black = 0
+        self.white = 0
+        self._hash = 0
+        self.initialize_board()
+
+    def initialize_board(self):
+        self.set_bits((1 << 28) | (1 << 35), (1 << 27) | (1 << 36))
+
+    def set_bits(self, black: int, white: int):
+        """ビットボードを直接設定する。ハッシュはここで計算し直す"""
+        self.black = black
+        self.white = white
+        self._hash = compute_hash(black, white)
+
+    @property
+    def grid(self) -> List[List[int]]:
+        return [_BitBoardRow(self, row) for row in range(self.BOARD_SIZE)]
+
+    @grid.setter
+    def grid(self, rows: List[List[int]]):
+        self.set_bits(0, 0)
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                self.set_cell(row, col, value)
+
+    def get_bits(self, player: int) -> Tuple[int, int]:
+        """(手番側, 相手側) のビットボードを返す"""
+        if player == self.BLACK:
+            return self.black, self.white
+        return self.white, self.black
+
+    def get_cell(self, row: int, col: int) -> int:
+        if not self.is_valid_position(row, col):
+            return -1
+        bit = 1 << (row * 8 + col)
+        if self.black & bit:
+            return self.BLACK
+        if self.white & bit:
+            return self.WHITE
+        return self.EMPTY
+
+    def set_cell(self, row: int, col: int, value: int):
+        if not self.is_valid_position(row, col):
+            return
+        square = row * 8 + col
+        bit = 1 << square
+        self._hash ^= PIECE_KEYS[self.get_cell(row, col)][square]
+        self.black &= ~bit
+        self.white &= ~bit
+        if value == self.BLACK:
+            self.black |= bit
+        elif value == self.WHITE:
+            self.white |= bit
+        else:
+            return
+        self._hash ^= PIECE_KEYS[value][square]
+
+    def get_flips_mask(self, row: int, col: int, player: int) -> int:
+        if not self.is_valid_position(row, col):
+            return 0
+        own, opp = self.get_bits(player)
+        return get_flips_mask(own, opp, row * 8 + col)
+
+    def get_flips(self, row: int, col: int, player: int) -> List[Tuple[int, int]]:
+        return bits_to_squares(self.get_flips_mask(row, col, player))
+
+    def is_valid_move(self, row: int, col: int, player: int) -> bool:
+        return self.get_flips_mask(row, col, player) != 0
+
+    def apply_move(self, row: int, col: int, player: int) -> Optional[MoveRecord]:
+        flips = self.get_flips_mask(row, col, player)
+        if not flips:
+            return None
+
+        square = row * 8 + col
+        placed = flips | (1 << square)
+        if player == self.BLACK:
+            self.black |= placed
+            self.white ^= flips
+        else:
+            self.white |= placed
+            self.black ^= flips
+        self._hash ^= PIECE_KEYS[player][square] ^ self._flip_hash(flips)
+        return (row, col, player, flips)
+
+    def unmake_move(self, record: MoveRecord):
+        row, col, player, flips = record
+        square = row * 8 + col
+        placed = flips | (1 << square)
+        if player == self.BLACK:
+            self.black ^= placed
+            self.white |= flips
+        else:
+            self.white ^= placed
+            self.black |= flips
+        self._hash ^= PIECE_KEYS[player][square] ^ self._flip_hash(flips)
+
+    @staticmethod
+    def _flip_hash(flips: int) -> int:
+        value = 0
+        while flips:
+            low = flips & -flips
+            value ^= FLIP_KEYS[low.bit_length() - 1]
+            flips ^= low
+        return value
+
+    def place_stone(self, row: int, col: int, player: int) -> bool:
+        return self.apply_move(row, col, player) is not None
+
+    def count_stones(self) -> dict:
+        black = self.black.bit_count()
+        white = self.white.bit_count()
+        return {self.BLACK: black, self.WHITE: white, self.EMPTY: 64 - black - white}
+
+    @property
+    def empties(self) -> int:
+        return 64 - (self.black | self.white).bit_count()
+
+    def is_full(self) -> bool:
+        return (self.black | self.white) == FULL_MASK
+
+    def transformed(self, transform: int) -> "BitBoard":
+        board = BitBoard()
+        board.set_bits(
+            transform_bits(self.black, transform), transform_bits(self.white, transform)
+        )
+        return board
+
+    def copy(self):
+        new_board = BitBoard()
+        new_board.black = self.black
+        new_board.white = self.white
+        new_board._hash = self._hash
+        return new_board
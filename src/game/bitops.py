@@ -0,0 +1,190 @@
+"""ビットボード演算のヘルパー
+
+マス (row, col) はビット位置 row * 8 + col に対応する。
+"""
+
+from typing import Iterator, List, Tuple
+
+FULL_MASK = 0xFFFFFFFFFFFFFFFF
+NOT_COL_0 = 0xFEFEFEFEFEFEFEFE  # 左端列を除いたマスク
+NOT_COL_7 = 0x7F7F7F7F7F7F7F7F  # 右端列を除いたマスク
+
+# (シフト量, 折り返し防止マスク)。並びは Board.get_flips の方向順と同じ
+DIRECTIONS: List[Tuple[int, int]] = [
+    (-9, NOT_COL_7),  # (-1, -1)
+    (-8, FULL_MASK),  # (-1, 0)
+    (-7, NOT_COL_0),  # (-1, 1)
+    (-1, NOT_COL_7),  # (0, -1)
+    (1, NOT_COL_0),  # (0, 1)
+    (7, NOT_COL_7),  # (1, -1)
+    (8, FULL_MASK),  # (1, 0)
+    (9, NOT_COL_0),  # (1, 1)
+]
+
+
+def square_index(row: int, col: int) -> int:
+    return row * 8 + col
+
+
+def square_mask(row: int, col: int) -> int:
+    return 1 << (row * 8 + col)
+
+
+def shift(bits: int, amount: int) -> int:
+    if amount > 0:
+        return (bits << amount) & FULL_MASK
+    return bits >> -amount
+
+
+def get_flips_mask(player: int, opponent: int, square: int) -> int:
+    """square に着手したときに返る石のビットマスクを返す"""
+    move = 1 << square
+    if (player | opponent) & move:
+        return 0
+
+    flips = 0
+    for amount, mask in DIRECTIONS:
+        run = 0
+        x = shift(move, amount) & mask
+        while x & opponent:
+            run |= x
+            x = shift(x, amount) & mask
+        if x & player:
+            flips |= run
+    return flips
+
+
+def get_moves_mask(player: int, opponent: int) -> int:
+    """合法手のビットマスクを8方向の並列シフト (Kogge-Stone) で求める"""
+    empty = ~(player | opponent) & FULL_MASK
+    moves = 0
+    for amount, mask in DIRECTIONS:
+        gen = player
+        pro = opponent & mask
+        gen |= pro & shift(gen, amount)
+        pro &= shift(pro, amount)
+        gen |= pro & shift(gen, amount * 2)
+        pro &= shift(pro, amount * 2)
+        gen |= pro & shift(gen, amount * 4)
+        moves |= shift(gen & opponent, amount) & mask
+    return moves & empty
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """立っているビットの位置を昇順に返す"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def iter_squares(bits: int) -> Iterator[Tuple[int, int]]:
+    """立っているビットを (row, col) として昇順に返す"""
+    for index in iter_bits(bits):
+        yield divmod(index, 8)
+
+
+def bits_to_squares(bits: int) -> List[Tuple[int, int]]:
+    return [divmod(index, 8) for index in iter_bits(bits)]
+
+
+def rotate_right(bits: int, amount: int) -> int:
+    return ((bits >> amount) | (bits << (64 - amount))) & FULL_MASK
+
+
+def flip_diagonal(bits: int) -> int:
+    """左上-右下の対角線で転置する。(row, col) が (col, row) に移る"""
+    t = 0x0F0F0F0F00000000 & (bits ^ (bits << 28))
+    bits ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (bits ^ (bits << 14))
+    bits ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (bits ^ (bits << 7))
+    bits ^= t ^ (t >> 7)
+    return bits
+
+
+def pseudo_rotate45_cw(bits: int) -> int:
+    """row - col が等しい斜めの列を、バイト (row - col) % 8 に集める"""
+    bits ^= 0xAAAAAAAAAAAAAAAA & (bits ^ rotate_right(bits, 8))
+    bits ^= 0xCCCCCCCCCCCCCCCC & (bits ^ rotate_right(bits, 16))
+    bits ^= 0xF0F0F0F0F0F0F0F0 & (bits ^ rotate_right(bits, 32))
+    return bits
+
+
+def pseudo_rotate45_ccw(bits: int) -> int:
+    """row + col が等しい斜めの列を、バイト (row + col + 1) % 8 に集める"""
+    bits ^= 0x5555555555555555 & (bits ^ rotate_right(bits, 8))
+    bits ^= 0x3333333333333333 & (bits ^ rotate_right(bits, 16))
+    bits ^= 0x0F0F0F0F0F0F0F0F & (bits ^ rotate_right(bits, 32))
+    return bits
+
+
+def flip_vertical(bits: int) -> int:
+    """上下反転。(row, col) が (7 - row, col) に移る"""
+    return int.from_bytes(bits.to_bytes(8, "little"), "big")
+
+
+def mirror_horizontal(bits: int) -> int:
+    """左右反転。(row, col) が (row, 7 - col) に移る"""
+    bits = ((bits >> 1) & 0x5555555555555555) | ((bits & 0x5555555555555555) << 1)
+    bits = ((bits >> 2) & 0x3333333333333333) | ((bits & 0x3333333333333333) << 2)
+    return ((bits >> 4) & 0x0F0F0F0F0F0F0F0F) | ((bits & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+# 盤面の8通りの対称変換。番号 t の変換で (row, col) は次の先に移る
+#   0: (row, col)          恒等
+#   1: (col, 7 - row)      時計回りに90度
+#   2: (7 - row, 7 - col)  180度
+#   3: (7 - col, row)      反時計回りに90度
+#   4: (col, row)          対角線で転置
+#   5: (row, 7 - col)      左右反転
+#   6: (7 - row, col)      上下反転
+#   7: (7 - col, 7 - row)  反対角線で転置
+TRANSFORM_COUNT = 8
+# 各変換の逆変換の番号
+INVERSE_TRANSFORMS = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def transform_bits(bits: int, transform: int) -> int:
+    """ビットボードに変換をかける。番号は TRANSFORM_COUNT の上のコメントを参照"""
+    if transform == 0:
+        return bits
+    if transform == 1:
+        return mirror_horizontal(flip_diagonal(bits))
+    if transform == 2:
+        return flip_vertical(mirror_horizontal(bits))
+    if transform == 3:
+        return flip_vertical(flip_diagonal(bits))
+    if transform == 4:
+        return flip_diagonal(bits)
+    if transform == 5:
+        return mirror_horizontal(bits)
+    if transform == 6:
+        return flip_vertical(bits)
+    return flip_vertical(mirror_horizontal(flip_diagonal(bits)))
+
+
+# SQUARE_TRANSFORMS[t][square] が変換 t で移る先のマス番号
+SQUARE_TRANSFORMS: List[List[int]] = [
+    [transform_bits(1 << square, t).bit_length() - 1 for square in range(64)]
+    for t in range(TRANSFORM_COUNT)
+]
+
+
+def transform_square(row: int, col: int, transform: int) -> Tuple[int, int]:
+    """マスに変換をかける"""
+    return divmod(SQUARE_TRANSFORMS[transform][row * 8 + col], 8)
+
+
+def canonical_bits(black: int, white: int) -> Tuple[int, int, int]:
+    """8通りの対称形のうち (black, white) が最小のものと、その変換の番号を返す"""
+    best = (black, white, 0)
+    for transform in range(1, TRANSFORM_COUNT):
+        candidate = (
+            transform_bits(black, transform),
+            transform_bits(white, transform),
+            transform,
+        )
+        if candidate < best:
+            best = candidate
+    return best
@@ -1,4 +1,41 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from .bitops import (
+    bits_to_squares,
+    canonical_bits,
+    get_moves_mask,
+    iter_squares,
+    transform_bits,
+)
+from .zobrist import PIECE_KEYS, compute_hash, side_key
+
+# 着手の取り消し用レコード: (row, col, player, 返した石のビットマスク)
+MoveRecord = Tuple[int, int, int, int]
+
+
+class _BoardRow(list):
+    """Board.grid の1行。要素の書き換えに合わせて石数とハッシュを更新する"""
+
+    __slots__ = ("_board", "_offset")
+
+    def __init__(self, board: "Board", row: int, values):
+        super().__init__(values)
+        self._board = board
+        self._offset = row * 8
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self._board._recalculate()
+            return
+
+        board = self._board
+        old = self[index]
+        square = self._offset + (index % 8)
+        board._counts[old] -= 1
+        board._counts[value] = board._counts.get(value, 0) + 1
+        board._hash ^= PIECE_KEYS[old][square] ^ PIECE_KEYS[value][square]
+        super().__setitem__(index, value)
 
 
 class Board:
@@ -13,6 +50,35 @@ class Board:
         ]
         self.initialize_board()
 
+    @property
+    def grid(self) -> List[List[int]]:
+        return self._grid
+
+    @grid.setter
+    def grid(self, rows: List[List[int]]):
+        self._grid = [_BoardRow(self, index, row) for index, row in enumerate(rows)]
+        self._recalculate()
+
+    def _recalculate(self):
+        """石数とハッシュを盤面から計算し直す"""
+        counts = {self.BLACK: 0, self.WHITE: 0, self.EMPTY: 0}
+        value = 0
+        for row, cells in enumerate(self._grid):
+            for col, cell in enumerate(cells):
+                counts[cell] = counts.get(cell, 0) + 1
+                value ^= PIECE_KEYS[cell][row * 8 + col]
+        self._counts = counts
+        self._hash = value
+
+    @property
+    def hash(self) -> int:
+        """手番を含まない Zobrist ハッシュ。set_cell/place_stone で差分更新する"""
+        return self._hash
+
+    def position_hash(self, player: int) -> int:
+        """手番 player を含めた局面のハッシュ"""
+        return self._hash ^ side_key(player)
+
     def initialize_board(self):
         center = self.BOARD_SIZE // 2
         self.grid[center - 1][center - 1] = self.WHITE
@@ -25,12 +91,12 @@ class Board:
 
     def get_cell(self, row: int, col: int) -> int:
         if self.is_valid_position(row, col):
-            return self.grid[row][col]
+            return self._grid[row][col]
         return -1
 
     def set_cell(self, row: int, col: int, value: int):
         if self.is_valid_position(row, col):
-            self.grid[row][col] = value
+            self._grid[row][col] = value
 
     def is_empty(self, row: int, col: int) -> bool:
         return self.get_cell(row, col) == self.EMPTY
@@ -77,33 +143,97 @@ class Board:
     def is_valid_move(self, row: int, col: int, player: int) -> bool:
         return len(self.get_flips(row, col, player)) > 0
 
+    def get_bits(self, player: int) -> Tuple[int, int]:
+        """(手番側, 相手側) のビットボードを返す"""
+        own = 0
+        opp = 0
+        bit = 1
+        for row in self._grid:
+            for cell in row:
+                if cell == player:
+                    own |= bit
+                elif cell != self.EMPTY:
+                    opp |= bit
+                bit <<= 1
+        return own, opp
+
+    def get_valid_moves_mask(self, player: int) -> int:
+        return get_moves_mask(*self.get_bits(player))
+
+    def transformed(self, transform: int) -> "Board":
+        """対称変換 transform (bitops の番号) をかけた盤面を返す"""
+        black, white = self.get_bits(self.BLACK)
+        black = transform_bits(black, transform)
+        white = transform_bits(white, transform)
+        board = self.copy()
+        board.grid = [
+            [
+                (
+                    self.BLACK
+                    if black >> (row * 8 + col) & 1
+                    else self.WHITE if white >> (row * 8 + col) & 1 else self.EMPTY
+                )
+                for col in range(self.BOARD_SIZE)
+            ]
+            for row in range(self.BOARD_SIZE)
+        ]
+        return board
+
+    def canonical(self) -> Tuple["Board", int]:
+        """8通りの対称形のうち (黒, 白) のビットが最小の盤面と、その変換の番号
+
+        正規形での手 (row, col) は
+        transform_square(row, col, INVERSE_TRANSFORMS[transform]) で元の向きに戻る。
+        """
+        _, _, transform = canonical_bits(*self.get_bits(self.BLACK))
+        return self.transformed(transform), transform
+
+    def canonical_hash(self, player: int) -> Tuple[int, int]:
+        """正規形の手番込みハッシュと変換の番号。対称な局面は同じ値になる"""
+        black, white, transform = canonical_bits(*self.get_bits(self.BLACK))
+        return compute_hash(black, white) ^ side_key(player), transform
+
     def get_valid_moves(self, player: int) -> List[Tuple[int, int]]:
-        valid_moves = []
-        for row in range(self.BOARD_SIZE):
-            for col in range(self.BOARD_SIZE):
-                if self.is_valid_move(row, col, player):
-                    valid_moves.append((row, col))
-        return valid_moves
+        return bits_to_squares(self.get_valid_moves_mask(player))
 
-    def place_stone(self, row: int, col: int, player: int) -> bool:
+    def apply_move(self, row: int, col: int, player: int) -> Optional[MoveRecord]:
+        """着手して取り消し用のレコードを返す。不正な手なら None"""
         flips = self.get_flips(row, col, player)
         if not flips:
-            return False
+            return None
 
         self.set_cell(row, col, player)
+        flips_mask = 0
         for r, c in flips:
             self.set_cell(r, c, player)
-        return True
+            flips_mask |= 1 << (r * 8 + c)
+        return (row, col, player, flips_mask)
+
+    def unmake_move(self, record: MoveRecord):
+        """apply_move で打った手を取り消す"""
+        row, col, player, flips_mask = record
+        opponent = self.get_opponent(player)
+        self.set_cell(row, col, self.EMPTY)
+        for r, c in iter_squares(flips_mask):
+            self.set_cell(r, c, opponent)
+
+    def place_stone(self, row: int, col: int, player: int) -> bool:
+        return self.apply_move(row, col, player) is not None
 
     def count_stones(self) -> dict:
-        count = {self.BLACK: 0, self.WHITE: 0, self.EMPTY: 0}
-        for row in self.grid:
-            for cell in row:
-                count[cell] += 1
-        return count
+        """石数を返す。set_cell/place_stone で差分更新しているので O(1)"""
+        return {
+            self.BLACK: self._counts[self.BLACK],
+            self.WHITE: self._counts[self.WHITE],
+            self.EMPTY: self._counts[self.EMPTY],
+        }
+
+    @property
+    def empties(self) -> int:
+        return self._counts[self.EMPTY]
 
     def is_full(self) -> bool:
-        return self.count_stones()[self.EMPTY] == 0
+        return self._counts[self.EMPTY] == 0
 
     def copy(self):
         new_board = Board()
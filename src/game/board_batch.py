@@ -0,0 +1,185 @@
+"""NumPy で多数の盤面をまとめて扱うビットボード
+
+N 局面の黒と白を uint64 の配列で持ち、合法手の生成、着手、石数、位置評価を
+全局面まとめてベクトル演算で行う。各要素の結果は Board/BitBoard と同じになる。
+
+NumPy が必要 (pip install flet-othello[batch])。
+"""
+
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .ai import SQUARE_VALUES
+from .bitboard import BitBoard
+from .bitops import DIRECTIONS
+from .board import Board
+
+Players = Union[int, Sequence[int], np.ndarray]
+
+_DIRECTIONS = [(amount, np.uint64(mask)) for amount, mask in DIRECTIONS]
+_SQUARE_BITS = np.uint64(1) << np.arange(64, dtype=np.uint64)
+
+
+def _shift(bits: np.ndarray, amount: int) -> np.ndarray:
+    # uint64 の左シフトは上位ビットが落ちるので FULL_MASK は不要
+    if amount > 0:
+        return bits << np.uint64(amount)
+    return bits >> np.uint64(-amount)
+
+
+def _get_flips(own: np.ndarray, opp: np.ndarray, move: np.ndarray) -> np.ndarray:
+    """move に打ったときに返る石。引数はブロードキャストできる形ならよい
+
+    相手の石の連なり (pro) は move に依らないので、move より小さい形の配列の
+    ままで計算しておき、move から Kogge-Stone で伸ばす。
+    """
+    move = move & ~(own | opp)
+    flips = np.zeros(np.broadcast_shapes(own.shape, move.shape), dtype=np.uint64)
+    for amount, mask in _DIRECTIONS:
+        pro = opp & mask
+        gen = move | (pro & _shift(move, amount))
+        pro = pro & _shift(pro, amount)
+        gen |= pro & _shift(gen, amount * 2)
+        pro = pro & _shift(pro, amount * 2)
+        gen |= pro & _shift(gen, amount * 4)
+        run = gen ^ move
+        closed = (_shift(run, amount) & mask & own) != 0
+        flips |= np.where(closed, run, np.uint64(0))
+    return flips
+
+
+def _unpack(bits: np.ndarray) -> np.ndarray:
+    """(N, 64) の 0/1 配列。列がマス番号に対応する"""
+    data = np.ascontiguousarray(bits, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(data, axis=1, bitorder="little")
+
+
+class BoardBatch:
+    """N 局面を uint64 配列で保持する盤面の束"""
+
+    def __init__(self, black: Iterable[int], white: Iterable[int]):
+        self.black = np.array(black, dtype=np.uint64)
+        self.white = np.array(white, dtype=np.uint64)
+        if self.black.shape != self.white.shape or self.black.ndim != 1:
+            raise ValueError("black と white は同じ長さの1次元配列にしてください")
+
+    @classmethod
+    def initial(cls, count: int) -> "BoardBatch":
+        """初期配置の盤面を count 個並べる"""
+        board = BitBoard()
+        return cls([board.black] * count, [board.white] * count)
+
+    @classmethod
+    def from_boards(cls, boards: Iterable[Board]) -> "BoardBatch":
+        bits = [board.get_bits(Board.BLACK) for board in boards]
+        return cls([black for black, _ in bits], [white for _, white in bits])
+
+    def to_boards(self) -> List[BitBoard]:
+        boards = []
+        for black, white in zip(self.black.tolist(), self.white.tolist(), strict=True):
+            board = BitBoard()
+            board.set_bits(black, white)
+            boards.append(board)
+        return boards
+
+    def __len__(self) -> int:
+        return len(self.black)
+
+    def copy(self) -> "BoardBatch":
+        return BoardBatch(self.black, self.white)
+
+    def _players(self, players: Players) -> np.ndarray:
+        return np.broadcast_to(np.asarray(players), self.black.shape)
+
+    def get_bits(self, players: Players) -> Tuple[np.ndarray, np.ndarray]:
+        """(手番側, 相手側) のビットボードの配列を返す"""
+        is_black = self._players(players) == Board.BLACK
+        own = np.where(is_black, self.black, self.white)
+        opp = np.where(is_black, self.white, self.black)
+        return own, opp
+
+    def get_valid_moves_mask(self, players: Players) -> np.ndarray:
+        """各局面の合法手のビットマスク (bitops.get_moves_mask と同じ手順)"""
+        own, opp = self.get_bits(players)
+        empty = ~(own | opp)
+        moves = np.zeros_like(own)
+        for amount, mask in _DIRECTIONS:
+            gen = own
+            pro = opp & mask
+            gen = gen | (pro & _shift(gen, amount))
+            pro = pro & _shift(pro, amount)
+            gen = gen | (pro & _shift(gen, amount * 2))
+            pro = pro & _shift(pro, amount * 2)
+            gen = gen | (pro & _shift(gen, amount * 4))
+            moves |= _shift(gen & opp, amount) & mask
+        return moves & empty
+
+    def get_flips_mask(self, squares: Players, players: Players) -> np.ndarray:
+        """各局面で squares に打ったときに返る石。-1 (パス) や不正な手は 0"""
+        squares = np.broadcast_to(np.asarray(squares, dtype=np.int64), self.black.shape)
+        own, opp = self.get_bits(players)
+        valid = squares >= 0
+        move = np.where(
+            valid,
+            np.uint64(1) << np.where(valid, squares, 0).astype(np.uint64),
+            np.uint64(0),
+        )
+        return _get_flips(own, opp, move)
+
+    def get_all_flips(self, players: Players) -> np.ndarray:
+        """(N, 64) の配列。[i, square] が局面 i で square に打ったときに返る石"""
+        own, opp = self.get_bits(players)
+        return _get_flips(own[:, None], opp[:, None], _SQUARE_BITS[None, :])
+
+    def apply_moves(self, squares: Players, players: Players) -> np.ndarray:
+        """各局面に着手して返した石の配列を返す
+
+        返す石が 0 の局面 (パスや不正な手) は変更しない。Board.apply_move が
+        None を返す場合に相当する。
+        """
+        players = self._players(players)
+        flips = self.get_flips_mask(squares, players)
+        played = flips != 0
+        squares = np.where(
+            played, np.broadcast_to(np.asarray(squares), flips.shape), 0
+        ).astype(np.uint64)
+        changed = np.where(played, flips | (np.uint64(1) << squares), np.uint64(0))
+
+        is_black = players == Board.BLACK
+        self.black ^= np.where(is_black, changed, flips)
+        self.white ^= np.where(is_black, flips, changed)
+        return flips
+
+    def count_discs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(黒の石数, 白の石数) の配列"""
+        return (
+            np.bitwise_count(self.black).astype(np.int64),
+            np.bitwise_count(self.white).astype(np.int64),
+        )
+
+    def empties(self) -> np.ndarray:
+        return 64 - np.bitwise_count(self.black | self.white).astype(np.int64)
+
+    def evaluate(
+        self,
+        players: Players,
+        square_values: Sequence[int] = SQUARE_VALUES,
+        mobility_weight: int = 0,
+    ) -> np.ndarray:
+        """手番側から見たマスの評価値の合計。mobility_weight で可動性を加える
+
+        AI(stability_weight=0) の位置評価 evaluate_board と同じ値になる。
+        """
+        players = self._players(players)
+        own, opp = self.get_bits(players)
+        values = np.asarray(square_values, dtype=np.int64)
+        score = _unpack(own).astype(np.int64) @ values
+        score -= _unpack(opp).astype(np.int64) @ values
+        if mobility_weight:
+            opponents = np.where(players == Board.BLACK, Board.WHITE, Board.BLACK)
+            mobility = np.bitwise_count(self.get_valid_moves_mask(players)).astype(
+                np.int64
+            ) - np.bitwise_count(self.get_valid_moves_mask(opponents)).astype(np.int64)
+            score += mobility * mobility_weight
+        return score
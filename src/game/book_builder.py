@@ -0,0 +1,138 @@
+"""自己対戦の棋譜から定石ブックを作る
+
+終局した棋譜を先頭から max_plies 手まで並べ直し、通過した局面 (正規形) ごとに
+対局数と最終石差の合計を数えて木にする。局面の値は、十分な対局数のある子が
+あれば子の値から negamax で、なければ最終石差の平均で決める。
+
+    builder = BookBuilder()
+    manager.book_builder = builder  # AutoPlayManager の終局ごとに棋譜を渡す
+    ...
+    builder.write("book.bin")
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from .bitboard import BitBoard
+from .board import Board
+from .opening_book import Entry, canonicalize_move, write_book
+
+Move = Tuple[int, int, int]  # (row, col, player)
+
+SCORE_MIN = -(1 << 15)
+SCORE_MAX = (1 << 15) - 1
+
+
+class BookNode:
+    """ブックの木の1局面"""
+
+    __slots__ = ("player", "games", "score_sum", "children")
+
+    def __init__(self, player: int):
+        self.player = player  # 手番
+        self.games = 0
+        self.score_sum = 0  # 手番側から見た最終石差の合計
+        # 正規形での手のマス番号 -> 次の局面のキー
+        self.children: Dict[int, int] = {}
+
+    @property
+    def mean_score(self) -> float:
+        return self.score_sum / self.games if self.games else 0.0
+
+
+class BookBuilder:
+    def __init__(self, max_plies: int = 20, min_games: int = 2):
+        self.max_plies = max_plies
+        # これより対局数の少ない局面はブックに載せない
+        self.min_games = min_games
+        self.nodes: Dict[int, BookNode] = {}
+        self.games = 0
+        self.skipped_games = 0
+
+    def add_result(self, result) -> bool:
+        """AutoPlayManager の GameResult を加える。棋譜がなければ何もしない"""
+        if not result.moves:
+            return False
+        return self.add_game(result.moves)
+
+    def add_game(self, moves: Iterable[Move]) -> bool:
+        """終局した棋譜を加える。不正な手や終局していない棋譜は加えない"""
+        board = BitBoard()
+        # (正規形での手のマス番号, 局面のキー, 手番)
+        path: List[Tuple[int, int, int]] = []
+        for ply, (row, col, player) in enumerate(moves):
+            if ply < self.max_plies:
+                black, white = board.get_bits(Board.BLACK)
+                key, square = canonicalize_move(black, white, player, row * 8 + col)
+                path.append((square, key, player))
+            if board.apply_move(row, col, player) is None:
+                self.skipped_games += 1
+                return False
+
+        if board.get_valid_moves_mask(Board.BLACK) or board.get_valid_moves_mask(
+            Board.WHITE
+        ):
+            self.skipped_games += 1
+            return False
+
+        black, white = board.get_bits(Board.BLACK)
+        diff = black.bit_count() - white.bit_count()
+        for index, (square, key, player) in enumerate(path):
+            node = self.nodes.get(key)
+            if node is None:
+                node = self.nodes[key] = BookNode(player)
+            node.games += 1
+            node.score_sum += diff if player == Board.BLACK else -diff
+            if index + 1 < len(path):
+                node.children[square] = path[index + 1][1]
+        self.games += 1
+        return True
+
+    def compute_values(self) -> Dict[int, float]:
+        """各局面の手番側から見た値を negamax で求める"""
+        values: Dict[int, float] = {}
+
+        def value(key: int) -> float:
+            if key in values:
+                return values[key]
+            node = self.nodes[key]
+            best = None
+            for child_key in node.children.values():
+                child = self.nodes[child_key]
+                if child.games < self.min_games:
+                    continue
+                score = self._edge_score(node, child, value(child_key))
+                if best is None or score > best:
+                    best = score
+            values[key] = node.mean_score if best is None else best
+            return values[key]
+
+        for key in self.nodes:
+            value(key)
+        return values
+
+    @staticmethod
+    def _edge_score(node: BookNode, child: BookNode, child_value: float) -> float:
+        # 相手がパスして同じ手番に戻る局面は符号を反転しない
+        return child_value if child.player == node.player else -child_value
+
+    def get_entries(self) -> List[Entry]:
+        """ブックに書き込むレコード"""
+        values = self.compute_values()
+        entries = []
+        for key, node in self.nodes.items():
+            if node.games < self.min_games:
+                continue
+            for square, child_key in node.children.items():
+                child = self.nodes[child_key]
+                if child.games < self.min_games:
+                    continue
+                score = round(self._edge_score(node, child, values[child_key]))
+                entries.append((key, max(SCORE_MIN, min(SCORE_MAX, score)), square))
+        return entries
+
+    def write(self, path: Union[str, Path]) -> int:
+        """ブックファイルを書き出し、レコード数を返す"""
+        entries = self.get_entries()
+        write_book(path, entries)
+        return len(entries)
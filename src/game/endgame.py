@@ -0,0 +1,181 @@
+"""終盤の完全読み
+
+空きマスが少なくなった局面を最後まで読み切り、石差 (手番側 - 相手側) を求める。
+盤面はビットボード (手番側, 相手側) の組で直接扱う。
+"""
+
+from typing import List, Optional, Tuple
+
+from .bitops import FULL_MASK, get_flips_mask, get_moves_mask, iter_bits
+from .board import Board
+from .stability import count_stable
+
+EXACT_MODE = "exact"  # 正確な石差を求める
+WLD_MODE = "wld"  # 勝ち/負け/引き分けだけを求める (窓 [-1, 1])
+
+# 4象限のマスク。空きマスが奇数の象限を優先する (パリティ)
+QUADRANTS = [
+    0x000000000F0F0F0F,
+    0x00000000F0F0F0F0,
+    0x0F0F0F0F00000000,
+    0xF0F0F0F000000000,
+]
+# これ以上空きがあるときは相手の着手可能数が少ない手から読む (fastest-first)
+FASTEST_FIRST_EMPTIES = 7
+# これ以上空きがあるときは相手の確定石から石差の上限を求めて枝刈りする
+STABILITY_CUTOFF_EMPTIES = 6
+
+
+class EndgameSolver:
+    def __init__(self, stability_cutoff: bool = True):
+        self.nodes = 0
+        self.stability_cutoff = stability_cutoff
+
+    def solve(
+        self, board: Board, player: int, mode: str = EXACT_MODE
+    ) -> Tuple[int, Optional[Tuple[int, int]]]:
+        """player の手番で読み切り、(石差, 最善手) を返す
+
+        WLD モードの石差は勝ちなら正、負けなら負、引き分けなら 0 の値になる。
+        """
+        own, opp = board.get_bits(player)
+        alpha, beta = (-1, 1) if mode == WLD_MODE else (-64, 64)
+        self.nodes = 0
+
+        moves = get_moves_mask(own, opp)
+        if not moves:
+            return self._search(own, opp, alpha, beta), None
+
+        best_score = -65
+        best_move = None
+        for square in self._order_moves(own, opp, moves):
+            flips = get_flips_mask(own, opp, square)
+            score = -self._search(
+                opp ^ flips, own | flips | (1 << square), -beta, -alpha
+            )
+            if score > best_score:
+                best_score = score
+                best_move = divmod(square, 8)
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score, best_move
+
+    def _search(
+        self, own: int, opp: int, alpha: int, beta: int, passed: bool = False
+    ) -> int:
+        self.nodes += 1
+        empty = ~(own | opp) & FULL_MASK
+        empties = empty.bit_count()
+        if empties == 0:
+            return own.bit_count() - opp.bit_count()
+        if empties == 1:
+            return self._solve_last1(own, opp, empty.bit_length() - 1)
+        if empties == 2:
+            low = empty & -empty
+            return self._solve_last2(
+                own, opp, alpha, beta, low.bit_length() - 1, empty.bit_length() - 1
+            )
+
+        # 相手の確定石は最後まで相手のまま残るので、石差は 64 - 2 * その数以下。
+        # 相手の石を全て確定石としても alpha に届かないときは数えない
+        if (
+            self.stability_cutoff
+            and empties >= STABILITY_CUTOFF_EMPTIES
+            and 64 - 2 * opp.bit_count() <= alpha
+        ):
+            upper = 64 - 2 * count_stable(opp, own)
+            if upper <= alpha:
+                return upper
+
+        moves = get_moves_mask(own, opp)
+        if not moves:
+            if passed:
+                return own.bit_count() - opp.bit_count()
+            return -self._search(opp, own, -beta, -alpha, True)
+
+        best_score = -65
+        for square in self._order_moves(own, opp, moves):
+            flips = get_flips_mask(own, opp, square)
+            score = -self._search(
+                opp ^ flips, own | flips | (1 << square), -beta, -alpha
+            )
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def _solve_last1(self, own: int, opp: int, square: int) -> int:
+        """空きが1マスだけの局面。着手生成をせずに直接数える"""
+        self.nodes += 1
+        own_count = own.bit_count()
+        flips = get_flips_mask(own, opp, square)
+        if flips:
+            own_count += flips.bit_count() + 1
+            return own_count * 2 - 64
+
+        flips = get_flips_mask(opp, own, square)
+        if flips:
+            own_count -= flips.bit_count()
+            return own_count * 2 - 64
+
+        return own_count * 2 - 63
+
+    def _solve_last2(
+        self,
+        own: int,
+        opp: int,
+        alpha: int,
+        beta: int,
+        first: int,
+        second: int,
+        passed: bool = False,
+    ) -> int:
+        """空きが2マスだけの局面"""
+        self.nodes += 1
+        best_score = -65
+        for square, other in ((first, second), (second, first)):
+            flips = get_flips_mask(own, opp, square)
+            if not flips:
+                continue
+            score = -self._solve_last1(opp ^ flips, own | flips | (1 << square), other)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score > -65:
+            return best_score
+        if passed:
+            return own.bit_count() - opp.bit_count()
+        return -self._solve_last2(opp, own, -beta, -alpha, first, second, True)
+
+    def _order_moves(self, own: int, opp: int, moves: int) -> List[int]:
+        empty = ~(own | opp) & FULL_MASK
+        odd = 0
+        for quadrant in QUADRANTS:
+            if (empty & quadrant).bit_count() & 1:
+                odd |= quadrant
+
+        squares = list(iter_bits(moves))
+        if len(squares) < 2:
+            return squares
+
+        if empty.bit_count() < FASTEST_FIRST_EMPTIES:
+            return [sq for sq in squares if odd >> sq & 1] + [
+                sq for sq in squares if not odd >> sq & 1
+            ]
+
+        def priority(square: int) -> Tuple[int, int]:
+            flips = get_flips_mask(own, opp, square)
+            mobility = get_moves_mask(opp ^ flips, own | flips | (1 << square))
+            return (mobility.bit_count(), 0 if odd >> square & 1 else 1)
+
+        squares.sort(key=priority)
+        return squares
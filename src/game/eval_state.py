@@ -0,0 +1,110 @@
+"""差分更新する評価の状態
+
+探索中は盤面全体を数え直さずに、着手の記録 (MoveRecord) から置いたマスと
+返した石だけを見て評価値を更新する。値は全て黒から見た値で持ち、
+get_score で手番側から見た値に直す。
+"""
+
+from typing import List, Optional, Sequence
+
+from .bitops import iter_bits
+from .board import Board, MoveRecord
+from .pattern_eval import PatternEvaluator
+
+
+class EvalState:
+    """マスの評価値の合計・パターンの添字・石差を差分で保つ
+
+    pattern_evaluator を渡すとパターンの評価値を、渡さなければマスの評価値の
+    合計を get_score で返す。
+    """
+
+    def __init__(
+        self,
+        square_values: Sequence[int],
+        pattern_evaluator: Optional[PatternEvaluator] = None,
+    ):
+        self.square_values = square_values
+        self.pattern_evaluator = pattern_evaluator
+        self.board: Optional[Board] = None
+        self.position_sum = 0
+        self.disc_diff = 0
+        self.indices: List[int] = []
+        self.pattern_score = 0
+        self._weights: List[List[int]] = []
+        if pattern_evaluator is not None:
+            self._weights = [
+                pattern_evaluator.get_weights(number)
+                for number in range(pattern_evaluator.pattern_count)
+            ]
+
+    def reset(self, board: Board):
+        """board の現在の局面から数え直し、以後 board の着手に追従する"""
+        self.board = board
+        black, white = board.get_bits(Board.BLACK)
+        self.disc_diff = black.bit_count() - white.bit_count()
+        if self.pattern_evaluator is not None:
+            self.indices = self.pattern_evaluator.get_indices(black, white)
+            self.pattern_score = sum(
+                weights[index]
+                for weights, index in zip(self._weights, self.indices, strict=True)
+            )
+        else:
+            values = self.square_values
+            self.position_sum = sum(values[sq] for sq in iter_bits(black)) - sum(
+                values[sq] for sq in iter_bits(white)
+            )
+
+    def apply(self, record: MoveRecord):
+        """board.apply_move の直後に呼ぶ"""
+        row, col, player, flips = record
+        sign = 1 if player == Board.BLACK else -1
+        self.disc_diff += sign * (1 + 2 * flips.bit_count())
+        if self.pattern_evaluator is not None:
+            # 黒は添字の数字 1、白は 2。返した石は数字が -sign だけ変わる
+            self._update(row * 8 + col, 1 if sign > 0 else 2)
+            for square in iter_bits(flips):
+                self._update(square, -sign)
+        else:
+            self.position_sum += sign * self._move_value(row * 8 + col, flips)
+
+    def undo(self, record: MoveRecord):
+        """board.unmake_move の直後に呼ぶ"""
+        row, col, player, flips = record
+        sign = 1 if player == Board.BLACK else -1
+        self.disc_diff -= sign * (1 + 2 * flips.bit_count())
+        if self.pattern_evaluator is not None:
+            for square in iter_bits(flips):
+                self._update(square, sign)
+            self._update(row * 8 + col, -1 if sign > 0 else -2)
+        else:
+            self.position_sum -= sign * self._move_value(row * 8 + col, flips)
+
+    def _move_value(self, square: int, flips: int) -> int:
+        values = self.square_values
+        value = values[square]
+        for flipped in iter_bits(flips):
+            value += 2 * values[flipped]
+        return value
+
+    def _update(self, square: int, delta: int):
+        indices = self.indices
+        weights = self._weights
+        score = self.pattern_score
+        for number, power in self.pattern_evaluator.square_patterns[square]:
+            old = indices[number]
+            new = old + delta * power
+            indices[number] = new
+            score += weights[number][new] - weights[number][old]
+        self.pattern_score = score
+
+    def get_score(self, player: int) -> int:
+        """player から見たパターンの評価値、またはマスの評価値の合計"""
+        if self.pattern_evaluator is not None:
+            score = self.pattern_score
+        else:
+            score = self.position_sum
+        return score if player == Board.BLACK else -score
+
+    def get_disc_diff(self, player: int) -> int:
+        return self.disc_diff if player == Board.BLACK else -self.disc_diff
@@ -1,43 +1,74 @@
 from typing import List, Optional, Tuple
 
-from .board import Board
+from .bitboard import BitBoard
+from .bitops import bits_to_squares
+from .board import Board, MoveRecord
+
+# (盤面の取り消しレコード, 着手前の状態, 着手後の状態)
+# 状態は (current_player, passed_last_turn, game_over)
+GameState = Tuple[int, bool, bool]
+UndoEntry = Tuple[MoveRecord, GameState, GameState]
 
 
 class Game:
-    def __init__(self):
-        self.board = Board()
+    def __init__(self, use_bitboard: bool = False):
+        self.use_bitboard = use_bitboard
+        self.board = self._create_board()
         self.current_player = Board.BLACK
         self.history = []
         self.game_over = False
         self.passed_last_turn = False
+        self._undo_stack: List[UndoEntry] = []
+        self._redo_stack: List[UndoEntry] = []
+
+    def _create_board(self) -> Board:
+        return BitBoard() if self.use_bitboard else Board()
 
     def get_current_player(self) -> int:
         return self.current_player
 
+    def get_valid_moves_mask(self) -> int:
+        return self.board.get_valid_moves_mask(self.current_player)
+
     def get_valid_moves(self) -> List[Tuple[int, int]]:
-        return self.board.get_valid_moves(self.current_player)
+        return bits_to_squares(self.get_valid_moves_mask())
+
+    def position_key(self) -> int:
+        """手番を含めた現局面の Zobrist ハッシュ"""
+        return self.board.position_hash(self.current_player)
 
     def make_move(self, row: int, col: int) -> bool:
         if self.game_over:
             return False
 
-        if self.board.place_stone(row, col, self.current_player):
-            self.history.append((row, col, self.current_player))
-            self.passed_last_turn = False
-            self.switch_turn()
-            return True
-        return False
+        before = self._get_state()
+        record = self.board.apply_move(row, col, self.current_player)
+        if record is None:
+            return False
+
+        self.history.append((row, col, self.current_player))
+        self.passed_last_turn = False
+        self.switch_turn()
+        self._undo_stack.append((record, before, self._get_state()))
+        self._redo_stack.clear()
+        return True
+
+    def _get_state(self) -> GameState:
+        return (self.current_player, self.passed_last_turn, self.game_over)
+
+    def _set_state(self, state: GameState):
+        self.current_player, self.passed_last_turn, self.game_over = state
 
     def switch_turn(self):
         self.current_player = self.board.get_opponent(self.current_player)
 
-        if not self.get_valid_moves():
+        if not self.get_valid_moves_mask():
             if self.passed_last_turn:
                 self.game_over = True
             else:
                 self.passed_last_turn = True
                 self.current_player = self.board.get_opponent(self.current_player)
-                if not self.get_valid_moves():
+                if not self.get_valid_moves_mask():
                     self.game_over = True
         else:
             self.passed_last_turn = False
@@ -61,27 +92,41 @@ class Game:
         return self.board.count_stones()
 
     def reset(self):
-        self.board = Board()
+        self.board = self._create_board()
         self.current_player = Board.BLACK
         self.history = []
         self.game_over = False
         self.passed_last_turn = False
+        self._undo_stack = []
+        self._redo_stack = []
 
     def undo(self) -> bool:
-        if not self.history:
+        """直前の手を取り消す。記録した反転石と手番状態から O(1) で戻す"""
+        if not self._undo_stack:
             return False
 
-        self.board = Board()
-        self.current_player = Board.BLACK
-        self.game_over = False
-        self.passed_last_turn = False
+        entry = self._undo_stack.pop()
+        record, before, _ = entry
+        self.board.unmake_move(record)
+        self._set_state(before)
+        self.history.pop()
+        self._redo_stack.append(entry)
+        return True
 
-        history_copy = self.history[:-1]
-        self.history = []
+    def can_redo(self) -> bool:
+        return bool(self._redo_stack)
 
-        for row, col, _ in history_copy:
-            self.make_move(row, col)
+    def redo(self) -> bool:
+        """undo で取り消した手をやり直す"""
+        if not self._redo_stack:
+            return False
 
+        entry = self._redo_stack.pop()
+        (row, col, player, _), _, after = entry
+        self.board.apply_move(row, col, player)
+        self._set_state(after)
+        self.history.append((row, col, player))
+        self._undo_stack.append(entry)
         return True
 
     def get_player_name(self, player: int) -> str:
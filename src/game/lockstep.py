@@ -0,0 +1,130 @@
+"""ランダム/貪欲 AI 同士の対局を BoardBatch でまとめて進める
+
+AutoPlayManager の瞬間実行モードで、easy (ランダム) と medium (ひっくり返す石が
+最多の手) の対局を lanes 局ずつ1手ずつ揃えて進める。パスと終局は局ごとに
+Game と同じ規則で扱い、結果は GameResult として返す。
+
+medium の手は AI.get_greedy_move と同じく、返す石が最多の手のうちマス番号が
+最小のものを選ぶ。easy の乱数は NumPy の生成器を使うので、AI.get_random_move
+と同じ手順にはならない。
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .auto_play_manager import GameResult
+from .board import Board
+from .board_batch import BoardBatch
+
+SUPPORTED_DIFFICULTIES = ("easy", "medium")
+
+
+class LockstepSelfPlay:
+    def __init__(
+        self,
+        black_difficulty: str = "medium",
+        white_difficulty: str = "medium",
+        lanes: int = 256,
+        seed: Optional[int] = None,
+        record_moves: bool = False,
+    ):
+        for difficulty in (black_difficulty, white_difficulty):
+            if difficulty not in SUPPORTED_DIFFICULTIES:
+                raise ValueError(f"Unsupported difficulty: {difficulty}")
+        self.difficulties: Dict[int, str] = {
+            Board.BLACK: black_difficulty,
+            Board.WHITE: white_difficulty,
+        }
+        self.lanes = max(1, lanes)
+        self.rng = np.random.default_rng(seed)
+        # True なら GameResult に棋譜を残す
+        self.record_moves = record_moves
+
+    def play(self, games: int) -> Iterator[GameResult]:
+        """games 局を打ち、終局した順に結果を返す"""
+        remaining = games
+        while remaining > 0:
+            count = min(self.lanes, remaining)
+            yield from self._play_batch(count)
+            remaining -= count
+
+    def _choose(self, flips: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """(N, 64) の返る石から各局の手のマス番号を選ぶ"""
+        counts = np.bitwise_count(flips).astype(np.int64)
+        choice = np.zeros(len(flips), dtype=np.int64)
+        for player, difficulty in self.difficulties.items():
+            lanes = players == player
+            if not lanes.any():
+                continue
+            if difficulty == "medium":
+                # argmax は最大値のうち最初の位置を返す
+                choice[lanes] = np.argmax(counts[lanes], axis=1)
+            else:
+                keys = self.rng.random(counts[lanes].shape)
+                choice[lanes] = np.argmax(np.where(counts[lanes] > 0, keys, -1), axis=1)
+        return choice
+
+    def _play_batch(self, count: int) -> Iterator[GameResult]:
+        batch = BoardBatch.initial(count)
+        players = np.full(count, Board.BLACK, dtype=np.int64)
+        active = np.ones(count, dtype=bool)
+        move_counts = np.zeros(count, dtype=np.int64)
+        histories: List[List[Tuple[int, int, int]]] = [[] for _ in range(count)]
+
+        while active.any():
+            lanes = np.flatnonzero(active)
+            sub = BoardBatch(batch.black[lanes], batch.white[lanes])
+            sub_players = players[lanes]
+            squares = self._choose(sub.get_all_flips(sub_players), sub_players)
+            sub.apply_moves(squares, sub_players)
+            batch.black[lanes] = sub.black
+            batch.white[lanes] = sub.white
+            move_counts[lanes] += 1
+            if self.record_moves:
+                for lane, square, player in zip(
+                    lanes.tolist(), squares.tolist(), sub_players.tolist(), strict=True
+                ):
+                    histories[lane].append((square // 8, square % 8, player))
+
+            # 相手に手があれば交代、なければ同じ手番、どちらもなければ終局
+            opponents = np.where(sub_players == Board.BLACK, Board.WHITE, Board.BLACK)
+            opponent_can_move = sub.get_valid_moves_mask(opponents) != 0
+            player_can_move = sub.get_valid_moves_mask(sub_players) != 0
+            players[lanes] = np.where(opponent_can_move, opponents, sub_players)
+            finished = ~opponent_can_move & ~player_can_move
+            active[lanes[finished]] = False
+
+            if finished.any():
+                black_counts, white_counts = sub.count_discs()
+                for index in np.flatnonzero(finished).tolist():
+                    lane = lanes[index]
+                    yield self._make_result(
+                        int(black_counts[index]),
+                        int(white_counts[index]),
+                        int(move_counts[lane]),
+                        histories[lane] if self.record_moves else None,
+                    )
+
+    def _make_result(
+        self,
+        black: int,
+        white: int,
+        total_moves: int,
+        history: Optional[List[Tuple[int, int, int]]],
+    ) -> GameResult:
+        if black > white:
+            winner = Board.BLACK
+        elif white > black:
+            winner = Board.WHITE
+        else:
+            winner = 0
+        return GameResult(
+            winner=winner,
+            black_score=black,
+            white_score=white,
+            total_moves=total_moves,
+            black_ai_difficulty=self.difficulties[Board.BLACK],
+            white_ai_difficulty=self.difficulties[Board.WHITE],
+            moves=history,
+        )
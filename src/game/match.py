@@ -0,0 +1,310 @@
+"""2つの AI の強さを比べる対戦 (Elo 推定と SPRT による打ち切り)
+
+AutoPlayManager の黒の AI を候補、白の AI を基準とし、先後を入れ替えた2局を
+1組として打つ。組ごとに Elo の推定値と逐次確率比検定 (SPRT) の対数尤度比を
+更新し、検定の境界に達した時点で打ち切る。
+
+対数尤度比は、組の得点 (0, 0.5, 1, 1.5, 2) の5通りの分布から正規近似で
+求める (一般化 SPRT)。
+
+    python -m game.match "hard:evaluator=pattern" hard --elo1 20 --workers 4
+"""
+
+import argparse
+import asyncio
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+from .auto_play_manager import AutoPlayManager, AutoPlayState, GameResult
+from .board import Board
+from .parallel_play import GamePool, play_game
+
+CONTINUE = "continue"
+ACCEPT_H0 = "H0"  # 候補は elo0 より強くない
+ACCEPT_H1 = "H1"  # 候補は elo1 以上強い
+
+# 対数尤度比を求めるとき、5通りの組の得点に均等に割り振って足す組の数。
+# 数組しか打っていないときや結果が偏ったときに分散が 0 に近づき、
+# すぐに打ち切ってしまうのを防ぐ
+PRIOR_PAIRS = 1.0
+
+
+def elo_to_score(elo: float) -> float:
+    """Elo 差から期待得点 (1局あたり) を求める"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+class SPRT:
+    """候補から見た組の得点を数え、対数尤度比と Elo を求める"""
+
+    def __init__(
+        self,
+        elo0: float = 0.0,
+        elo1: float = 10.0,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+    ):
+        if elo1 <= elo0:
+            raise ValueError("elo1 must be greater than elo0")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        # pair_counts[k] は組の得点が k / 2 だった回数
+        self.pair_counts = [0] * 5
+
+    @property
+    def lower_bound(self) -> float:
+        return math.log(self.beta / (1 - self.alpha))
+
+    @property
+    def upper_bound(self) -> float:
+        return math.log((1 - self.beta) / self.alpha)
+
+    @property
+    def pairs(self) -> int:
+        return sum(self.pair_counts)
+
+    def add_pair(self, first: float, second: float):
+        """1組の2局それぞれの候補の得点 (勝ち 1, 引き分け 0.5, 負け 0) を加える"""
+        self.pair_counts[round((first + second) * 2)] += 1
+
+    def _moments(self, counts: List[float]) -> Tuple[float, float, float]:
+        """(組の数, 1局あたりの平均得点, 組ごとの得点の分散)"""
+        total = sum(counts)
+        mean = sum(count * k / 4 for k, count in enumerate(counts)) / total
+        variance = (
+            sum(count * (k / 4 - mean) ** 2 for k, count in enumerate(counts)) / total
+        )
+        return total, mean, variance
+
+    def llr(self) -> float:
+        """対数尤度比。正なら候補が elo1 だけ強い方に傾いている"""
+        if not self.pairs:
+            return 0.0
+        prior = PRIOR_PAIRS / len(self.pair_counts)
+        counts = [count + prior for count in self.pair_counts]
+        total, mean, variance = self._moments(counts)
+        score0 = elo_to_score(self.elo0)
+        score1 = elo_to_score(self.elo1)
+        return (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance / total)
+
+    @property
+    def status(self) -> str:
+        llr = self.llr()
+        if llr >= self.upper_bound:
+            return ACCEPT_H1
+        if llr <= self.lower_bound:
+            return ACCEPT_H0
+        return CONTINUE
+
+    def elo(self) -> Tuple[float, float]:
+        """(Elo 差の推定値, 95% 信頼区間の幅の半分)"""
+        if not self.pairs:
+            return 0.0, float("inf")
+        total, mean, variance = self._moments(self.pair_counts)
+        margin = 1.96 * math.sqrt(variance / total)
+        upper = score_to_elo(mean + margin)
+        lower = score_to_elo(mean - margin)
+        return score_to_elo(mean), (upper - lower) / 2
+
+
+class MatchRunner:
+    """AutoPlayManager の2つの AI を先後入れ替えの組で打たせる
+
+    結果は manager の Statistics と on_game_end に通常の自動対戦と同じく渡す。
+    manager.workers が2以上なら GamePool で分担する。
+    """
+
+    def __init__(
+        self,
+        manager: AutoPlayManager,
+        sprt: Optional[SPRT] = None,
+        max_pairs: int = 1000,
+    ):
+        self.manager = manager
+        self.sprt = sprt or SPRT()
+        self.max_pairs = max(1, max_pairs)
+        # 候補から見た勝ち/引き分け/負けの数
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def candidate(self) -> str:
+        return self.manager.black_ai.spec
+
+    @property
+    def baseline(self) -> str:
+        return self.manager.white_ai.spec
+
+    def _candidate_score(self, result: GameResult) -> float:
+        color = Board.WHITE
+        if result.black_ai_difficulty == self.candidate:
+            color = Board.BLACK
+        if result.winner == color:
+            self.wins += 1
+            return 1.0
+        if result.winner == 0:
+            self.draws += 1
+            return 0.5
+        self.losses += 1
+        return 0.0
+
+    def _record(self, result: GameResult) -> float:
+        """manager に結果を渡し、候補の得点を返す"""
+        self.manager.current_game_number += 1
+        self.manager._record_result(result)
+        return self._candidate_score(result)
+
+    def _add_pair(self, first: float, second: float) -> bool:
+        """組を加え、打ち切るなら True"""
+        self.sprt.add_pair(first, second)
+        if self.manager.on_update:
+            self.manager.on_update()
+        return self.sprt.status != CONTINUE
+
+    async def run(self) -> Dict:
+        """境界に達するか max_pairs 組打つまで対戦し、結果の要約を返す"""
+        manager = self.manager
+        if not manager.black_ai or not manager.white_ai:
+            raise ValueError("Both black and white AI must be set")
+        if self.candidate == self.baseline:
+            raise ValueError("Candidate and baseline must be different AIs")
+        if manager.workers > 1:
+            manager._check_worker_ais()
+
+        manager.state = AutoPlayState.PLAYING
+        manager._stop_requested = False
+        manager.current_game_number = 0
+        manager.statistics = manager.create_statistics()
+        try:
+            if manager.workers > 1:
+                await self._play_parallel()
+            else:
+                await self._play_sequential()
+            if not manager._stop_requested:
+                manager.state = AutoPlayState.FINISHED
+                if manager.on_all_games_end:
+                    manager.on_all_games_end(manager.statistics)
+        finally:
+            manager.statistics.close()
+            manager.state = AutoPlayState.IDLE
+        return self.get_summary()
+
+    async def _play_sequential(self):
+        manager = self.manager
+        candidate, baseline = manager.black_ai, manager.white_ai
+        record_moves = manager._should_record_moves()
+        if manager.seed is not None:
+            random.seed(manager.seed)
+        for _ in range(self.max_pairs):
+            if manager._stop_requested:
+                break
+            first = self._record(
+                play_game(manager.game, candidate, baseline, record_moves)
+            )
+            second = self._record(
+                play_game(manager.game, baseline, candidate, record_moves)
+            )
+            if self._add_pair(first, second):
+                break
+            # 停止の要求や画面の更新を受け付ける
+            await asyncio.sleep(0)
+
+    async def _play_parallel(self):
+        manager = self.manager
+        pairings = [
+            (self.candidate, self.baseline, self.max_pairs),
+            (self.baseline, self.candidate, self.max_pairs),
+        ]
+        # 候補が黒の局と白の局を届いた順に1つずつ組にする
+        as_black: List[float] = []
+        as_white: List[float] = []
+        with GamePool(manager.workers) as pool:
+            async for result in pool.play_pairings(
+                pairings,
+                use_bitboard=manager.game.use_bitboard,
+                seed=manager.seed,
+                record_moves=manager._should_record_moves(),
+            ):
+                if manager._stop_requested:
+                    break
+                score = self._record(result)
+                if result.black_ai_difficulty == self.candidate:
+                    as_black.append(score)
+                else:
+                    as_white.append(score)
+                if as_black and as_white:
+                    if self._add_pair(as_black.pop(0), as_white.pop(0)):
+                        break
+            manager.worker_utilisation = pool.get_utilisation()
+
+    def get_summary(self) -> Dict:
+        elo, margin = self.sprt.elo()
+        return {
+            "candidate": self.candidate,
+            "baseline": self.baseline,
+            "pairs": self.sprt.pairs,
+            "games": self.wins + self.draws + self.losses,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "elo": elo,
+            "elo_margin": margin,
+            "llr": self.sprt.llr(),
+            "lower_bound": self.sprt.lower_bound,
+            "upper_bound": self.sprt.upper_bound,
+            "status": self.sprt.status,
+        }
+
+
+def format_summary(summary: Dict) -> str:
+    return (
+        f"{summary['candidate']} vs {summary['baseline']}: "
+        f"{summary['games']} games ({summary['pairs']} pairs) "
+        f"W/D/L {summary['wins']}/{summary['draws']}/{summary['losses']}\n"
+        f"Elo {summary['elo']:+.1f} +/- {summary['elo_margin']:.1f}  "
+        f"LLR {summary['llr']:.2f} "
+        f"[{summary['lower_bound']:.2f}, {summary['upper_bound']:.2f}]  "
+        f"{summary['status']}"
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.match", description="2つの AI を SPRT で比べる"
+    )
+    parser.add_argument("candidate", help='候補の AI (例: "hard:evaluator=pattern")')
+    parser.add_argument("baseline", help="基準の AI")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--max-pairs", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bitboard", action="store_true", help="BitBoard で打つ")
+    args = parser.parse_args(argv)
+
+    try:
+        sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    except ValueError as error:
+        parser.error(str(error))
+
+    manager = AutoPlayManager(use_bitboard=args.bitboard)
+    manager.set_ai_players(args.candidate, args.baseline)
+    manager.workers = args.workers
+    manager.seed = args.seed
+    runner = MatchRunner(manager, sprt, args.max_pairs)
+    print(format_summary(asyncio.run(runner.run())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""結果を残さずに集計するための統計
+
+RunningStats は Welford 法で平均と分散を逐次更新する。QuantileSketch は
+範囲の決まった整数 (手数や石差) の度数表で、値の個数によらず一定の
+メモリで分位点を求める。範囲外の値は端に丸める。
+"""
+
+import math
+from typing import List
+
+
+class RunningStats:
+    """件数、平均、分散、最小値、最大値を逐次更新する"""
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # 平均からの偏差の2乗和
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """標本分散 (n - 1 で割る)。2件未満なら 0"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """low 以上 high 以下の整数の度数表"""
+
+    __slots__ = ("low", "high", "counts", "count")
+
+    def __init__(self, low: int, high: int):
+        if high < low:
+            raise ValueError("high must not be less than low")
+        self.low = low
+        self.high = high
+        self.counts: List[int] = [0] * (high - low + 1)
+        self.count = 0
+
+    def add(self, value: int):
+        index = min(max(int(value), self.low), self.high) - self.low
+        self.counts[index] += 1
+        self.count += 1
+
+    def quantile(self, q: float) -> int:
+        """q 分位点 (0 <= q <= 1)。値が1つもなければ ValueError"""
+        if not self.count:
+            raise ValueError("No values have been added")
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        # 小さい方から数えて rank 番目 (1 始まり) の値を返す
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.low + index
+        return self.high
@@ -0,0 +1,143 @@
+"""定石ブック
+
+局面ごとの候補手と評価値を、固定長レコードをキー順に並べたファイルに
+保存する。ファイルは mmap で開いて二分探索するので、開くときに全体を
+読み込まない。
+
+局面は盤面の8通りの対称形のうちビットボードが最小のもの (正規形) で引く。
+手は正規形での座標で保存し、引いたときに元の向きへ戻す。ハッシュは
+zobrist のシード固定の鍵で計算するため、プロセスをまたいでも同じ値になる。
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .bitops import (
+    INVERSE_TRANSFORMS,
+    SQUARE_TRANSFORMS,
+    TRANSFORM_COUNT,
+    canonical_bits,
+    transform_bits,
+)
+from .board import Board
+from .zobrist import compute_hash, side_key
+
+# (正規形のハッシュ, 評価値, 正規形での手のマス番号)
+RECORD = struct.Struct("<QhB5x")
+
+Entry = Tuple[int, int, int]
+
+
+def canonicalize(black: int, white: int, player: int) -> Tuple[int, int]:
+    """(正規形のハッシュ, 正規形へ移す変換の番号) を返す"""
+    black, white, transform = canonical_bits(black, white)
+    return compute_hash(black, white) ^ side_key(player), transform
+
+
+def canonicalize_move(
+    black: int, white: int, player: int, square: int
+) -> Tuple[int, int]:
+    """(正規形のハッシュ, 正規形での手のマス番号) を返す
+
+    局面自体が対称なときは、同じ正規形になる変換のうち手のマス番号が
+    最小になるものを使い、対称な手を1つにまとめる。
+    """
+    canonical_black, canonical_white, _ = canonical_bits(black, white)
+    canonical_square = min(
+        SQUARE_TRANSFORMS[transform][square]
+        for transform in range(TRANSFORM_COUNT)
+        if transform_bits(black, transform) == canonical_black
+        and transform_bits(white, transform) == canonical_white
+    )
+    key = compute_hash(canonical_black, canonical_white) ^ side_key(player)
+    return key, canonical_square
+
+
+def make_entry(board: Board, player: int, move: Tuple[int, int], score: int) -> Entry:
+    """盤面と手から、ブックに書き込むレコードを作る"""
+    black, white = board.get_bits(Board.BLACK)
+    key, square = canonicalize_move(black, white, player, move[0] * 8 + move[1])
+    return key, score, square
+
+
+def write_book(path: Union[str, Path], entries: Iterable[Entry]):
+    """レコードをキー順に並べてファイルに書き出す"""
+    records = sorted(entries, key=lambda entry: (entry[0], entry[2]))
+    with open(path, "wb") as file:
+        for key, score, square in records:
+            file.write(RECORD.pack(key, score, square))
+
+
+class OpeningBook:
+    """mmap で開いた定石ブック"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        self.count = size // RECORD.size
+        # 空のファイルは mmap できない
+        self._data: Optional[mmap.mmap] = None
+        if self.count:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def _read(self, index: int) -> Entry:
+        return RECORD.unpack_from(self._data, index * RECORD.size)
+
+    def _lower_bound(self, key: int) -> int:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._read(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, board: Board, player: int) -> List[Tuple[Tuple[int, int], int]]:
+        """登録された (手, 評価値) の一覧。手は board の向きの座標"""
+        if self._data is None:
+            return []
+        black, white = board.get_bits(Board.BLACK)
+        key, transform = canonicalize(black, white, player)
+        inverse = SQUARE_TRANSFORMS[INVERSE_TRANSFORMS[transform]]
+
+        moves = []
+        index = self._lower_bound(key)
+        while index < self.count:
+            entry_key, score, square = self._read(index)
+            if entry_key != key:
+                break
+            moves.append((divmod(inverse[square], 8), score))
+            index += 1
+        return moves
+
+    def get_move(
+        self, board: Board, player: int
+    ) -> Optional[Tuple[Tuple[int, int], int]]:
+        """評価値が最も高い合法な手と評価値。登録がなければ None"""
+        valid_moves = board.get_valid_moves_mask(player)
+        best = None
+        for move, score in self.lookup(board, player):
+            if not valid_moves >> (move[0] * 8 + move[1]) & 1:
+                continue
+            if best is None or score > best[1]:
+                best = (move, score)
+        return best
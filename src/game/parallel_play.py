@@ -0,0 +1,266 @@
+"""プロセスプールで自動対戦を分担する
+
+対局を shard_size 局ずつの塊 (シャード) に分け、空いたワーカープロセスに
+1つずつ渡す。各ワーカーは自前の Game と AI の組を使い回して打ち、シャードが
+終わった順に GameResult を返す。難易度の違う組み合わせを1回でまとめて打て、
+ワーカーごとの稼働率を記録する。AI は "hard:max_depth=4" のように
+コンストラクタ引数付きでも指定できる。
+
+    pool = GamePool(workers=4)
+    async for result in pool.play("easy", "medium", games=1000):
+        ...
+    pairings = [("hard", "easy", 10), ("easy", "easy", 500)]
+    async for result in pool.play_pairings(pairings):
+        ...
+    pool.get_utilisation()  # {pid: 対局していた時間の割合}
+    pool.close()
+"""
+
+import asyncio
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .ai import AI, parse_ai_spec
+from .auto_play_manager import GameResult
+from .board import Board
+from .game import Game
+
+# シャードの大きさの上限。小さいほど結果が細かく届く
+MAX_SHARD_SIZE = 32
+# 難易度ごとの1局あたりのおおよその重さ。シャードの大きさと渡す順に使う
+DIFFICULTY_COST = {"easy": 1, "medium": 1, "hard": 64}
+
+# (黒の AI, 白の AI, 局数)。AI は ai.parse_ai_spec の形式の文字列
+Pairing = Tuple[str, str, int]
+
+# ワーカープロセス側の (Game, 黒の AI, 白の AI)
+_worker_players: Dict[Tuple[str, str, bool], Tuple[Game, AI, AI]] = {}
+
+
+def play_game(
+    game: Game, black_ai: AI, white_ai: AI, record_moves: bool = False
+) -> GameResult:
+    """game を初期化して終局まで打ち、結果を返す。record_moves なら棋譜も残す"""
+    game.reset()
+    while not game.is_game_over():
+        if not game.get_valid_moves_mask():
+            game.switch_turn()
+            continue
+        player = game.get_current_player()
+        ai = black_ai if player == Board.BLACK else white_ai
+        move = ai.get_move(game)
+        game.make_move(move[0], move[1])
+
+    score = game.get_score()
+    return GameResult(
+        winner=game.get_winner(),
+        black_score=score[Board.BLACK],
+        white_score=score[Board.WHITE],
+        total_moves=len(game.history),
+        black_ai_difficulty=black_ai.spec,
+        white_ai_difficulty=white_ai.spec,
+        moves=list(game.history) if record_moves else None,
+    )
+
+
+def _get_worker_players(
+    black_spec: str, white_spec: str, use_bitboard: bool
+) -> Tuple[Game, AI, AI]:
+    """プロセスごとに Game と AI を使い回す"""
+    key = (black_spec, white_spec, use_bitboard)
+    if key not in _worker_players:
+        _worker_players[key] = (
+            Game(use_bitboard=use_bitboard),
+            AI.from_spec(black_spec),
+            AI.from_spec(white_spec),
+        )
+    return _worker_players[key]
+
+
+def _play_shard(
+    black_spec: str,
+    white_spec: str,
+    count: int,
+    use_bitboard: bool,
+    seed: int,
+    record_moves: bool = False,
+) -> Tuple[int, float, List[GameResult]]:
+    """(ワーカーの pid, 対局にかかった秒数, 結果) を返す"""
+    started = time.perf_counter()
+    # fork したワーカーは乱数の状態が同じなので、シャードごとに設定し直す
+    random.seed(seed)
+    game, black_ai, white_ai = _get_worker_players(black_spec, white_spec, use_bitboard)
+    results = []
+    for _ in range(count):
+        results.append(play_game(game, black_ai, white_ai, record_moves))
+    return os.getpid(), time.perf_counter() - started, results
+
+
+def get_pairing_cost(black_spec: str, white_spec: str) -> int:
+    """1局あたりのおおよその重さ。知らない難易度は探索する AI とみなす"""
+    default = DIFFICULTY_COST["hard"]
+    return sum(
+        DIFFICULTY_COST.get(parse_ai_spec(spec)[0], default)
+        for spec in (black_spec, white_spec)
+    )
+
+
+class WorkerStats:
+    """ワーカー1つ分の稼働の記録"""
+
+    __slots__ = ("chunks", "games", "busy")
+
+    def __init__(self):
+        self.chunks = 0
+        self.games = 0
+        self.busy = 0.0  # 対局していた秒数
+
+
+class GamePool:
+    """自動対戦用のプロセスプール
+
+    シャードは最初にまとめて渡さず、空いたワーカーに1つずつ渡す (ワーカー数
+    より多くは投入しない)。重い組み合わせのシャードほど小さく、先に渡すので、
+    対局の長さが揃わなくても終盤にワーカーが遊びにくい。
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # pid -> 稼働の記録。play/play_pairings のたびに作り直す
+        self.worker_stats: Dict[int, WorkerStats] = {}
+        self.last_run: Dict = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            # 途中で止めたときに残ったシャードは打たない
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def get_shard_size(self, games: int, cost: int = 2) -> int:
+        """ワーカーあたり4つ程度に分ける
+
+        上限は easy 同士で MAX_SHARD_SIZE、重い組み合わせほど小さくする。
+        """
+        limit = max(1, MAX_SHARD_SIZE * 2 // cost)
+        return max(1, min(limit, math.ceil(games / (self.workers * 4))))
+
+    def make_shards(
+        self, pairings: Iterable[Pairing], shard_size: Optional[int] = None
+    ) -> List[Pairing]:
+        """(黒, 白, 局数) の一覧をシャードに分け、重いものから並べる"""
+        shards = []
+        for black, white, games in pairings:
+            cost = get_pairing_cost(black, white)
+            size = shard_size or self.get_shard_size(games, cost)
+            for number, start in enumerate(range(0, games, size)):
+                shards.append((cost, number, black, white, min(size, games - start)))
+        # 同じ重さの組み合わせは1シャードずつ交互に渡し、どの組み合わせの結果も
+        # 早くから届くようにする。sort は安定なので、同順位は渡された順のまま
+        shards.sort(key=lambda shard: (-shard[0], shard[1]))
+        return [(black, white, count) for _, _, black, white, count in shards]
+
+    def get_utilisation(self) -> Dict[int, float]:
+        """直近の実行でワーカーごとに対局していた時間の割合"""
+        elapsed = self.last_run.get("elapsed")
+        if not elapsed:
+            return {}
+        return {pid: stats.busy / elapsed for pid, stats in self.worker_stats.items()}
+
+    async def play(
+        self,
+        black_difficulty: str,
+        white_difficulty: str,
+        games: int,
+        use_bitboard: bool = False,
+        seed: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        record_moves: bool = False,
+    ) -> AsyncIterator[GameResult]:
+        """1つの組み合わせで games 局を打ち、シャードが終わった順に結果を返す"""
+        async for result in self.play_pairings(
+            [(black_difficulty, white_difficulty, games)],
+            use_bitboard=use_bitboard,
+            seed=seed,
+            shard_size=shard_size,
+            record_moves=record_moves,
+        ):
+            yield result
+
+    async def play_pairings(
+        self,
+        pairings: Iterable[Pairing],
+        use_bitboard: bool = False,
+        seed: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        record_moves: bool = False,
+    ) -> AsyncIterator[GameResult]:
+        """(黒, 白, 局数) の組み合わせをまとめて打ち、終わった順に結果を返す
+
+        record_moves なら結果に棋譜を残す (ワーカーから送る量が増える)。
+        """
+        executor = self._get_executor()
+        shards = self.make_shards(pairings, shard_size)
+        rng = random.Random(seed)
+        seeds = [rng.getrandbits(64) for _ in shards]
+        self.worker_stats = {}
+        self.last_run = {"shards": len(shards), "games": 0}
+
+        started = time.perf_counter()
+        next_shard = 0
+        pending = set()
+
+        def submit():
+            nonlocal next_shard
+            black, white, count = shards[next_shard]
+            future = executor.submit(
+                _play_shard,
+                black,
+                white,
+                count,
+                use_bitboard,
+                seeds[next_shard],
+                record_moves,
+            )
+            pending.add(asyncio.wrap_future(future))
+            next_shard += 1
+
+        try:
+            while next_shard < len(shards) and len(pending) < self.workers:
+                submit()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for finished in done:
+                    pending.discard(finished)
+                    pid, busy, results = finished.result()
+                    stats = self.worker_stats.setdefault(pid, WorkerStats())
+                    stats.chunks += 1
+                    stats.games += len(results)
+                    stats.busy += busy
+                    self.last_run["games"] += len(results)
+                    self.last_run["elapsed"] = time.perf_counter() - started
+                    # 空いたワーカーにすぐ次のシャードを渡す
+                    if next_shard < len(shards):
+                        submit()
+                    for result in results:
+                        yield result
+        finally:
+            for future in pending:
+                future.cancel()
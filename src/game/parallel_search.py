@@ -0,0 +1,313 @@
+"""プロセスプールによるルート並列探索
+
+ルートの各手を別プロセスで読む。最初の手 (長兄) だけを先に読んで alpha を
+確定させ (young brothers wait)、残りの手は共有メモリ上の alpha を参照しながら
+並列に読む。shared_tt_size を指定すると、各ワーカーは自前の置換表の代わりに
+共有メモリ上の SharedTranspositionTable を読み書きする。
+
+評価値は整数値なので、各手は「共有 alpha - 1」より大きい値なら正確な値が
+得られる。最善値と同じ値の手は必ず正確に評価されるため、ルートの手順で
+最初に最善値を取った手を選べば逐次探索と同じ手になる。
+
+    python -m game.parallel_search  # 1/2/4/8 ワーカーでの速度比較
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .ai import AI, SearchAborted
+from .bitboard import BitBoard
+from .board import Board
+from .transposition import SharedTranspositionTable
+
+# ワーカープロセス側の状態
+_shared_alpha = None
+_shared_tt: Optional[SharedTranspositionTable] = None
+_worker_ais: Dict[tuple, AI] = {}
+
+# 集計する置換表の統計
+TT_STAT_KEYS = ("hits", "misses", "collisions", "stores", "overwrites")
+
+# (手, 評価値 (予算切れなら None), ノード数, 共有置換表の統計)
+MoveResult = Tuple[Tuple[int, int], Optional[float], int, Optional[Dict]]
+
+
+def _init_worker(shared_alpha, shared_tt=None):
+    global _shared_alpha, _shared_tt
+    _shared_alpha = shared_alpha
+    _shared_tt = shared_tt
+
+
+def _get_worker_ai(ai_options: dict) -> AI:
+    """プロセスごとに AI を使い回し、置換表やヒストリーを引き継ぐ"""
+    key = tuple(sorted(ai_options.items()))
+    if key not in _worker_ais:
+        ai = AI(difficulty="hard", **ai_options)
+        if _shared_tt is not None:
+            ai.tt = _shared_tt
+        _worker_ais[key] = ai
+    return _worker_ais[key]
+
+
+def _get_tt_stats() -> Optional[Dict]:
+    if _shared_tt is None:
+        return None
+    return {key: getattr(_shared_tt, key) for key in TT_STAT_KEYS}
+
+
+def _search_move(
+    black: int,
+    white: int,
+    player: int,
+    move: Tuple[int, int],
+    depth: int,
+    time_limit: Optional[float],
+    ai_options: dict,
+) -> MoveResult:
+    ai = _get_worker_ai(ai_options)
+    board = BitBoard()
+    board.set_bits(black, white)
+
+    shared_alpha = _shared_alpha.value
+    window = shared_alpha - 1 if shared_alpha != float("-inf") else shared_alpha
+
+    if _shared_tt is not None:
+        _shared_tt.reset_stats()
+    ai.begin_search(time_limit)
+    try:
+        score = ai.search_root_move(board, player, move, depth, window)
+    except SearchAborted:
+        return move, None, ai.nodes, _get_tt_stats()
+    finally:
+        ai.end_search()
+
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score
+    return move, score, ai.nodes, _get_tt_stats()
+
+
+class ParallelSearch:
+    """ルートの手をプロセスプールで分担して読む探索"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        ai_options: Optional[dict] = None,
+        shared_tt_size: Optional[int] = None,
+        shared_tt_bytes: Optional[int] = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        # ワーカー側 AI のコンストラクタ引数 (tt_size, move_ordering など)
+        self.ai_options = dict(ai_options or {})
+        self.nodes = 0
+        self.last_search: Dict = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._alpha = None
+        # 全ワーカーで共有する置換表。shared_tt_bytes はメモリの上限
+        self.shared_tt: Optional[SharedTranspositionTable] = None
+        if shared_tt_size:
+            self.ai_options["tt_size"] = 0
+            self.shared_tt = SharedTranspositionTable(shared_tt_size, shared_tt_bytes)
+        self.tt_stats: Dict[str, float] = {}
+        self._order_ai = AI(difficulty="hard", **self.ai_options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._alpha = multiprocessing.Value("d", float("-inf"))
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._alpha, self.shared_tt),
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.shared_tt is not None:
+            self.shared_tt.close()
+            self.shared_tt = None
+
+    def _add_tt_stats(self, stats: Dict):
+        for key, value in stats.items():
+            self.tt_stats[key] = self.tt_stats.get(key, 0) + value
+        probes = self.tt_stats["hits"] + self.tt_stats["misses"]
+        self.tt_stats["hit_rate"] = self.tt_stats["hits"] / probes if probes else 0.0
+
+    def search(
+        self,
+        board: Board,
+        player: int,
+        depth: int,
+        time_limit: Optional[float] = None,
+        first_move: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[Optional[Tuple[int, int]], float]:
+        """固定深さで読み、(最善手, 評価値) を返す
+
+        予算切れで読み切れなかった手があれば SearchAborted を送出する。
+        """
+        root_moves = self._order_ai.get_root_moves(board, player, first_move)
+        if not root_moves:
+            return None, float("-inf")
+
+        black, white = board.get_bits(Board.BLACK)
+        executor = self._get_executor()
+        deadline = time.perf_counter() + time_limit if time_limit else None
+        self._alpha.value = float("-inf")
+        self.nodes = 0
+        self.tt_stats = {}
+
+        def submit(moves: Iterable[Tuple[int, int]]):
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.perf_counter(), 0.001)
+            return [
+                executor.submit(
+                    _search_move,
+                    black,
+                    white,
+                    player,
+                    move,
+                    depth,
+                    remaining,
+                    self.ai_options,
+                )
+                for move in moves
+            ]
+
+        results: Dict[Tuple[int, int], Optional[float]] = {}
+        for batch in (root_moves[:1], root_moves[1:]):
+            for future in as_completed(submit(batch)):
+                move, score, nodes, tt_stats = future.result()
+                results[move] = score
+                self.nodes += nodes
+                if tt_stats is not None:
+                    self._add_tt_stats(tt_stats)
+            if any(score is None for score in results.values()):
+                raise SearchAborted()
+
+        best_move = None
+        best_score = float("-inf")
+        for move in root_moves:
+            if results[move] > best_score:
+                best_move = move
+                best_score = results[move]
+        return best_move, best_score
+
+    def iterative_deepening(
+        self,
+        board: Board,
+        player: int,
+        time_limit: Optional[float] = None,
+        max_depth: int = 60,
+    ) -> Tuple[Optional[Tuple[int, int]], float]:
+        """AI.iterative_deepening の並列版。予算切れの深さの結果は捨てる"""
+        start = time.perf_counter()
+        best_move = None
+        best_score = float("-inf")
+        completed_depth = 0
+        total_nodes = 0
+        total_hits = total_probes = 0
+
+        for depth in range(1, max_depth + 1):
+            remaining = None
+            if time_limit:
+                remaining = time_limit - (time.perf_counter() - start)
+                if remaining <= 0:
+                    break
+            aborted = False
+            try:
+                move, score = self.search(board, player, depth, remaining, best_move)
+            except SearchAborted:
+                aborted = True
+            total_nodes += self.nodes
+            total_hits += self.tt_stats.get("hits", 0)
+            total_probes += self.tt_stats.get("hits", 0) + self.tt_stats.get(
+                "misses", 0
+            )
+            if aborted:
+                break
+            best_move, best_score = move, score
+            completed_depth = depth
+            if depth >= board.empties:
+                break
+
+        if best_move is None:
+            best_move = next(iter(board.get_valid_moves(player)), None)
+
+        self.last_search = {
+            "move": best_move,
+            "score": best_score,
+            "depth": completed_depth,
+            "nodes": total_nodes,
+            "workers": self.workers,
+            "tt_hit_rate": total_hits / total_probes if total_probes else 0.0,
+            "time": time.perf_counter() - start,
+        }
+        return best_move, best_score
+
+
+def benchmark(
+    board: Board,
+    player: int,
+    depth: int,
+    worker_counts: Iterable[int] = (1, 2, 4, 8),
+    ai_options: Optional[dict] = None,
+) -> List[Dict]:
+    """ワーカー数ごとに固定深さの探索時間を測り、1ワーカー比の速度向上を返す"""
+    rows = []
+    base_time = None
+    for workers in worker_counts:
+        with ParallelSearch(workers, ai_options) as search:
+            search.search(board, player, 1)  # プロセス起動を計測から除く
+            start = time.perf_counter()
+            move, score = search.search(board, player, depth)
+            elapsed = time.perf_counter() - start
+
+        if base_time is None:
+            base_time = elapsed
+        rows.append(
+            {
+                "workers": workers,
+                "move": move,
+                "score": score,
+                "nodes": search.nodes,
+                "time": elapsed,
+                "speedup": base_time / elapsed if elapsed else 0.0,
+            }
+        )
+    return rows
+
+
+def main():
+    board = BitBoard()
+    player = Board.BLACK
+    for row, col in [(2, 3), (2, 2), (3, 2), (4, 2), (5, 2), (2, 4), (1, 2), (5, 4)]:
+        board.place_stone(row, col, player)
+        player = board.get_opponent(player)
+
+    header = ["workers", "move", "score", "nodes", "time", "speedup"]
+    widths = [7, 8, 7, 8, 7, 7]
+    print(
+        " ".join(f"{name:>{width}}" for name, width in zip(header, widths, strict=True))
+    )
+    for row in benchmark(board, player, depth=6):
+        print(
+            f"{row['workers']:>7} {str(row['move']):>8} {row['score']:>7.0f} "
+            f"{row['nodes']:>8} {row['time']:>6.2f}s {row['speedup']:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""パターンによる評価関数
+
+盤面を辺・隅 3x3・隅 2x5・斜めのパターンに分け、各パターンの石の並びを
+3 進数の添字 (空き 0, 手番側 1, 相手側 2) にして重み表を引く。
+
+添字はマスごとに数えずに求める。盤面をビット操作で転置・斜めに並べ替えて
+行・列・斜めの「線」を1バイトずつ取り出し、バイト値から添字の一部を引く表を
+足し合わせる。1回の評価は盤面の並べ替えが4回、表引きが百数十回で済む。
+
+重みはマスの評価値 (AI の POSITION_VALUES) を、そのマスを含むパターン数で
+割って配分したもの。ただし隅が埋まっているパターンでは、その隅に接する
+X 打ち・C 打ちのマスの減点を付けない。
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from .bitops import flip_diagonal, pseudo_rotate45_ccw, pseudo_rotate45_cw
+
+# 重みは整数にするため PATTERN_SCALE 倍して丸める
+PATTERN_SCALE = 8
+
+Square = Tuple[int, int]
+
+# 左上隅を基準にした各パターンの形。8通りの対称変換で盤面全体に置く
+PATTERN_SHAPES: Dict[str, List[Square]] = {
+    "edge": [(0, col) for col in range(8)],
+    "corner3x3": [(row, col) for row in range(3) for col in range(3)],
+    "corner2x5": [(row, col) for row in range(2) for col in range(5)],
+    "diag8": [(i, i) for i in range(8)],
+    "diag7": [(i, i + 1) for i in range(7)],
+    "diag6": [(i, i + 2) for i in range(6)],
+    "diag5": [(i, i + 3) for i in range(5)],
+    "diag4": [(i, i + 4) for i in range(4)],
+}
+
+_SYMMETRIES: List[Callable[[int, int], Square]] = [
+    lambda r, c: (r, c),
+    lambda r, c: (c, 7 - r),
+    lambda r, c: (7 - r, 7 - c),
+    lambda r, c: (7 - c, r),
+    lambda r, c: (c, r),
+    lambda r, c: (r, 7 - c),
+    lambda r, c: (7 - r, c),
+    lambda r, c: (7 - c, 7 - r),
+]
+
+_CORNERS = {(0, 0), (0, 7), (7, 0), (7, 7)}
+
+# get_line_bytes で盤面を並べ替える4通りの変換
+_VIEWS: List[Callable[[int], int]] = [
+    lambda bits: bits,
+    flip_diagonal,
+    pseudo_rotate45_cw,
+    pseudo_rotate45_ccw,
+]
+
+
+def get_line_bytes(bits: int) -> bytes:
+    """行・列・2方向の斜めの石をそれぞれ1バイトに並べた32バイト
+
+    0-7 バイト目が行、8-15 が列、16-23 が row - col の斜め、24-31 が
+    row + col の斜め。斜めは長さの和が8になる2本で1バイトを分け合う。
+    """
+    return (
+        bits.to_bytes(8, "little")
+        + flip_diagonal(bits).to_bytes(8, "little")
+        + pseudo_rotate45_cw(bits).to_bytes(8, "little")
+        + pseudo_rotate45_ccw(bits).to_bytes(8, "little")
+    )
+
+
+def _square_position(view: int, square: Square) -> Tuple[int, int]:
+    """get_line_bytes の view 番目の変換でマスが移る (バイト位置, ビット)"""
+    moved = _VIEWS[view](1 << (square[0] * 8 + square[1])).bit_length() - 1
+    return view * 8 + moved // 8, moved % 8
+
+
+def _get_instances() -> List[Tuple[str, List[Square]]]:
+    """全パターンの配置 (形の名前, マスの並び)。対称で重なるものは除く"""
+    instances = []
+    for name, shape in PATTERN_SHAPES.items():
+        seen = set()
+        for transform in _SYMMETRIES:
+            squares = [transform(row, col) for row, col in shape]
+            key = frozenset(squares)
+            if key not in seen:
+                seen.add(key)
+                instances.append((name, squares))
+    return instances
+
+
+def _split_lines(squares: List[Square]) -> List[Tuple[int, List[int]]]:
+    """パターンを線に分け、(線のバイト位置, その線に乗るマスの番号) の組を返す"""
+    rows = {row for row, _ in squares}
+    cols = {col for _, col in squares}
+    if len({row - col for row, col in squares}) == 1:
+        view = 2
+    elif len({row + col for row, col in squares}) == 1:
+        view = 3
+    else:
+        view = 0 if len(rows) <= len(cols) else 1
+
+    lines: Dict[int, List[int]] = {}
+    for i, square in enumerate(squares):
+        position, _ = _square_position(view, square)
+        lines.setdefault(position, []).append(i)
+    return sorted(lines.items())
+
+
+def _build_weights(
+    shape: List[Square], square_values: Sequence[int], coverage: List[int]
+) -> List[int]:
+    """形 shape の全ての並び (3 ** マス数通り) の重み"""
+    # 隅に接する X/C のマスについて、その隅のパターン内の番号
+    corner_of: List[int] = []
+    for row, col in shape:
+        corner = -1
+        if (row, col) not in _CORNERS:
+            for i, (r, c) in enumerate(shape):
+                if (r, c) in _CORNERS and abs(r - row) <= 1 and abs(c - col) <= 1:
+                    corner = i
+        corner_of.append(corner)
+
+    values = [
+        square_values[row * 8 + col] * PATTERN_SCALE / coverage[row * 8 + col]
+        for row, col in shape
+    ]
+    size = len(shape)
+    weights = [0] * 3**size
+    digits = [0] * size
+    for index in range(3**size):
+        total = 0.0
+        for i in range(size):
+            digit = digits[i]
+            if not digit:
+                continue
+            value = values[i]
+            if value < 0 and corner_of[i] >= 0 and digits[corner_of[i]]:
+                value = 0.0
+            total += value if digit == 1 else -value
+        weights[index] = round(total)
+
+        # digits を3進数として1進める
+        for i in range(size):
+            if digits[i] < 2:
+                digits[i] += 1
+                break
+            digits[i] = 0
+    return weights
+
+
+class PatternEvaluator:
+    """パターンの重み表を引いて評価値 (PATTERN_SCALE 倍) を求める"""
+
+    def __init__(self, square_values: Sequence[int]):
+        instances = _get_instances()
+        coverage = [0] * 64
+        for _, squares in instances:
+            for row, col in squares:
+                coverage[row * 8 + col] += 1
+
+        self.weights: Dict[str, List[int]] = {
+            name: _build_weights(shape, square_values, coverage)
+            for name, shape in PATTERN_SHAPES.items()
+        }
+
+        self.instances = instances
+        # マスごとに、そのマスを含む (パターンの番号, 3 ** パターン内の番号)
+        self.square_patterns: List[List[Tuple[int, int]]] = [[] for _ in range(64)]
+        for number, (_, squares) in enumerate(instances):
+            for i, (row, col) in enumerate(squares):
+                self.square_patterns[row * 8 + col].append((number, 3**i))
+
+        # (重み表, [(線のバイト位置, 手番側の表, 相手側の表), ...])
+        self._patterns: List[Tuple[List[int], List[Tuple[int, list, list]]]] = []
+        for name, squares in instances:
+            parts = []
+            for position, members in _split_lines(squares):
+                own_table = [0] * 256
+                for i in members:
+                    _, bit = _square_position(position // 8, squares[i])
+                    for byte in range(256):
+                        if byte >> bit & 1:
+                            own_table[byte] += 3**i
+                opp_table = [value * 2 for value in own_table]
+                parts.append((position, own_table, opp_table))
+            self._patterns.append((self.weights[name], parts))
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._patterns)
+
+    def get_weights(self, number: int) -> List[int]:
+        """number 番目のパターン配置の重み表"""
+        return self._patterns[number][0]
+
+    def get_indices(self, own: int, opp: int) -> List[int]:
+        """各パターン配置の3進数の添字"""
+        own_lines = get_line_bytes(own)
+        opp_lines = get_line_bytes(opp)
+        indices = []
+        for _, parts in self._patterns:
+            index = 0
+            for line, own_table, opp_table in parts:
+                index += own_table[own_lines[line]] + opp_table[opp_lines[line]]
+            indices.append(index)
+        return indices
+
+    def evaluate(self, own: int, opp: int) -> int:
+        """手番側 own から見たパターンの評価値"""
+        own_lines = get_line_bytes(own)
+        opp_lines = get_line_bytes(opp)
+        score = 0
+        for weights, parts in self._patterns:
+            index = 0
+            for line, own_table, opp_table in parts:
+                index += own_table[own_lines[line]] + opp_table[opp_lines[line]]
+            score += weights[index]
+        return score
+
+
+@lru_cache(maxsize=None)
+def get_pattern_evaluator(square_values: Tuple[int, ...]) -> PatternEvaluator:
+    """重み表の作成には時間がかかるため、同じマスの評価値なら使い回す"""
+    return PatternEvaluator(square_values)
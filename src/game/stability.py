@@ -0,0 +1,164 @@
+"""確定石の判定
+
+辺の確定石は 3^8 通りの辺の並びについて事前に計算した表を引いて求める。
+盤面全体の確定石は、辺の確定石と「縦・横・斜めの4方向が全て埋まった列に
+あるマス」から始めて、4方向のそれぞれで隣に自分の確定石 (または盤外・
+埋まった列) があるマスを確定石に加えていく。どちらも確定石を少なめに
+見積もることはあっても、返され得る石を確定石とすることはない。
+"""
+
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .bitops import FULL_MASK, NOT_COL_0, NOT_COL_7, flip_diagonal
+
+EDGE_TABLE_SIZE = 256 * 256
+
+ROW_0 = 0x00000000000000FF
+ROW_7 = 0xFF00000000000000
+COL_0 = 0x0101010101010101
+COL_7 = 0x8080808080808080
+BORDER = ROW_0 | ROW_7 | COL_0 | COL_7
+
+
+def _get_lines() -> List[List[int]]:
+    """横・縦・2方向の斜めについて、各列 (長さ1の斜めは除く) のマスク"""
+    rows = [0xFF << (row * 8) for row in range(8)]
+    cols = [COL_0 << col for col in range(8)]
+    diag_down = []  # row - col が等しい
+    diag_up = []  # row + col が等しい
+    for k in range(-6, 7):
+        diag_down.append(sum(1 << (r * 8 + r - k) for r in range(8) if 0 <= r - k < 8))
+    for k in range(1, 14):
+        diag_up.append(sum(1 << (r * 8 + k - r) for r in range(8) if 0 <= k - r < 8))
+    return [rows, cols, diag_down, diag_up]
+
+
+LINES = _get_lines()
+
+
+def _line_moves(own: int, opp: int, square: int) -> int:
+    """8マスの列で own が square に置いたときに返る石"""
+    flips = 0
+    for step in (1, -1):
+        run = 0
+        x = square + step
+        while 0 <= x < 8 and opp >> x & 1:
+            run |= 1 << x
+            x += step
+        if 0 <= x < 8 and own >> x & 1:
+            flips |= run
+    return flips
+
+
+def build_edge_table() -> bytes:
+    """辺の並び (own, opp) ごとの own の確定石。添字は own * 256 + opp
+
+    辺の空きマスには (他の方向で返せるため) どちらの石も置けるものとし、
+    辺の上で返る石だけを返す。その後のどんな着手の列でも own のまま
+    残るマスを確定石とする。
+    """
+    table = bytearray(EDGE_TABLE_SIZE)
+    # 空きマスの少ない並びから順に求める
+    configs = [(own, opp) for own in range(256) for opp in range(256) if not own & opp]
+    configs.sort(key=lambda config: -(config[0] | config[1]).bit_count())
+
+    for own, opp in configs:
+        stable = own
+        empty = ~(own | opp) & 0xFF
+        square = 0
+        while empty and stable:
+            if empty >> square & 1:
+                bit = 1 << square
+                # own が置く
+                flips = _line_moves(own, opp, square)
+                stable &= table[(own | bit | flips) * 256 + (opp & ~flips)]
+                # opp が置く
+                flips = _line_moves(opp, own, square)
+                stable &= table[(own & ~flips) * 256 + (opp | bit | flips)]
+                empty &= ~bit
+            square += 1
+        table[own * 256 + opp] = stable
+    return bytes(table)
+
+
+_edge_table: Optional[bytes] = None
+
+
+def load_edge_table(cache_path: Optional[Union[str, Path]] = None) -> bytes:
+    """辺の確定石の表を返す
+
+    cache_path があればそこから読み込み、無い (または壊れている) ときは
+    作って書き出す。一度読み込んだ表はプロセス内で使い回す。
+    """
+    global _edge_table
+    if cache_path is not None:
+        path = Path(cache_path)
+        if path.exists():
+            data = path.read_bytes()
+            if len(data) == EDGE_TABLE_SIZE:
+                _edge_table = data
+                return data
+        table = build_edge_table()
+        path.write_bytes(table)
+        _edge_table = table
+        return table
+
+    if _edge_table is None:
+        _edge_table = build_edge_table()
+    return _edge_table
+
+
+def get_edge_stable(own: int, opp: int) -> int:
+    """4辺にある own の確定石のビットマスク"""
+    table = _edge_table if _edge_table is not None else load_edge_table()
+    stable = table[(own & 0xFF) * 256 + (opp & 0xFF)]
+    stable |= table[(own >> 56) * 256 + (opp >> 56)] << 56
+
+    # 転置して左右の列を上下の行として引く
+    own_t = flip_diagonal(own)
+    opp_t = flip_diagonal(opp)
+    stable_t = table[(own_t & 0xFF) * 256 + (opp_t & 0xFF)]
+    stable_t |= table[(own_t >> 56) * 256 + (opp_t >> 56)] << 56
+    return stable | flip_diagonal(stable_t)
+
+
+def get_full_lines(filled: int) -> List[int]:
+    """横・縦・2方向の斜めのそれぞれで、埋まった列に含まれるマス"""
+    full = []
+    for lines in LINES:
+        mask = 0
+        for line in lines:
+            if filled & line == line:
+                mask |= line
+        full.append(mask)
+    return full
+
+
+def get_stable(own: int, opp: int) -> int:
+    """own の確定石のビットマスク"""
+    full_h, full_v, full_down, full_up = get_full_lines(own | opp)
+    stable = get_edge_stable(own, opp) | (own & full_h & full_v & full_down & full_up)
+    if not stable:
+        return 0
+
+    # 盤の端にあるマスは、盤外側の方向について常に条件を満たす
+    full_h |= COL_0 | COL_7
+    full_v |= ROW_0 | ROW_7
+    full_down |= BORDER
+    full_up |= BORDER
+    candidates = own & ~stable
+    while True:
+        horizontal = full_h | ((stable << 1) & NOT_COL_0) | ((stable >> 1) & NOT_COL_7)
+        vertical = full_v | (stable << 8) | (stable >> 8)
+        down = full_down | ((stable << 9) & NOT_COL_0) | ((stable >> 9) & NOT_COL_7)
+        up = full_up | ((stable << 7) & NOT_COL_7) | ((stable >> 7) & NOT_COL_0)
+        new = candidates & horizontal & vertical & down & up & FULL_MASK
+        if not new:
+            return stable
+        stable |= new
+        candidates &= ~new
+
+
+def count_stable(own: int, opp: int) -> int:
+    return get_stable(own, opp).bit_count()
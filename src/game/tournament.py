@@ -0,0 +1,227 @@
+"""UI なしで AI 同士のリーグ戦/ガントレットを行う
+
+    python -m game.tournament easy medium hard:max_depth=4 --games 10
+    python -m game.tournament hard easy medium --mode gauntlet --workers 4 -o out.jsonl
+
+終局ごとに1行の JSON を標準出力 (または --output のファイル) に書き、最後に
+参加者ごとの成績表を出す。JSON を標準出力に書くときは、成績表は標準エラーに
+出す。AI の指定は ai.parse_ai_spec の形式。--moves を付けると棋譜も書く。
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from dataclasses import asdict
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from .ai import AI
+from .auto_play_manager import GameResult
+from .board import Board
+from .game import Game
+from .parallel_play import GamePool, Pairing, play_game
+
+ROUND_ROBIN = "round-robin"
+GAUNTLET = "gauntlet"
+
+
+def make_pairings(players: List[str], mode: str, games: int) -> List[Pairing]:
+    """対戦の組み合わせ。先後を入れ替えて、それぞれ games 局ずつ打つ
+
+    リーグ戦は全員の総当たり、ガントレットは先頭の AI と残り全員の対戦。
+    """
+    if len(players) < 2:
+        raise ValueError("At least two players are required")
+    if mode == ROUND_ROBIN:
+        matches = [
+            (first, second)
+            for index, first in enumerate(players)
+            for second in players[index + 1 :]
+        ]
+    elif mode == GAUNTLET:
+        matches = [(players[0], opponent) for opponent in players[1:]]
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    pairings = []
+    for first, second in matches:
+        pairings.append((first, second, games))
+        pairings.append((second, first, games))
+    return pairings
+
+
+class Standing:
+    """参加者1人分の成績"""
+
+    __slots__ = ("games", "wins", "losses", "draws", "disc_diff")
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.disc_diff = 0  # 自分から見た石差の合計
+
+    @property
+    def points(self) -> float:
+        return self.wins + self.draws * 0.5
+
+    @property
+    def score_rate(self) -> float:
+        return self.points / self.games * 100 if self.games else 0.0
+
+    @property
+    def average_disc_diff(self) -> float:
+        return self.disc_diff / self.games if self.games else 0.0
+
+
+class Standings:
+    """参加者ごとの成績表"""
+
+    def __init__(self, players: List[str]):
+        self.players: Dict[str, Standing] = {player: Standing() for player in players}
+
+    def add_result(self, result: GameResult):
+        sides = [
+            (result.black_ai_difficulty, Board.BLACK, result.black_score),
+            (result.white_ai_difficulty, Board.WHITE, result.white_score),
+        ]
+        for (player, color, own), (_, _, opp) in zip(sides, sides[::-1], strict=True):
+            standing = self.players.setdefault(player, Standing())
+            standing.games += 1
+            standing.disc_diff += own - opp
+            if result.winner == color:
+                standing.wins += 1
+            elif result.winner == 0:
+                standing.draws += 1
+            else:
+                standing.losses += 1
+
+    def rows(self) -> List[tuple]:
+        """(参加者, 成績) を勝ち点の高い順に"""
+        return sorted(
+            self.players.items(),
+            key=lambda item: (-item[1].points, -item[1].disc_diff),
+        )
+
+    def format(self) -> str:
+        width = max(len("player"), *(len(player) for player in self.players))
+        lines = [
+            f"{'player':<{width}} {'games':>6} {'win':>5} {'loss':>5} {'draw':>5}"
+            f" {'score%':>7} {'discs':>7}"
+        ]
+        for player, standing in self.rows():
+            lines.append(
+                f"{player:<{width}} {standing.games:>6} {standing.wins:>5}"
+                f" {standing.losses:>5} {standing.draws:>5}"
+                f" {standing.score_rate:>6.1f}% {standing.average_disc_diff:>+7.2f}"
+            )
+        return "\n".join(lines)
+
+
+def result_to_json(number: int, result: GameResult) -> str:
+    """GameResult を1行の JSON にする"""
+    record = {"game": number, **asdict(result)}
+    return json.dumps(record, separators=(",", ":"))
+
+
+def play_sequential(
+    pairings: List[Pairing], use_bitboard: bool = False, record_moves: bool = False
+) -> Iterator[GameResult]:
+    """プロセスを使わずに順に打つ"""
+    game = Game(use_bitboard=use_bitboard)
+    for black, white, games in pairings:
+        black_ai = AI.from_spec(black)
+        white_ai = AI.from_spec(white)
+        for _ in range(games):
+            yield play_game(game, black_ai, white_ai, record_moves)
+
+
+async def run_tournament(
+    pairings: List[Pairing],
+    output: TextIO,
+    workers: int = 1,
+    use_bitboard: bool = False,
+    seed: Optional[int] = None,
+    record_moves: bool = False,
+) -> Standings:
+    """全ての組み合わせを打ち、終局ごとに output へ JSON を1行書く"""
+    players = []
+    for black, white, _ in pairings:
+        players.extend(player for player in (black, white) if player not in players)
+    standings = Standings(players)
+
+    def record(number: int, result: GameResult):
+        standings.add_result(result)
+        output.write(result_to_json(number, result) + "\n")
+        output.flush()
+
+    if workers > 1:
+        with GamePool(workers) as pool:
+            number = 0
+            async for result in pool.play_pairings(
+                pairings,
+                use_bitboard=use_bitboard,
+                seed=seed,
+                record_moves=record_moves,
+            ):
+                number += 1
+                record(number, result)
+    else:
+        if seed is not None:
+            random.seed(seed)
+        results = play_sequential(pairings, use_bitboard, record_moves)
+        for number, result in enumerate(results, 1):
+            record(number, result)
+    return standings
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.tournament", description="AI 同士の対戦を行う"
+    )
+    parser.add_argument(
+        "players", nargs="+", help='AI の指定 (例: easy, "hard:max_depth=4")'
+    )
+    parser.add_argument("--mode", choices=[ROUND_ROBIN, GAUNTLET], default=ROUND_ROBIN)
+    parser.add_argument(
+        "--games", type=int, default=10, help="組み合わせと先後ごとの対局数"
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bitboard", action="store_true", help="BitBoard で打つ")
+    parser.add_argument("--moves", action="store_true", help="JSON に棋譜も書く")
+    parser.add_argument("-o", "--output", help="JSON Lines の出力先 (既定は標準出力)")
+    args = parser.parse_args(argv)
+
+    try:
+        pairings = make_pairings(args.players, args.mode, max(1, args.games))
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            standings = asyncio.run(
+                run_tournament(
+                    pairings,
+                    output,
+                    args.workers,
+                    args.bitboard,
+                    args.seed,
+                    args.moves,
+                )
+            )
+        summary = sys.stdout
+    else:
+        standings = asyncio.run(
+            run_tournament(
+                pairings, sys.stdout, args.workers, args.bitboard, args.seed, args.moves
+            )
+        )
+        summary = sys.stderr
+    print(standings.format(), file=summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""探索用の置換表
+
+局面ハッシュ (Board.position_hash) をキーに探索結果を保存する。
+SharedTranspositionTable は共有メモリ上に置き、複数の探索プロセスで共有する。
+"""
+
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+# 保存した評価値の種類
+EXACT = 0  # 正確な値
+LOWER = 1  # 下限 (beta カット)
+UPPER = 2  # 上限 (alpha を超えなかった)
+
+# (key, depth, score, flag, best_move)
+Entry = Tuple[int, int, float, int, Optional[Tuple[int, int]]]
+
+
+class TranspositionTable:
+    """エントリ数固定の置換表
+
+    各バケットは深さ優先スロットと常時置換スロットの2エントリを持つ。
+    深い探索結果は深さ優先スロットに残り、浅い結果は常時置換スロットを上書きする。
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        self.bucket_count = max(1, size // 2)
+        self.size = self.bucket_count * 2
+        self._entries: list = [None] * self.size
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def clear(self):
+        self._entries = [None] * self.size
+        self.reset_stats()
+
+    def probe(self, key: int) -> Optional[Entry]:
+        index = (key % self.bucket_count) * 2
+        entries = self._entries
+
+        for entry in (entries[index], entries[index + 1]):
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+
+        if entries[index] is not None or entries[index + 1] is not None:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: float,
+        flag: int,
+        best_move: Optional[Tuple[int, int]],
+    ):
+        index = (key % self.bucket_count) * 2
+        entries = self._entries
+        preferred = entries[index]
+
+        if preferred is None or preferred[0] == key or depth >= preferred[1]:
+            slot = index
+        else:
+            slot = index + 1
+
+        old = entries[slot]
+        if old is not None and old[0] != key:
+            self.overwrites += 1
+        entries[slot] = (key, depth, score, flag, best_move)
+        self.stores += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        probes = self.hits + self.misses
+        used = sum(1 for entry in self._entries if entry is not None)
+        return {
+            "size": self.size,
+            "used": used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
+
+
+# 共有置換表の1エントリ: [key ^ info ^ score_bits, info, score_bits] の3ワード
+ENTRY_WORDS = 3
+ENTRY_BYTES = ENTRY_WORDS * 8
+_WORD_MASK = (1 << 64) - 1
+_WORD = struct.Struct("<Q")
+_SCORE = struct.Struct("<d")
+
+
+def _pack_info(depth: int, flag: int, best_move: Optional[Tuple[int, int]]) -> int:
+    """使用中ビット・フラグ・最善手・深さを1ワードに詰める"""
+    move_code = 0 if best_move is None else best_move[0] * 8 + best_move[1] + 1
+    return 1 | flag << 1 | move_code << 3 | depth << 10
+
+
+def _unpack_info(info: int) -> Tuple[int, int, Optional[Tuple[int, int]]]:
+    move_code = info >> 3 & 0x7F
+    best_move = divmod(move_code - 1, 8) if move_code else None
+    return info >> 10, info >> 1 & 0x3, best_move
+
+
+class SharedTranspositionTable:
+    """multiprocessing.shared_memory 上の置換表
+
+    TranspositionTable と同じインターフェースで、複数プロセスの AI から同時に
+    読み書きできる。ロックは取らず、キーを info と評価値に XOR して保存して
+    おき、書き込み途中のエントリは検証に失敗してミスとして扱う。
+    統計はプロセスごとに数える。
+    """
+
+    def __init__(
+        self,
+        size: int = 1 << 16,
+        max_bytes: Optional[int] = None,
+        name: Optional[str] = None,
+    ):
+        # max_bytes を超えないようにエントリ数を切り詰める
+        if max_bytes is not None:
+            size = min(size, max_bytes // ENTRY_BYTES)
+        self.bucket_count = max(1, size // 2)
+        self.size = self.bucket_count * 2
+        if name is None:
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=self.size * ENTRY_BYTES
+            )
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._words = self._shm.buf.cast("Q")
+        self.reset_stats()
+
+    @classmethod
+    def attach(cls, name: str, size: int) -> "SharedTranspositionTable":
+        """別プロセスで作られた表に接続する"""
+        return cls(size, name=name)
+
+    def __reduce__(self):
+        # プロセスプールへ渡すときは共有メモリの名前だけを送る
+        return (self.attach, (self.name, self.size))
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * ENTRY_BYTES
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """共有メモリを切り離す。作成したプロセスでは破棄もする"""
+        if getattr(self, "_words", None) is None:
+            return
+        self._words.release()
+        self._words = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def clear(self):
+        self._shm.buf[: self.nbytes] = bytes(self.nbytes)
+        self.reset_stats()
+
+    def _read(self, slot: int) -> Optional[Entry]:
+        words = self._words
+        base = slot * ENTRY_WORDS
+        check, info, score_bits = words[base], words[base + 1], words[base + 2]
+        if not info & 1:
+            return None
+        depth, flag, best_move = _unpack_info(info)
+        key = check ^ info ^ score_bits
+        score = _SCORE.unpack(_WORD.pack(score_bits))[0]
+        return (key, depth, score, flag, best_move)
+
+    def probe(self, key: int) -> Optional[Entry]:
+        key &= _WORD_MASK
+        index = (key % self.bucket_count) * 2
+        occupied = False
+
+        for slot in (index, index + 1):
+            entry = self._read(slot)
+            if entry is None:
+                continue
+            if entry[0] == key:
+                self.hits += 1
+                return entry
+            occupied = True
+
+        if occupied:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        score: float,
+        flag: int,
+        best_move: Optional[Tuple[int, int]],
+    ):
+        key &= _WORD_MASK
+        index = (key % self.bucket_count) * 2
+        preferred = self._read(index)
+
+        if preferred is None or preferred[0] == key or depth >= preferred[1]:
+            slot = index
+            old = preferred
+        else:
+            slot = index + 1
+            old = self._read(slot)
+
+        if old is not None and old[0] != key:
+            self.overwrites += 1
+        info = _pack_info(depth, flag, best_move)
+        score_bits = _WORD.unpack(_SCORE.pack(score))[0]
+        base = slot * ENTRY_WORDS
+        words = self._words
+        words[base] = key ^ info ^ score_bits
+        words[base + 1] = info
+        words[base + 2] = score_bits
+        self.stores += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        probes = self.hits + self.misses
+        infos = self._words[1::ENTRY_WORDS]
+        used = sum(info & 1 for info in infos)
+        return {
+            "size": self.size,
+            "bytes": self.nbytes,
+            "used": used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
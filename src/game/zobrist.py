@@ -0,0 +1,38 @@
+"""Zobrist ハッシュ用の乱数表
+
+乱数は固定シードで生成するため、ハッシュ値は実行をまたいで一致する。
+"""
+
+import random
+from typing import List
+
+from .bitops import iter_bits
+
+_rng = random.Random(0x5A0B815)
+
+# PIECE_KEYS[セルの値][マス]。空きマスは 0 なので何も混ぜない
+PIECE_KEYS: List[List[int]] = [
+    [0] * 64,
+    [_rng.getrandbits(64) for _ in range(64)],
+    [_rng.getrandbits(64) for _ in range(64)],
+]
+# 黒白が入れ替わるときの差分 (PIECE_KEYS[1][sq] ^ PIECE_KEYS[2][sq])
+FLIP_KEYS: List[int] = [
+    b ^ w for b, w in zip(PIECE_KEYS[1], PIECE_KEYS[2], strict=True)
+]
+# 白番のときに混ぜるキー
+SIDE_KEY: int = _rng.getrandbits(64)
+
+
+def compute_hash(black: int, white: int) -> int:
+    """石の配置から手番を含まないハッシュ値を一から計算する"""
+    value = 0
+    for square in iter_bits(black):
+        value ^= PIECE_KEYS[1][square]
+    for square in iter_bits(white):
+        value ^= PIECE_KEYS[2][square]
+    return value
+
+
+def side_key(player: int) -> int:
+    return SIDE_KEY if player == 2 else 0  # 2 は Board.WHITE
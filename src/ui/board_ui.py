@@ -63,15 +63,15 @@ class BoardUI:
 
     def update_board(self):
         board_state = self.game.get_board_state()
-        valid_moves = self.game.get_valid_moves()
-        valid_positions = set(valid_moves)
+        valid_mask = self.game.get_valid_moves_mask()
+        show_valid_moves = not self.game.is_game_over()
 
         for row in range(Board.BOARD_SIZE):
             for col in range(Board.BOARD_SIZE):
                 cell = self.cells[row][col]
                 cell_value = board_state[row][col]
 
-                if (row, col) in valid_positions and not self.game.is_game_over():
+                if show_valid_moves and valid_mask >> (row * 8 + col) & 1:
                     cell.bgcolor = self.theme.valid_move_color
                     cell.border = ft.border.all(2, self.theme.text_color)
                 else:
@@ -1,9 +1,11 @@
 import pytest
+import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from game.bitboard import BitBoard
 from game.board import Board
 from game.game import Game
 
@@ -67,6 +69,54 @@ def end_game_board():
     return board
 
 
+def play_random_moves(seed, board=None):
+    """ランダムな合法手を打ち、1手ごとに (盤面, 次の手番) を返す
+
+    seed が同じなら同じ手順になる。打てなければパスし、終局したら止める。
+    board を渡すとその盤面に打つ (既定は初期配置の BitBoard)。返す盤面は
+    打ち続ける同じオブジェクト。
+    """
+    rng = random.Random(seed)
+    board = BitBoard() if board is None else board
+    player = Board.BLACK
+    while True:
+        moves = board.get_valid_moves(player)
+        if not moves:
+            player = board.get_opponent(player)
+            moves = board.get_valid_moves(player)
+            if not moves:
+                return
+        board.place_stone(*rng.choice(moves), player)
+        player = board.get_opponent(player)
+        yield board, player
+
+
+@pytest.fixture
+def random_moves():
+    """play_random_moves を返すフィクスチャ"""
+    return play_random_moves
+
+
+@pytest.fixture
+def random_position():
+    """ランダムな合法手で進めた (盤面, 手番) を返す関数のフィクスチャ
+
+    plies 手打つか、空きマスが empties 以下になるか、終局したら止める。
+    """
+
+    def play(seed, plies=60, empties=0, board=None):
+        board = BitBoard() if board is None else board
+        player = Board.BLACK
+        if plies > 0 and board.empties > empties:
+            for ply, (_, next_player) in enumerate(play_random_moves(seed, board), 1):
+                player = next_player
+                if ply >= plies or board.empties <= empties:
+                    break
+        return board, player
+
+    return play
+
+
 @pytest.fixture
 def game_with_history():
     """履歴付きのゲームインスタンスを返すフィクスチャ"""
@@ -1,12 +1,14 @@
 import pytest
 import sys
+import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from game.ai import AI
+from game.ai import AI, parse_ai_spec
 from game.game import Game
+from game.bitboard import BitBoard
 from game.board import Board
 
 
@@ -147,6 +149,16 @@ class TestMinimaxAlgorithm:
             score, move = ai.minimax(board, 2, Board.BLACK, float("-inf"), float("inf"), True)
             assert isinstance(score, float)
 
+    def test_minimax_盤面を複製しない(self):
+        ai = AI()
+        board = Board()
+        before = [row[:] for row in board.grid]
+
+        with patch.object(Board, "copy") as mock_copy:
+            ai.minimax(board, 3, Board.BLACK, float("-inf"), float("inf"), True)
+            mock_copy.assert_not_called()
+        assert board.grid == before
+
     def test_minimax_最大化プレイヤー(self):
         ai = AI()
         board = Board()
@@ -172,6 +184,101 @@ class TestMinimaxAlgorithm:
         assert score < float("inf")
 
 
+class TestIterativeDeepening:
+    def test_時間予算内で手を返す(self):
+        ai = AI(difficulty="hard", time_limit=0.05)
+        game = Game()
+        game.make_move(2, 3)
+
+        start = time.perf_counter()
+        move = ai.get_move(game)
+        elapsed = time.perf_counter() - start
+
+        assert move in game.get_valid_moves()
+        assert elapsed < 0.5
+        assert ai.last_search["depth"] >= 1
+
+    def test_ノード予算で打ち切り(self):
+        ai = AI(difficulty="hard", time_limit=None, node_limit=512)
+        board = BitBoard()
+        move, _ = ai.iterative_deepening(board, Board.BLACK)
+        assert move in board.get_valid_moves(Board.BLACK)
+        assert ai.nodes <= 512 + 256
+        assert ai.last_search["depth"] < ai.max_depth
+
+    def test_予算切れでも盤面を元に戻す(self):
+        ai = AI(difficulty="hard", time_limit=None, node_limit=300)
+        board = BitBoard()
+        board.place_stone(2, 3, Board.BLACK)
+        before = (board.black, board.white, board.hash)
+        ai.iterative_deepening(board, Board.WHITE)
+        assert (board.black, board.white, board.hash) == before
+
+    def test_固定深さでminimaxと一致(self):
+        ai = AI(difficulty="hard", time_limit=None, tt_size=0)
+        board = BitBoard()
+        board.place_stone(2, 3, Board.BLACK)
+        _, score = ai.iterative_deepening(board, Board.WHITE, max_depth=3)
+        expected, _ = ai.minimax(
+            board, 3, Board.WHITE, float("-inf"), float("inf"), True
+        )
+        assert score == expected
+        assert ai.last_search["depth"] == 3
+
+    def test_ゲームの盤面を変更しない(self):
+        ai = AI(difficulty="hard", time_limit=0.05)
+        game = Game()
+        before = game.get_board_state()
+        ai.get_move(game)
+        assert game.get_board_state() == before
+
+
+class TestMoveOrdering:
+    def midgame_board(self):
+        board = BitBoard()
+        player = Board.BLACK
+        for move in [(2, 3), (2, 2), (3, 2), (4, 2), (5, 2), (2, 4), (1, 2), (5, 4)]:
+            board.place_stone(move[0], move[1], player)
+            player = board.get_opponent(player)
+        return board, player
+
+    def test_並べ替えで評価値は変わらずノード数が減る(self):
+        board, player = self.midgame_board()
+        plain = AI(difficulty="hard", time_limit=None, tt_size=0, move_ordering=False)
+        ordered = AI(difficulty="hard", time_limit=None, tt_size=0)
+
+        _, plain_score = plain.iterative_deepening(board, player, max_depth=4)
+        _, ordered_score = ordered.iterative_deepening(board, player, max_depth=4)
+
+        assert ordered_score == plain_score
+        assert ordered.last_search["nodes"] < plain.last_search["nodes"]
+        assert ordered.last_search["ebf"] < plain.last_search["ebf"]
+
+    def test_置換表の手を最優先(self):
+        ai = AI()
+        board = BitBoard()
+        mask = board.get_valid_moves_mask(Board.BLACK)
+        assert ai._order_moves(mask, Board.BLACK, 0, (5, 4))[0] == (5, 4)
+
+    def test_カットした手をキラーとヒストリーに記録(self):
+        ai = AI()
+        ai._record_cutoff((2, 3), Board.BLACK, 3, 1)
+        ai._record_cutoff((4, 5), Board.BLACK, 2, 1)
+        assert ai._killers[1] == [(4, 5), (2, 3)]
+        assert ai._history[Board.BLACK][2 * 8 + 3] == 9
+
+    def test_角を優先しXを後回し(self):
+        ai = AI()
+        moves = ai._order_moves(
+            (1 << 0) | (1 << 9) | (1 << 20), Board.BLACK, 0, None
+        )
+        assert moves == [(0, 0), (2, 4), (1, 1)]
+
+    def test_実効分岐係数(self):
+        assert AI.effective_branching_factor([]) == 0.0
+        assert AI.effective_branching_factor([4, 16, 64]) == pytest.approx(4.0)
+
+
 class TestBoardEvaluation:
     def test_evaluate_board_初期状態(self):
         ai = AI()
@@ -305,6 +412,18 @@ class TestAIIntegration:
         assert ai.mobility_weight == 5
         assert ai.difficulty == "easy"
 
+    def test_探索しないAIは置換表を作らない(self):
+        ai = AI(difficulty="medium")
+        ai.get_move(Game())
+        assert ai._tt is None
+        assert ai._endgame_solver is None
+        assert ai._incremental is None
+
+        ai.difficulty = "hard"
+        ai.max_depth = 2
+        ai.get_move(Game())
+        assert ai._tt is not None
+
     def test_複雑な盤面でのAI動作(self):
         ai = AI(difficulty="hard")
         game = Game()
@@ -318,4 +437,47 @@ class TestAIIntegration:
                 if ai_move:
                     game.make_move(ai_move[0], ai_move[1])
         
-        assert len(game.history) > 0
\ No newline at end of file
+        assert len(game.history) > 0
+
+
+class TestAISpec:
+    def test_引数付きの指定(self):
+        assert parse_ai_spec("hard:max_depth=4,evaluator=pattern") == (
+            "hard",
+            {"max_depth": 4, "evaluator": "pattern"},
+        )
+        assert parse_ai_spec("easy") == ("easy", {})
+
+    def test_不正な指定(self):
+        with pytest.raises(ValueError):
+            parse_ai_spec("hard:max_depth")
+
+    def test_指定からAIを作る(self):
+        ai = AI.from_spec("hard:max_depth=3,evaluator=pattern")
+        assert ai.difficulty == "hard"
+        assert ai.max_depth == 3
+        assert ai.pattern_evaluator is not None
+        assert ai.spec == "hard:max_depth=3,evaluator=pattern"
+        assert AI("medium").spec == "medium"
+
+    def test_難易度を変えると指定も変わる(self):
+        ai = AI.from_spec("easy:max_depth=3")
+        ai.difficulty = "medium"
+        assert ai.spec == "medium:max_depth=3"
+        assert AI.from_spec(ai.spec).difficulty == "medium"
+
+    def test_直接作ったAIも指定で作り直せる(self):
+        ai = AI("hard", max_depth=2, time_limit=0.05, evaluator="pattern")
+        rebuilt = AI.from_spec(ai.spec)
+        assert (rebuilt.max_depth, rebuilt.time_limit) == (2, 0.05)
+        assert rebuilt.evaluator == "pattern"
+        assert rebuilt.spec == ai.spec
+        assert ai.can_rebuild_from_spec()
+
+        ai.max_depth = 4
+        assert AI.from_spec(ai.spec).max_depth == 4
+
+    def test_指定に書けない設定(self):
+        ai = AI("hard")
+        ai.stability_weight = 0
+        assert not ai.can_rebuild_from_spec()
@@ -97,6 +97,20 @@ class TestAutoPlayManager:
         assert game_end_count["count"] == 1
         assert update_count["count"] > 0
 
+    @pytest.mark.asyncio
+    async def test_NumPyがなければlockstepを使わない(self, monkeypatch):
+        # import すると ImportError になる
+        monkeypatch.setitem(sys.modules, "game.lockstep", None)
+        manager = AutoPlayManager()
+        manager.set_ai_players("easy", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(2)
+        manager.lockstep = True
+
+        assert not manager._can_play_lockstep()
+        await manager.start()
+        assert manager.statistics.total_games == 2
+
     @pytest.mark.asyncio
     async def test_一時停止と再開(self):
         manager = AutoPlayManager()
@@ -343,4 +357,38 @@ class TestPlayModes:
 
         # 3ゲーム終了していることを確認
         assert game_count["count"] == 3
-        assert manager.statistics.total_games == 3
\ No newline at end of file
+        assert manager.statistics.total_games == 3
+
+
+class TestOnlineStatistics:
+    async def test_自動対戦で結果を残さない(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        manager = AutoPlayManager()
+        manager.set_ai_players("easy", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(4)
+        manager.keep_results = False
+        manager.spill_path = str(path)
+
+        await manager.start()
+
+        assert manager.statistics.total_games == 4
+        assert manager.statistics.results == []
+        assert len(path.read_text().splitlines()) == 4
+        assert manager.statistics._spill_file is None
+
+    async def test_棋譜は頼んだときだけ残す(self):
+        manager = AutoPlayManager()
+        manager.set_ai_players("easy", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(2)
+
+        await manager.start()
+        assert all(result.moves is None for result in manager.statistics.results)
+
+        manager.record_moves = True
+        await manager.start()
+        assert all(
+            len(result.moves) == result.total_moves
+            for result in manager.statistics.results
+        )
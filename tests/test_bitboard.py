@@ -0,0 +1,250 @@
+import random
+import sys
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.bitboard import BitBoard
+from game.bitops import (
+    INVERSE_TRANSFORMS,
+    SQUARE_TRANSFORMS,
+    TRANSFORM_COUNT,
+    canonical_bits,
+    get_moves_mask,
+    iter_bits,
+    iter_squares,
+    transform_bits,
+    transform_square,
+)
+from game.board import Board
+from game.game import Game
+
+
+@pytest.fixture
+def random_positions(random_moves):
+    """同じ手順を Board と BitBoard に適用した局面の組を返す関数"""
+
+    def play(seed, count=20):
+        moves = zip(random_moves(seed, Board()), random_moves(seed), strict=True)
+        return [
+            (board.copy(), bitboard.copy(), player)
+            for (board, _), (bitboard, player) in islice(moves, count)
+        ]
+
+    return play
+
+
+class TestBitBoardInitialization:
+    def test_初期配置の正確性(self):
+        board = BitBoard()
+        assert board.get_cell(3, 3) == Board.WHITE
+        assert board.get_cell(3, 4) == Board.BLACK
+        assert board.get_cell(4, 3) == Board.BLACK
+        assert board.get_cell(4, 4) == Board.WHITE
+        assert board.grid == Board().grid
+
+    def test_Boardとの互換性(self):
+        assert isinstance(BitBoard(), Board)
+
+
+class TestBitBoardGridView:
+    def test_gridへの代入(self):
+        board = BitBoard()
+        board.grid = [[Board.BLACK for _ in range(8)] for _ in range(8)]
+        assert board.is_full() is True
+        assert board.count_stones()[Board.BLACK] == 64
+
+    def test_gridの要素書き換え(self):
+        board = BitBoard()
+        board.grid[0][0] = Board.WHITE
+        assert board.get_cell(0, 0) == Board.WHITE
+
+        board.grid[3][3] = Board.EMPTY
+        assert board.is_empty(3, 3) is True
+
+    def test_範囲外アクセス(self):
+        board = BitBoard()
+        board.set_cell(-1, 0, Board.BLACK)
+        assert board.get_cell(-1, 0) == -1
+        assert board.get_flips(8, 8, Board.BLACK) == []
+
+
+class TestBitBoardEquivalence:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_有効手とひっくり返しがBoardと一致(self, seed, random_positions):
+        for board, bitboard, _player in random_positions(seed, count=60):
+            assert bitboard.grid == board.grid
+            assert bitboard.count_stones() == board.count_stones()
+            for current in (Board.BLACK, Board.WHITE):
+                assert bitboard.get_valid_moves(current) == board.get_valid_moves(
+                    current
+                )
+                for row in range(8):
+                    for col in range(8):
+                        assert sorted(bitboard.get_flips(row, col, current)) == sorted(
+                            board.get_flips(row, col, current)
+                        )
+
+    def test_端の折り返しがない(self):
+        board = BitBoard()
+        board.grid = [[Board.EMPTY for _ in range(8)] for _ in range(8)]
+        board.set_cell(0, 7, Board.WHITE)
+        board.set_cell(1, 0, Board.BLACK)
+        assert board.get_flips(0, 6, Board.BLACK) == []
+
+    def test_コピーの独立性(self):
+        board = BitBoard()
+        board.place_stone(2, 3, Board.BLACK)
+        copied = board.copy()
+        copied.place_stone(2, 2, Board.WHITE)
+        assert board.get_cell(2, 2) == Board.EMPTY
+        assert copied.get_cell(2, 2) == Board.WHITE
+
+
+class TestBitBoardMakeUnmake:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_連続した着手と取り消し(self, seed):
+        rng = random.Random(seed)
+        board = BitBoard()
+        player = Board.BLACK
+        states = []
+        records = []
+
+        for _ in range(40):
+            moves = board.get_valid_moves(player)
+            if not moves:
+                break
+            states.append((board.black, board.white))
+            row, col = rng.choice(moves)
+            records.append(board.apply_move(row, col, player))
+            player = board.get_opponent(player)
+
+        for record in reversed(records):
+            board.unmake_move(record)
+            assert (board.black, board.white) == states.pop()
+
+    def test_Boardと同じレコードを返す(self):
+        board = Board()
+        bitboard = BitBoard()
+        assert bitboard.apply_move(2, 3, Board.BLACK) == board.apply_move(
+            2, 3, Board.BLACK
+        )
+        assert bitboard.apply_move(0, 0, Board.WHITE) is None
+
+
+class TestMoveMask:
+    def test_初期局面の合法手マスク(self):
+        board = BitBoard()
+        mask = board.get_valid_moves_mask(Board.BLACK)
+        assert list(iter_squares(mask)) == [(2, 3), (3, 2), (4, 5), (5, 4)]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_全マス走査と一致(self, seed, random_positions):
+        for board, _, _ in random_positions(seed, count=60):
+            for player in (Board.BLACK, Board.WHITE):
+                expected = [
+                    (row, col)
+                    for row in range(8)
+                    for col in range(8)
+                    if board.get_flips(row, col, player)
+                ]
+                own, opp = board.get_bits(player)
+                assert list(iter_squares(get_moves_mask(own, opp))) == expected
+
+    def test_端で折り返さない(self):
+        board = BitBoard()
+        board.grid = [[Board.EMPTY for _ in range(8)] for _ in range(8)]
+        board.set_cell(0, 6, Board.WHITE)
+        board.set_cell(0, 5, Board.BLACK)
+        board.set_cell(1, 1, Board.WHITE)
+        board.set_cell(1, 2, Board.BLACK)
+        mask = board.get_valid_moves_mask(Board.BLACK)
+        assert list(iter_squares(mask)) == [(0, 7), (1, 0)]
+
+
+class TestSymmetry:
+    SQUARES = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, 7 - r),
+        lambda r, c: (7 - r, 7 - c),
+        lambda r, c: (7 - c, r),
+        lambda r, c: (c, r),
+        lambda r, c: (r, 7 - c),
+        lambda r, c: (7 - r, c),
+        lambda r, c: (7 - c, 7 - r),
+    ]
+
+    @pytest.mark.parametrize("transform", range(TRANSFORM_COUNT))
+    def test_ビット演算とマスの変換が一致(self, transform):
+        rng = random.Random(transform)
+        for _ in range(50):
+            bits = rng.getrandbits(64)
+            expected = 0
+            for square in iter_bits(bits):
+                row, col = self.SQUARES[transform](*divmod(square, 8))
+                expected |= 1 << (row * 8 + col)
+            assert transform_bits(bits, transform) == expected
+
+    @pytest.mark.parametrize("transform", range(TRANSFORM_COUNT))
+    def test_逆変換で元に戻る(self, transform):
+        inverse = INVERSE_TRANSFORMS[transform]
+        assert sorted(SQUARE_TRANSFORMS[transform]) == list(range(64))
+        for square in range(64):
+            row, col = transform_square(*divmod(square, 8), transform)
+            assert transform_square(row, col, inverse) == divmod(square, 8)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_対称な局面は同じ正規形(self, seed, random_positions):
+        for board, bitboard, player in random_positions(seed):
+            expected = canonical_bits(*bitboard.get_bits(Board.BLACK))[:2]
+            for transform in range(TRANSFORM_COUNT):
+                variant = bitboard.transformed(transform)
+                canonical, _ = variant.canonical()
+                assert canonical.get_bits(Board.BLACK) == expected
+                assert (
+                    variant.canonical_hash(player)[0]
+                    == bitboard.canonical_hash(player)[0]
+                )
+            # Board でも同じ正規形になる
+            canonical, _ = board.canonical()
+            assert not isinstance(canonical, BitBoard)
+            assert canonical.get_bits(Board.BLACK) == expected
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_正規形の手を元の向きに戻す(self, seed, random_positions):
+        for _, bitboard, player in random_positions(seed):
+            canonical, transform = bitboard.canonical()
+            inverse = INVERSE_TRANSFORMS[transform]
+            moves = [
+                transform_square(row, col, inverse)
+                for row, col in canonical.get_valid_moves(player)
+            ]
+            assert sorted(moves) == bitboard.get_valid_moves(player)
+
+    def test_手番でハッシュが変わる(self):
+        board = BitBoard()
+        assert board.canonical_hash(Board.BLACK) != board.canonical_hash(Board.WHITE)
+
+
+class TestGameWithBitBoard:
+    def test_フラグで盤面を切り替え(self):
+        assert isinstance(Game(use_bitboard=True).board, BitBoard)
+        assert not isinstance(Game().board, BitBoard)
+
+    def test_合法手マスクとリストの一致(self):
+        game = Game(use_bitboard=True)
+        game.make_move(2, 3)
+        assert list(iter_squares(game.get_valid_moves_mask())) == (
+            game.get_valid_moves()
+        )
+
+    def test_リセットとアンドゥで盤面種別を維持(self):
+        game = Game(use_bitboard=True)
+        game.make_move(2, 3)
+        game.undo()
+        assert isinstance(game.board, BitBoard)
+        game.reset()
+        assert isinstance(game.board, BitBoard)
@@ -173,6 +173,28 @@ class TestBoardGameState:
         assert count[Board.WHITE] == 1
         assert count[Board.EMPTY] == 59
 
+    def test_石のカウント_差分更新(self):
+        board = Board()
+        board.set_cell(0, 0, Board.BLACK)
+        board.grid[0][1] = Board.WHITE
+        record = board.apply_move(2, 3, Board.BLACK)
+        assert board.count_stones() == {
+            Board.BLACK: 5,
+            Board.WHITE: 2,
+            Board.EMPTY: 57,
+        }
+        assert board.empties == 57
+
+        board.unmake_move(record)
+        assert board.count_stones()[Board.BLACK] == 3
+        assert board.empties == 58
+
+    def test_石のカウント_gridの差し替え(self):
+        board = Board()
+        board.grid = [[Board.WHITE for _ in range(8)] for _ in range(8)]
+        assert board.count_stones()[Board.WHITE] == 64
+        assert board.empties == 0
+
     def test_ボード満杯の判定_初期(self):
         board = Board()
         assert board.is_full() is False
@@ -227,6 +249,29 @@ class TestBoardGameState:
         assert board.get_cell(0, 0) == Board.EMPTY
 
 
+class TestBoardMakeUnmake:
+    def test_着手レコードの内容(self):
+        board = Board()
+        record = board.apply_move(2, 3, Board.BLACK)
+        assert record == (2, 3, Board.BLACK, 1 << (3 * 8 + 3))
+        assert board.get_cell(3, 3) == Board.BLACK
+
+    def test_不正な手はNone(self):
+        board = Board()
+        assert board.apply_move(0, 0, Board.BLACK) is None
+        assert board.grid == Board().grid
+
+    def test_取り消しで元の盤面に戻る(self):
+        board = Board()
+        board.place_stone(2, 3, Board.BLACK)
+        before = [row[:] for row in board.grid]
+
+        record = board.apply_move(2, 2, Board.WHITE)
+        assert record is not None
+        board.unmake_move(record)
+        assert board.grid == before
+
+
 class TestBoardEdgeCases:
     def test_8方向全てのひっくり返し(self):
         board = Board()
@@ -0,0 +1,108 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI
+from game.bitboard import BitBoard
+from game.board import Board
+
+# NumPy がなければ飛ばす
+BoardBatch = pytest.importorskip("game.board_batch").BoardBatch
+
+
+@pytest.fixture
+def random_positions(random_position):
+    """手数がばらばらの局面と手番の組を返す関数"""
+
+    def play(seed, count=40):
+        rng = random.Random(seed)
+        return [
+            random_position(rng.getrandbits(32), rng.randrange(60))
+            for _ in range(count)
+        ]
+
+    return play
+
+
+class TestBoardBatch:
+    def test_初期配置(self):
+        batch = BoardBatch.initial(3)
+        assert len(batch) == 3
+        black, white = batch.count_discs()
+        assert black.tolist() == [2, 2, 2]
+        assert white.tolist() == [2, 2, 2]
+        assert batch.empties().tolist() == [60, 60, 60]
+        assert all(
+            board.get_bits(Board.BLACK) == BitBoard().get_bits(Board.BLACK)
+            for board in batch.to_boards()
+        )
+
+    def test_長さの違う配列は受け付けない(self):
+        with pytest.raises(ValueError):
+            BoardBatch([0, 0], [0])
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_合法手がBitBoardと一致(self, seed, random_positions):
+        positions = random_positions(seed)
+        batch = BoardBatch.from_boards(board for board, _ in positions)
+        players = [player for _, player in positions]
+        masks = batch.get_valid_moves_mask(players).tolist()
+        for (board, player), mask in zip(positions, masks, strict=True):
+            assert mask == board.get_valid_moves_mask(player)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_着手がBitBoardと一致(self, seed, random_positions):
+        positions = random_positions(seed)
+        rng = random.Random(seed)
+        squares = []
+        for board, player in positions:
+            moves = board.get_valid_moves(player)
+            row, col = rng.choice(moves) if moves else (-1, 0)
+            squares.append(row * 8 + col if row >= 0 else -1)
+        players = [player for _, player in positions]
+
+        batch = BoardBatch.from_boards(board for board, _ in positions)
+        flips = batch.apply_moves(squares, players).tolist()
+        for (board, player), square, flip, result in zip(
+            positions, squares, flips, batch.to_boards(), strict=True
+        ):
+            if square < 0:
+                assert flip == 0
+            else:
+                record = board.apply_move(*divmod(square, 8), player)
+                assert flip == record[3]
+            assert result.get_bits(Board.BLACK) == board.get_bits(Board.BLACK)
+
+    def test_不正な手は盤面を変えない(self):
+        batch = BoardBatch.initial(2)
+        flips = batch.apply_moves([0, 2 * 8 + 3], Board.BLACK)
+        assert flips.tolist()[0] == 0
+        first, second = batch.to_boards()
+        assert first.get_bits(Board.BLACK) == BitBoard().get_bits(Board.BLACK)
+        assert second.count_stones()[Board.BLACK] == 4
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_評価値がAIと一致(self, seed, random_positions):
+        positions = random_positions(seed)
+        batch = BoardBatch.from_boards(board for board, _ in positions)
+        players = [player for _, player in positions]
+        ai = AI()
+        ai.stability_weight = 0
+        scores = batch.evaluate(players, mobility_weight=ai.mobility_weight).tolist()
+        for (board, player), score in zip(positions, scores, strict=True):
+            assert score == ai.evaluate_board(board, player)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_石数がBitBoardと一致(self, seed, random_positions):
+        positions = random_positions(seed)
+        batch = BoardBatch.from_boards(board for board, _ in positions)
+        black, white = batch.count_discs()
+        for (board, _), b, w in zip(
+            positions, black.tolist(), white.tolist(), strict=True
+        ):
+            counts = board.count_stones()
+            assert (b, w) == (counts[Board.BLACK], counts[Board.WHITE])
@@ -0,0 +1,111 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.auto_play_manager import AutoPlayManager, PlayMode
+from game.bitboard import BitBoard
+from game.board import Board
+from game.book_builder import BookBuilder
+from game.game import Game
+from game.opening_book import OpeningBook, canonicalize
+
+
+def random_game(seed):
+    """ランダムに打った終局までの棋譜"""
+    rng = random.Random(seed)
+    game = Game(use_bitboard=True)
+    while not game.is_game_over():
+        game.make_move(*rng.choice(game.get_valid_moves()))
+    return list(game.history)
+
+
+def root_key():
+    return canonicalize(*BitBoard().get_bits(Board.BLACK), Board.BLACK)[0]
+
+
+class TestBookBuilder:
+    def test_棋譜を木に加える(self):
+        builder = BookBuilder(max_plies=4, min_games=1)
+        for seed in range(10):
+            assert builder.add_game(random_game(seed))
+        assert builder.games == 10
+        assert builder.nodes[root_key()].games == 10
+        # 初手は対称なので正規形では1通りになる
+        assert len(builder.nodes[root_key()].children) == 1
+
+    def test_終局していない棋譜は加えない(self):
+        builder = BookBuilder()
+        assert not builder.add_game(random_game(0)[:10])
+        assert not builder.add_game([(0, 0, Board.BLACK)])
+        assert builder.games == 0
+        assert builder.skipped_games == 2
+        assert builder.nodes == {}
+
+    def test_葉は平均で内部はnegamax(self):
+        builder = BookBuilder(max_plies=3, min_games=2)
+        for seed in range(40):
+            builder.add_game(random_game(seed))
+        values = builder.compute_values()
+
+        for key, node in builder.nodes.items():
+            children = [
+                builder.nodes[child]
+                for child in node.children.values()
+                if builder.nodes[child].games >= 2
+            ]
+            if not children:
+                assert values[key] == node.mean_score
+                continue
+            expected = max(
+                (
+                    values[child]
+                    if builder.nodes[child].player == node.player
+                    # 相手の手番になる局面は符号を反転する
+                    else -values[child]
+                )
+                for child in node.children.values()
+                if builder.nodes[child].games >= 2
+            )
+            assert values[key] == expected
+
+    def test_ブックを書き出して引く(self, tmp_path):
+        builder = BookBuilder(max_plies=6, min_games=2)
+        for seed in range(60):
+            builder.add_game(random_game(seed))
+        path = tmp_path / "book.bin"
+        count = builder.write(path)
+        assert count == len(builder.get_entries()) > 0
+
+        values = builder.compute_values()
+        with OpeningBook(path) as book:
+            assert len(book) == count
+            board = BitBoard()
+            move, score = book.get_move(board, Board.BLACK)
+            assert move in board.get_valid_moves(Board.BLACK)
+            assert score == round(values[root_key()])
+
+    def test_対局数の少ない局面は載せない(self, tmp_path):
+        builder = BookBuilder(min_games=2)
+        builder.add_game(random_game(0))
+        assert builder.get_entries() == []
+
+
+class TestAutoPlayBookBuilder:
+    @pytest.mark.asyncio
+    async def test_自動対戦の棋譜を渡す(self):
+        manager = AutoPlayManager(use_bitboard=True)
+        manager.set_ai_players("easy", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(3)
+        manager.book_builder = BookBuilder()
+
+        await manager.start()
+
+        results = manager.statistics.results
+        assert all(len(result.moves) == result.total_moves for result in results)
+        assert manager.book_builder.games == 3
+        assert manager.book_builder.nodes[root_key()].games == 3
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI
+from game.bitboard import BitBoard
+from game.bitops import FULL_MASK, get_flips_mask, get_moves_mask, iter_bits
+from game.board import Board
+from game.endgame import WLD_MODE, EndgameSolver
+from game.game import Game
+
+
+def brute_force(own, opp, passed=False):
+    """並べ替えも枝刈りもしない全探索による石差"""
+    moves = get_moves_mask(own, opp)
+    if not moves:
+        if passed or not ~(own | opp) & FULL_MASK:
+            return own.bit_count() - opp.bit_count()
+        return -brute_force(opp, own, True)
+
+    best = -65
+    for square in iter_bits(moves):
+        flips = get_flips_mask(own, opp, square)
+        best = max(best, -brute_force(opp ^ flips, own | flips | (1 << square)))
+    return best
+
+
+class TestEndgameSolver:
+    @pytest.mark.parametrize("seed", range(12))
+    def test_全探索と一致(self, seed, random_position):
+        board, player = random_position(seed, empties=7)
+        expected = brute_force(*board.get_bits(player))
+        score, move = EndgameSolver().solve(board, player)
+        assert score == expected
+        if move is not None:
+            assert move in board.get_valid_moves(player)
+
+    @pytest.mark.parametrize("seed", range(12))
+    def test_勝敗モードの符号(self, seed, random_position):
+        board, player = random_position(seed, empties=7)
+        expected = brute_force(*board.get_bits(player))
+        score, _ = EndgameSolver().solve(board, player, WLD_MODE)
+        assert (score > 0) == (expected > 0)
+        assert (score < 0) == (expected < 0)
+
+    def test_残り1マス(self):
+        board = BitBoard()
+        board.grid = [[Board.BLACK for _ in range(8)] for _ in range(8)]
+        board.set_cell(0, 0, Board.EMPTY)
+        board.set_cell(0, 1, Board.WHITE)
+        score, move = EndgameSolver().solve(board, Board.WHITE)
+        # 白は (0, 0) に置けないため黒が打って全て黒になる
+        assert move is None
+        assert score == -64
+
+    def test_残り2マスでパスを挟む(self):
+        board = BitBoard()
+        board.grid = [[Board.BLACK for _ in range(8)] for _ in range(8)]
+        board.set_cell(0, 0, Board.EMPTY)
+        board.set_cell(7, 7, Board.EMPTY)
+        board.set_cell(0, 1, Board.WHITE)
+        # 黒が (0, 0) に打つと白が全滅し (7, 7) は空いたまま終局する
+        assert EndgameSolver().solve(board, Board.BLACK) == (63, (0, 0))
+
+    def test_双方打てない局面(self):
+        board = BitBoard()
+        board.grid = [[Board.BLACK for _ in range(8)] for _ in range(8)]
+        for col in range(4):
+            board.set_cell(0, col, Board.EMPTY)
+        score, move = EndgameSolver().solve(board, Board.WHITE)
+        assert move is None
+        assert score == -60
+
+
+class TestAIEndgame:
+    def test_空きが閾値以下なら読み切る(self, random_position):
+        board, player = random_position(1, empties=8)
+        game = Game(use_bitboard=True)
+        game.board = board
+        game.current_player = player
+
+        ai = AI(difficulty="hard", endgame_empties=8)
+        move = ai.get_move(game)
+        assert move in game.get_valid_moves()
+        assert ai.last_search["solved"] == "exact"
+        assert ai.last_search["score"] == brute_force(*board.get_bits(player))
+
+    def test_閾値0なら評価関数で探索(self, random_position):
+        board, player = random_position(1, empties=8)
+        game = Game(use_bitboard=True)
+        game.board = board
+        game.current_player = player
+
+        ai = AI(difficulty="hard", endgame_empties=0, time_limit=0.05)
+        ai.get_move(game)
+        assert "solved" not in ai.last_search
@@ -0,0 +1,104 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI, PATTERN_EVALUATOR, POSITION_EVALUATOR, SQUARE_VALUES
+from game.bitboard import BitBoard
+from game.board import Board
+from game.eval_state import EvalState
+from game.pattern_eval import get_pattern_evaluator
+
+
+def fresh_state(board, pattern):
+    evaluator = get_pattern_evaluator(tuple(SQUARE_VALUES)) if pattern else None
+    state = EvalState(SQUARE_VALUES, evaluator)
+    state.reset(board)
+    return state
+
+
+class TestEvalState:
+    @pytest.mark.parametrize("pattern", [False, True])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_差分更新は数え直した値と一致(self, seed, pattern):
+        rng = random.Random(seed)
+        board = BitBoard()
+        state = fresh_state(board, pattern)
+        player = Board.BLACK
+        while True:
+            moves = board.get_valid_moves(player)
+            if not moves:
+                player = board.get_opponent(player)
+                moves = board.get_valid_moves(player)
+                if not moves:
+                    break
+            record = board.apply_move(*rng.choice(moves), player)
+            state.apply(record)
+            expected = fresh_state(board, pattern)
+            assert state.get_score(Board.BLACK) == expected.get_score(Board.BLACK)
+            assert state.indices == expected.indices
+            assert state.get_disc_diff(Board.WHITE) == expected.get_disc_diff(
+                Board.WHITE
+            )
+            player = board.get_opponent(player)
+
+    @pytest.mark.parametrize("pattern", [False, True])
+    def test_戻すと元の値(self, pattern, random_position):
+        board, player = random_position(3, 10)
+        state = fresh_state(board, pattern)
+        before = (state.get_score(player), state.disc_diff, list(state.indices))
+
+        records = []
+        for _ in range(6):
+            moves = board.get_valid_moves(player)
+            if not moves:
+                break
+            record = board.apply_move(*moves[0], player)
+            state.apply(record)
+            records.append(record)
+            player = board.get_opponent(player)
+        for record in reversed(records):
+            board.unmake_move(record)
+            state.undo(record)
+            player = record[2]
+
+        assert (state.get_score(player), state.disc_diff, state.indices) == before
+
+    def test_手番から見た値(self):
+        board = BitBoard()
+        board.place_stone(2, 3, Board.BLACK)
+        state = fresh_state(board, False)
+        assert state.get_disc_diff(Board.BLACK) == 3
+        assert state.get_disc_diff(Board.WHITE) == -3
+        assert state.get_score(Board.WHITE) == -state.get_score(Board.BLACK)
+
+
+class TestAIIncrementalEval:
+    @pytest.mark.parametrize("evaluator", [POSITION_EVALUATOR, PATTERN_EVALUATOR])
+    @pytest.mark.parametrize("seed", range(3))
+    def test_差分評価の有無で探索結果が一致(self, seed, evaluator, random_position):
+        board, player = random_position(seed, 12)
+        results = []
+        for incremental_eval in (True, False):
+            ai = AI(
+                difficulty="hard",
+                evaluator=evaluator,
+                incremental_eval=incremental_eval,
+                time_limit=0,
+            )
+            ai.iterative_deepening(board, player, max_depth=4)
+            results.append((ai.last_search["move"], ai.last_search["score"], ai.nodes))
+        assert results[0] == results[1]
+
+    def test_探索後は差分評価を外す(self, random_position):
+        ai = AI(difficulty="hard")
+        board, player = random_position(1, 8)
+        ai.minimax(board, 2, player, float("-inf"), float("inf"), True)
+        assert ai._eval_state is None
+
+        # 探索の外で盤面を変えても評価は数え直される
+        other = BitBoard()
+        assert ai.evaluate_board(other, Board.BLACK) == 0.0
@@ -1,4 +1,5 @@
 import pytest
+import random
 import sys
 from pathlib import Path
 
@@ -236,6 +237,57 @@ class TestSpecialOperations:
         # アンドゥ後は2手だけ実行された状態になる
         assert len(game.history) == 2
 
+    def test_リドゥ(self):
+        game = Game()
+        game.make_move(2, 3)
+        after_move = game.get_board_state()
+
+        assert game.undo() is True
+        assert game.can_redo() is True
+        assert game.redo() is True
+        assert game.get_board_state() == after_move
+        assert game.get_current_player() == Board.WHITE
+        assert game.history == [(2, 3, Board.BLACK)]
+        assert game.redo() is False
+
+    def test_新しい手でリドゥ履歴を破棄(self):
+        game = Game()
+        game.make_move(2, 3)
+        game.undo()
+        game.make_move(3, 2)
+        assert game.can_redo() is False
+
+    @pytest.mark.parametrize("seed", range(4))
+    @pytest.mark.parametrize("use_bitboard", [False, True])
+    def test_アンドゥとリドゥで状態を完全に復元(self, seed, use_bitboard):
+        rng = random.Random(seed)
+        game = Game(use_bitboard=use_bitboard)
+        snapshots = []
+
+        def snapshot():
+            return (
+                game.get_board_state(),
+                game.current_player,
+                game.passed_last_turn,
+                game.game_over,
+                list(game.history),
+            )
+
+        snapshots.append(snapshot())
+        while not game.is_game_over():
+            row, col = rng.choice(game.get_valid_moves())
+            game.make_move(row, col)
+            snapshots.append(snapshot())
+
+        for expected in reversed(snapshots[:-1]):
+            assert game.undo() is True
+            assert snapshot() == expected
+        assert game.undo() is False
+
+        for expected in snapshots[1:]:
+            assert game.redo() is True
+            assert snapshot() == expected
+
     def test_リセット(self):
         game = Game()
         game.make_move(2, 3)
@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.auto_play_manager import AutoPlayManager, PlayMode
+from game.board import Board
+from game.book_builder import BookBuilder
+from game.game import Game
+
+# NumPy がなければ飛ばす
+lockstep = pytest.importorskip("game.lockstep")
+
+
+def replay(moves):
+    """棋譜を Game で並べ直す"""
+    game = Game(use_bitboard=True)
+    for row, col, player in moves:
+        assert game.get_current_player() == player
+        assert game.make_move(row, col)
+    return game
+
+
+class TestLockstepSelfPlay:
+    @pytest.mark.asyncio
+    async def test_貪欲同士は逐次の対局と一致(self):
+        manager = AutoPlayManager(use_bitboard=True)
+        manager.set_ai_players("medium", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(1)
+        await manager.start()
+        expected = manager.statistics.results[0]
+
+        results = list(lockstep.LockstepSelfPlay("medium", "medium", lanes=4).play(3))
+        assert len(results) == 3
+        for result in results:
+            assert result == expected
+
+    @pytest.mark.parametrize("difficulties", [("easy", "easy"), ("easy", "medium")])
+    def test_棋譜を並べ直すと結果が一致(self, difficulties):
+        driver = lockstep.LockstepSelfPlay(
+            *difficulties, lanes=16, seed=0, record_moves=True
+        )
+        results = list(driver.play(40))
+        assert len(results) == 40
+        for result in results:
+            game = replay(result.moves)
+            assert game.is_game_over()
+            score = game.get_score()
+            assert result.black_score == score[Board.BLACK]
+            assert result.white_score == score[Board.WHITE]
+            assert result.winner == game.get_winner()
+            assert result.total_moves == len(result.moves)
+            assert (result.black_ai_difficulty, result.white_ai_difficulty) == (
+                difficulties
+            )
+
+    def test_同じシードなら同じ対局(self):
+        first = list(lockstep.LockstepSelfPlay("easy", "easy", seed=3).play(5))
+        second = list(lockstep.LockstepSelfPlay("easy", "easy", seed=3).play(5))
+        assert first == second
+
+    def test_対応していない難易度(self):
+        with pytest.raises(ValueError):
+            lockstep.LockstepSelfPlay("hard", "easy")
+
+
+class TestAutoPlayLockstep:
+    @pytest.mark.asyncio
+    async def test_瞬間実行でまとめて対局(self):
+        manager = AutoPlayManager()
+        manager.set_ai_players("easy", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(50)
+        manager.lockstep = True
+        manager.lockstep_lanes = 16
+        manager.book_builder = BookBuilder()
+        finished = []
+        updates = []
+        manager.on_all_games_end = finished.append
+        manager.on_update = lambda: updates.append(manager.current_game_number)
+
+        await manager.start()
+
+        stats = manager.statistics
+        assert updates == list(range(1, 51))
+        assert stats.total_games == 50
+        assert manager.current_game_number == 50
+        assert stats.black_wins + stats.white_wins + stats.draws == 50
+        assert manager.book_builder.games == 50
+        assert all(len(result.moves) == result.total_moves for result in stats.results)
+        assert finished == [stats]
+
+    @pytest.mark.asyncio
+    async def test_結果にはAIの指定を残す(self):
+        manager = AutoPlayManager()
+        manager.set_ai_players("easy", "medium:tt_size=0")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(4)
+        manager.lockstep = True
+
+        await manager.start()
+
+        assert list(manager.statistics.pairings) == [("easy", "medium:tt_size=0")]
+
+    def test_探索するAIは1局ずつ打つ(self):
+        manager = AutoPlayManager()
+        manager.set_ai_players("easy", "hard")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.lockstep = True
+        assert not manager._can_play_lockstep()
@@ -0,0 +1,143 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.auto_play_manager import AutoPlayManager, AutoPlayState
+from game.book_builder import BookBuilder
+from game.match import (
+    ACCEPT_H0,
+    ACCEPT_H1,
+    CONTINUE,
+    SPRT,
+    MatchRunner,
+    elo_to_score,
+    format_summary,
+    score_to_elo,
+)
+
+
+def make_manager(candidate, baseline, workers=1):
+    manager = AutoPlayManager(use_bitboard=True)
+    manager.set_ai_players(candidate, baseline)
+    manager.workers = workers
+    manager.seed = 1
+    return manager
+
+
+class TestSPRT:
+    def test_Eloと期待得点の変換(self):
+        assert elo_to_score(0) == 0.5
+        for elo in (-200, -10, 35, 400):
+            assert score_to_elo(elo_to_score(elo)) == pytest.approx(elo)
+
+    def test_境界(self):
+        sprt = SPRT(alpha=0.05, beta=0.05)
+        assert sprt.upper_bound == pytest.approx(2.944, abs=1e-3)
+        assert sprt.lower_bound == pytest.approx(-2.944, abs=1e-3)
+        assert sprt.llr() == 0.0
+        assert sprt.status == CONTINUE
+
+    def test_1組では決めない(self):
+        sprt = SPRT()
+        sprt.add_pair(0, 0)
+        assert sprt.status == CONTINUE
+
+    def test_勝ち越しが続けばH1(self):
+        sprt = SPRT(0, 10)
+        for _ in range(400):
+            sprt.add_pair(1, 0.5)
+            sprt.add_pair(1, 0)
+        assert sprt.pair_counts == [0, 0, 400, 400, 0]
+        assert sprt.status == ACCEPT_H1
+        elo, margin = sprt.elo()
+        assert elo == pytest.approx(score_to_elo(0.625))
+        assert 0 < margin < elo
+
+    def test_負け越しが続けばH0(self):
+        sprt = SPRT(0, 10)
+        for _ in range(100):
+            sprt.add_pair(0, 0.5)
+        assert sprt.status == ACCEPT_H0
+        assert sprt.elo()[0] < 0
+
+    def test_互角なら続ける(self):
+        sprt = SPRT(0, 10)
+        for _ in range(20):
+            sprt.add_pair(1, 0)
+        assert sprt.status == CONTINUE
+
+    def test_境界の指定が逆(self):
+        with pytest.raises(ValueError):
+            SPRT(10, 0)
+
+
+class TestMatchRunner:
+    @pytest.mark.asyncio
+    async def test_差がはっきりすれば打ち切る(self):
+        manager = make_manager("medium", "easy")
+        finished = []
+        manager.on_all_games_end = finished.append
+        runner = MatchRunner(manager, SPRT(0, 50), max_pairs=500)
+
+        summary = await runner.run()
+
+        assert summary["status"] == ACCEPT_H1
+        assert summary["pairs"] < 500
+        assert summary["games"] == summary["pairs"] * 2
+        assert manager.statistics.total_games == summary["games"]
+        assert manager.state == AutoPlayState.IDLE
+        assert finished == [manager.statistics]
+        # 先後を入れ替えて打つ
+        results = manager.statistics.results
+        assert [result.black_ai_difficulty for result in results[:4]] == [
+            "medium",
+            "easy",
+            "medium",
+            "easy",
+        ]
+        assert "H1" in format_summary(summary)
+
+    @pytest.mark.asyncio
+    async def test_上限の組数で止める(self):
+        manager = make_manager("easy", "easy:tt_size=0")
+        summary = await MatchRunner(manager, max_pairs=3).run()
+        assert summary["pairs"] == 3
+        assert summary["wins"] + summary["draws"] + summary["losses"] == 6
+
+    @pytest.mark.asyncio
+    async def test_プロセスプールで打つ(self):
+        manager = make_manager("medium", "easy", workers=2)
+        summary = await MatchRunner(manager, SPRT(0, 50), max_pairs=20).run()
+        assert 1 <= summary["pairs"] <= 20
+        assert summary["games"] >= summary["pairs"] * 2
+        assert manager.statistics.total_games == summary["games"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [1, 2])
+    async def test_棋譜を定石ブックに渡す(self, workers):
+        manager = make_manager("easy", "easy:tt_size=0", workers=workers)
+        manager.book_builder = BookBuilder()
+        summary = await MatchRunner(manager, max_pairs=3).run()
+        assert manager.book_builder.games == summary["games"]
+        assert summary["games"] >= 6
+        assert all(
+            len(result.moves) == result.total_moves
+            for result in manager.statistics.results
+        )
+
+    @pytest.mark.asyncio
+    async def test_作り直せないAIはプロセスプールで打たない(self):
+        manager = make_manager("medium", "easy", workers=2)
+        manager.black_ai.mobility_weight = 0
+        with pytest.raises(ValueError):
+            await MatchRunner(manager).run()
+        assert manager.state == AutoPlayState.IDLE
+
+    @pytest.mark.asyncio
+    async def test_同じAI同士は比べない(self):
+        manager = make_manager("easy", "easy")
+        with pytest.raises(ValueError):
+            await MatchRunner(manager).run()
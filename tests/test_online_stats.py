@@ -0,0 +1,119 @@
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.auto_play_manager import GameResult, Statistics
+from game.board import Board
+from game.online_stats import QuantileSketch, RunningStats
+
+
+def make_result(
+    winner, black_score, white_score, total_moves, black="easy", white="medium"
+):
+    return GameResult(
+        winner=winner,
+        black_score=black_score,
+        white_score=white_score,
+        total_moves=total_moves,
+        black_ai_difficulty=black,
+        white_ai_difficulty=white,
+    )
+
+
+class TestRunningStats:
+    def test_空のとき(self):
+        stats = RunningStats()
+        assert stats.count == 0
+        assert stats.variance == 0.0
+
+    def test_平均と分散(self):
+        rng = random.Random(0)
+        values = [rng.uniform(-64, 64) for _ in range(1000)]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+        assert stats.count == 1000
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert stats.stdev == pytest.approx(statistics.stdev(values))
+        assert (stats.min, stats.max) == (min(values), max(values))
+
+
+class TestQuantileSketch:
+    def test_分位点(self):
+        rng = random.Random(1)
+        values = [rng.randint(-64, 64) for _ in range(1001)]
+        sketch = QuantileSketch(-64, 64)
+        for value in values:
+            sketch.add(value)
+        ordered = sorted(values)
+        assert sketch.quantile(0.0) == ordered[0]
+        assert sketch.quantile(0.5) == ordered[500]
+        assert sketch.quantile(1.0) == ordered[-1]
+        assert len(sketch.counts) == 129
+
+    def test_範囲外は端に丸める(self):
+        sketch = QuantileSketch(0, 60)
+        sketch.add(-5)
+        sketch.add(70)
+        assert sketch.quantile(0.0) == 0
+        assert sketch.quantile(1.0) == 60
+
+    def test_値がないときと不正な引数(self):
+        sketch = QuantileSketch(0, 10)
+        with pytest.raises(ValueError):
+            sketch.quantile(0.5)
+        sketch.add(3)
+        with pytest.raises(ValueError):
+            sketch.quantile(1.5)
+        with pytest.raises(ValueError):
+            QuantileSketch(5, 0)
+
+
+class TestOnlineStatistics:
+    def test_結果を残さずに集計(self):
+        stats = Statistics(keep_results=False)
+        stats.add_result(make_result(Board.BLACK, 40, 24, 60))
+        stats.add_result(make_result(Board.WHITE, 20, 44, 58))
+        stats.add_result(make_result(0, 32, 32, 60, "medium", "easy"))
+
+        assert stats.results == []
+        assert stats.total_games == 3
+        assert stats.get_average_moves() == pytest.approx(178 / 3)
+        assert stats.move_stats.mean == pytest.approx(178 / 3)
+        assert stats.margin_stats.mean == pytest.approx(-8 / 3)
+        assert stats.margin_stats.min == -24
+        assert stats.margin_stats.max == 16
+        assert stats.get_move_quantile(0.5) == 60
+        assert stats.get_margin_quantile(0.0) == -24
+
+    def test_組み合わせごとの集計(self):
+        stats = Statistics()
+        stats.add_result(make_result(Board.BLACK, 40, 24, 60))
+        stats.add_result(make_result(Board.WHITE, 20, 44, 58))
+        stats.add_result(make_result(0, 32, 32, 60, "medium", "easy"))
+
+        pairing = stats.pairings[("easy", "medium")]
+        assert (pairing.games, pairing.black_wins, pairing.white_wins) == (2, 1, 1)
+        assert pairing.margin.mean == -4
+        assert stats.pairings[("medium", "easy")].draws == 1
+
+    def test_結果をファイルに書き出す(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        stats = Statistics(keep_results=False, spill_path=str(path))
+        result = make_result(Board.BLACK, 40, 24, 60)
+        result.moves = [(2, 3, Board.BLACK)]
+        stats.add_result(result)
+        stats.add_result(make_result(Board.WHITE, 20, 44, 58))
+        stats.close()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == 2
+        assert records[0]["black_score"] == 40
+        assert records[0]["moves"] == [[2, 3, Board.BLACK]]
@@ -0,0 +1,139 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI
+from game.bitboard import BitBoard
+from game.board import Board
+from game.game import Game
+from game.opening_book import (
+    RECORD,
+    OpeningBook,
+    canonicalize,
+    canonicalize_move,
+    make_entry,
+    write_book,
+)
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    board = BitBoard()
+    entries = [make_entry(board, Board.BLACK, (2, 3), 5)]
+    board.place_stone(2, 3, Board.BLACK)
+    entries.append(make_entry(board, Board.WHITE, (2, 2), 3))
+    entries.append(make_entry(board, Board.WHITE, (2, 4), -2))
+    path = tmp_path / "book.bin"
+    write_book(path, entries)
+    return path
+
+
+class TestSymmetry:
+    def test_対称な局面は同じキー(self):
+        first = BitBoard()
+        first.place_stone(2, 3, Board.BLACK)
+        # (2, 3) と (5, 4) は初期配置から見て点対称
+        second = BitBoard()
+        second.place_stone(5, 4, Board.BLACK)
+        key1, _ = canonicalize(*first.get_bits(Board.BLACK), Board.WHITE)
+        key2, _ = canonicalize(*second.get_bits(Board.BLACK), Board.WHITE)
+        assert key1 == key2
+
+    def test_手番でキーが変わる(self):
+        bits = BitBoard().get_bits(Board.BLACK)
+        assert (
+            canonicalize(*bits, Board.BLACK)[0] != canonicalize(*bits, Board.WHITE)[0]
+        )
+
+    def test_対称な手はまとめる(self):
+        bits = BitBoard().get_bits(Board.BLACK)
+        squares = {
+            canonicalize_move(*bits, Board.BLACK, row * 8 + col)
+            for row, col in [(2, 3), (3, 2), (4, 5), (5, 4)]
+        }
+        assert len(squares) == 1
+
+
+class TestOpeningBook:
+    def test_ファイルは固定長レコード(self, book_path):
+        assert book_path.stat().st_size == RECORD.size * 3
+        with OpeningBook(book_path) as book:
+            assert len(book) == 3
+
+    def test_初期局面を引く(self, book_path):
+        with OpeningBook(book_path) as book:
+            moves = book.lookup(BitBoard(), Board.BLACK)
+            # 初期局面の4つの手は対称なので1つにまとめて保存される
+            assert [score for _, score in moves] == [5]
+            move, score = book.get_move(BitBoard(), Board.BLACK)
+            assert score == 5
+            assert move in BitBoard().get_valid_moves(Board.BLACK)
+
+    @pytest.mark.parametrize("first", [(2, 3), (3, 2), (4, 5), (5, 4)])
+    def test_対称な局面では手も変換される(self, book_path, first):
+        board = BitBoard()
+        board.place_stone(*first, Board.BLACK)
+        with OpeningBook(book_path) as book:
+            moves = book.lookup(board, Board.WHITE)
+        assert sorted(score for _, score in moves) == [-2, 3]
+        valid = board.get_valid_moves(Board.WHITE)
+        assert all(move in valid for move, _ in moves)
+
+        # (2, 3) に打った局面の (2, 2) は、対称な局面でも斜めに挟む手になる
+        best = max(moves, key=lambda item: item[1])[0]
+        flips = board.get_flips(best[0], best[1], Board.WHITE)
+        assert abs(best[0] - flips[0][0]) == abs(best[1] - flips[0][1]) == 1
+
+    def test_未登録の局面(self, book_path):
+        board = BitBoard()
+        board.place_stone(2, 3, Board.BLACK)
+        board.place_stone(2, 2, Board.WHITE)
+        with OpeningBook(book_path) as book:
+            assert book.lookup(board, Board.BLACK) == []
+            assert book.get_move(board, Board.BLACK) is None
+
+    def test_空のブック(self, tmp_path):
+        path = tmp_path / "empty.bin"
+        write_book(path, [])
+        with OpeningBook(path) as book:
+            assert len(book) == 0
+            assert book.get_move(BitBoard(), Board.BLACK) is None
+
+    def test_多数のレコードから二分探索(self, tmp_path):
+        entries = [(key * 7919, key % 100, key % 64) for key in range(5000)]
+        path = tmp_path / "large.bin"
+        write_book(path, entries)
+        with OpeningBook(path) as book:
+            for key in (0, 1, 2500, 4999):
+                assert book._lower_bound(key * 7919) == key
+            assert book._lower_bound(5000 * 7919) == 5000
+
+
+class TestAIWithBook:
+    def test_ブックの手を探索せずに返す(self, book_path):
+        game = Game()
+        ai = AI(difficulty="hard", book=book_path)
+        try:
+            move = ai.get_move(game)
+        finally:
+            ai.close()
+        assert move in game.get_valid_moves()
+        assert ai.last_search["book"] is True
+        assert ai.last_search["score"] == 5.0
+        assert ai.book is None
+
+    def test_ブックにない局面は探索する(self, book_path):
+        game = Game()
+        game.make_move(2, 3)
+        game.make_move(2, 2)
+        with OpeningBook(book_path) as book:
+            ai = AI(difficulty="hard", book=book, max_depth=2)
+            move = ai.get_move(game)
+            ai.close()
+            # 渡されたブックは閉じない
+            assert ai.book is book
+        assert move in game.get_valid_moves()
+        assert "book" not in ai.last_search
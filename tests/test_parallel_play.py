@@ -0,0 +1,173 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI
+from game.auto_play_manager import AutoPlayManager, AutoPlayState, PlayMode
+from game.game import Game
+from game.parallel_play import GamePool, play_game
+
+
+def replay(moves):
+    game = Game(use_bitboard=True)
+    for row, col, player in moves:
+        assert game.get_current_player() == player
+        assert game.make_move(row, col)
+    return game
+
+
+class TestPlayGame:
+    @pytest.mark.asyncio
+    async def test_逐次の自動対戦と同じ結果(self):
+        manager = AutoPlayManager()
+        manager.set_ai_players("medium", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        await manager.start()
+
+        result = play_game(Game(), AI("medium"), AI("medium"))
+        assert result == manager.statistics.results[0]
+
+
+class TestGamePool:
+    def test_シャードの大きさ(self):
+        pool = GamePool(workers=4)
+        assert pool.get_shard_size(1) == 1
+        assert pool.get_shard_size(100) == 7
+        assert pool.get_shard_size(100000) == 32
+
+    @pytest.mark.asyncio
+    async def test_全ての対局が届く(self):
+        with GamePool(workers=2) as pool:
+            results = [
+                result
+                async for result in pool.play(
+                    "easy",
+                    "medium",
+                    10,
+                    use_bitboard=True,
+                    seed=1,
+                    shard_size=3,
+                    record_moves=True,
+                )
+            ]
+        assert len(results) == 10
+        for result in results:
+            game = replay(result.moves)
+            assert game.is_game_over()
+            assert result.winner == game.get_winner()
+        # シャードごとに乱数を設定し直すので同じ対局ばかりにはならない
+        assert len({tuple(result.moves) for result in results}) > 1
+
+
+class TestAutoPlayWorkers:
+    @pytest.mark.asyncio
+    async def test_プロセスプールで対局(self):
+        manager = AutoPlayManager(use_bitboard=True)
+        manager.set_ai_players("easy", "medium")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(12)
+        manager.workers = 2
+        manager.seed = 0
+        ended = []
+        updates = []
+        manager.on_game_end = ended.append
+        manager.on_update = lambda: updates.append(manager.current_game_number)
+
+        await manager.start()
+
+        stats = manager.statistics
+        assert stats.total_games == 12
+        assert stats.black_wins + stats.white_wins + stats.draws == 12
+        assert len(ended) == 12
+        assert updates == list(range(1, 13))
+        assert manager.worker_utilisation
+        assert sum(result.black_score for result in ended) == stats.total_black_score
+        assert all(
+            result.black_score + result.white_score <= 64
+            and result.black_ai_difficulty == "easy"
+            and result.moves is None
+            for result in ended
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [1, 2])
+    async def test_変更した難易度で打ち同じ名前で集計(self, workers):
+        manager = AutoPlayManager()
+        manager.set_ai_players("easy", "easy")
+        manager.black_ai.difficulty = "medium"
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(4)
+        manager.workers = workers
+
+        await manager.start()
+
+        assert list(manager.statistics.pairings) == [("medium", "easy")]
+
+    @pytest.mark.asyncio
+    async def test_直接作ったAIも同じ設定で打つ(self):
+        manager = AutoPlayManager()
+        manager.black_ai = AI("hard", max_depth=1, time_limit=None)
+        manager.white_ai = AI("easy")
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.set_target_games(2)
+        manager.workers = 2
+
+        await manager.start()
+
+        assert list(manager.statistics.pairings) == [
+            ("hard:time_limit=None,max_depth=1", "easy")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_作り直せないAIは断る(self):
+        manager = AutoPlayManager()
+        manager.set_ai_players("medium", "easy")
+        manager.black_ai.corner_weight = 0
+        manager.set_play_mode(PlayMode.INSTANT)
+        manager.workers = 2
+
+        with pytest.raises(ValueError):
+            await manager.start()
+        assert manager.state == AutoPlayState.IDLE
+
+
+class TestScheduler:
+    def test_重い組み合わせは小さく先に渡す(self):
+        pool = GamePool(workers=2)
+        shards = pool.make_shards([("easy", "easy", 40), ("hard", "easy", 3)])
+        assert shards[:3] == [("hard", "easy", 1)] * 3
+        assert all(pairing[:2] == ("easy", "easy") for pairing in shards[3:])
+        assert sum(count for _, _, count in shards) == 43
+
+    @pytest.mark.asyncio
+    async def test_組み合わせを混ぜて打つ(self):
+        pairings = [("easy", "medium", 5), ("medium", "easy", 4), ("easy", "easy", 3)]
+        with GamePool(workers=2) as pool:
+            results = [
+                result
+                async for result in pool.play_pairings(pairings, seed=0, shard_size=2)
+            ]
+            utilisation = pool.get_utilisation()
+            stats = pool.worker_stats
+            last_run = pool.last_run
+
+        counts = {}
+        for result in results:
+            key = (result.black_ai_difficulty, result.white_ai_difficulty)
+            counts[key] = counts.get(key, 0) + 1
+        assert counts == {
+            ("easy", "medium"): 5,
+            ("medium", "easy"): 4,
+            ("easy", "easy"): 3,
+        }
+
+        assert last_run["games"] == 12
+        assert last_run["shards"] == 7
+        assert sum(worker.games for worker in stats.values()) == 12
+        assert sum(worker.chunks for worker in stats.values()) == 7
+        assert 1 <= len(stats) <= 2
+        assert utilisation.keys() == stats.keys()
+        assert all(0 < value <= 1 for value in utilisation.values())
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI
+from game.bitboard import BitBoard
+from game.board import Board
+from game.game import Game
+from game.parallel_search import ParallelSearch, benchmark
+
+# 置換表を使わず手順も固定にして、逐次探索と結果を比べられるようにする
+AI_OPTIONS = {"tt_size": 0, "move_ordering": False}
+
+
+@pytest.fixture(scope="module")
+def parallel_search():
+    with ParallelSearch(2, AI_OPTIONS) as search:
+        yield search
+
+
+class TestParallelSearch:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_逐次探索と同じ手と評価値(self, parallel_search, seed, random_position):
+        board, player = random_position(seed, 12)
+        serial = AI(difficulty="hard", **AI_OPTIONS)
+        expected_score, expected_move = serial._search_root(
+            board, 3, player, board.get_valid_moves_mask(player), None
+        )
+
+        move, score = parallel_search.search(board, player, 3)
+        assert move == expected_move
+        assert score == expected_score
+        assert parallel_search.nodes > 0
+
+    def test_反復深化(self, parallel_search, random_position):
+        board, player = random_position(5, 10)
+        move, _ = parallel_search.iterative_deepening(board, player, max_depth=3)
+        assert move in board.get_valid_moves(player)
+        assert parallel_search.last_search["depth"] == 3
+        assert parallel_search.last_search["workers"] == 2
+
+    def test_合法手がない(self, parallel_search):
+        board = BitBoard()
+        board.grid = [[Board.BLACK for _ in range(8)] for _ in range(8)]
+        board.set_cell(0, 0, Board.EMPTY)
+        assert parallel_search.search(board, Board.WHITE, 2) == (None, float("-inf"))
+
+    def test_ベンチマーク(self, random_position):
+        board, player = random_position(0, 8)
+        rows = benchmark(board, player, 2, worker_counts=(1, 2), ai_options=AI_OPTIONS)
+        assert [row["workers"] for row in rows] == [1, 2]
+        assert rows[0]["speedup"] == 1.0
+        assert rows[0]["move"] == rows[1]["move"]
+
+
+class TestAIWorkers:
+    def test_並列モードで合法手を返す(self):
+        game = Game(use_bitboard=True)
+        ai = AI(difficulty="hard", workers=2, max_depth=2, time_limit=None)
+        try:
+            move = ai.get_move(game)
+        finally:
+            ai.close()
+        assert move in game.get_valid_moves()
+        assert ai.last_search["workers"] == 2
+        assert ai.last_search["depth"] == 2
+
+    def test_置換表なしならワーカーも置換表を持たない(self):
+        game = Game(use_bitboard=True)
+        ai = AI(difficulty="hard", workers=2, max_depth=2, time_limit=None, tt_size=0)
+        try:
+            ai.get_move(game)
+            assert ai._parallel_search.ai_options["tt_size"] == 0
+            assert ai._parallel_search.shared_tt is None
+        finally:
+            ai.close()
+
+
+class TestSharedTable:
+    def test_共有置換表を使う並列探索(self, random_position):
+        board, player = random_position(2, 10)
+        with ParallelSearch(2, shared_tt_size=1 << 12) as search:
+            assert search.ai_options["tt_size"] == 0
+            first = search.search(board, player, 3)
+            second = search.search(board, player, 3)
+            assert search.tt_stats["hits"] > 0
+            assert search.tt_stats["hit_rate"] > 0
+        assert first[0] in board.get_valid_moves(player)
+        assert second[0] in board.get_valid_moves(player)
+        assert search.shared_tt is None
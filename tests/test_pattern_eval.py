@@ -0,0 +1,115 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI, PATTERN_EVALUATOR, SQUARE_VALUES
+from game.bitboard import BitBoard
+from game.board import Board
+from game.game import Game
+from game.pattern_eval import (
+    PATTERN_SCALE,
+    PATTERN_SHAPES,
+    _get_instances,
+    get_line_bytes,
+    get_pattern_evaluator,
+)
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    return get_pattern_evaluator(tuple(SQUARE_VALUES))
+
+
+def random_bits(seed):
+    rng = random.Random(seed)
+    own = rng.getrandbits(64)
+    opp = rng.getrandbits(64) & ~own
+    return own, opp
+
+
+def naive_index(own, opp, squares):
+    index = 0
+    for i, (row, col) in enumerate(squares):
+        bit = 1 << (row * 8 + col)
+        index += (1 if own & bit else 2 if opp & bit else 0) * 3**i
+    return index
+
+
+class TestPatternEvaluator:
+    def test_パターン数(self, evaluator):
+        # 辺4・隅3x3 4・隅2x5 8・斜め8マス2・斜め7〜4マス各4
+        assert evaluator.pattern_count == 4 + 4 + 8 + 2 + 4 * 4
+        for name, shape in PATTERN_SHAPES.items():
+            assert len(evaluator.weights[name]) == 3 ** len(shape)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_添字はマスごとに数えた値と一致(self, evaluator, seed):
+        own, opp = random_bits(seed)
+        expected = [naive_index(own, opp, sq) for _, sq in _get_instances()]
+        assert evaluator.get_indices(own, opp) == expected
+
+    def test_線の取り出し(self):
+        # (2, 3) は3行目・4列目・row-col=-1 の斜め・row+col=5 の斜めに乗る
+        lines = get_line_bytes(1 << (2 * 8 + 3))
+        assert [i for i, byte in enumerate(lines) if byte] == [2, 8 + 3, 16 + 7, 24 + 6]
+
+    def test_初期配置は0(self, evaluator):
+        own, opp = BitBoard().get_bits(Board.BLACK)
+        assert evaluator.evaluate(own, opp) == 0
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_手番を入れ替えると符号反転(self, evaluator, seed):
+        own, opp = random_bits(seed)
+        assert evaluator.evaluate(own, opp) == -evaluator.evaluate(opp, own)
+
+    def test_隅がないときはマスの評価値の合計に近い(self, evaluator):
+        own = 1 << (2 * 8 + 2) | 1 << (3 * 8 + 0)
+        opp = 1 << (5 * 8 + 5)
+        expected = (SQUARE_VALUES[18] + SQUARE_VALUES[24] - SQUARE_VALUES[45]) * 8
+        assert abs(evaluator.evaluate(own, opp) - expected) <= evaluator.pattern_count
+
+    def test_隅を取っていればX打ちの減点がない(self, evaluator):
+        x_square = 1 << (1 * 8 + 1)
+        corner = 1 << 0
+        without_corner = evaluator.evaluate(x_square, 0)
+        with_corner = evaluator.evaluate(x_square | corner, 0)
+        assert without_corner < 0
+        assert with_corner - evaluator.evaluate(corner, 0) == 0
+
+    def test_同じ表を使い回す(self):
+        assert get_pattern_evaluator(tuple(SQUARE_VALUES)) is get_pattern_evaluator(
+            tuple(SQUARE_VALUES)
+        )
+
+
+class TestAIPatternEvaluator:
+    def test_評価関数の切り替え(self):
+        ai = AI(difficulty="hard", evaluator=PATTERN_EVALUATOR)
+        board = Board()
+        for col in range(8):
+            board.grid[0][col] = Board.BLACK
+        assert ai.evaluate_board(board, Board.BLACK) > 0
+        assert ai.evaluate_board(board, Board.WHITE) < 0
+
+    def test_可動性も加える(self):
+        ai = AI(evaluator=PATTERN_EVALUATOR)
+        board = BitBoard()
+        board.place_stone(2, 3, Board.BLACK)
+        own, opp = board.get_bits(Board.WHITE)
+        mobility = (
+            len(board.get_valid_moves(Board.WHITE))
+            - len(board.get_valid_moves(Board.BLACK))
+        ) * ai.mobility_weight
+        expected = ai.pattern_evaluator.evaluate(own, opp) + mobility * PATTERN_SCALE
+        assert ai.evaluate_board(board, Board.WHITE) == expected
+
+    def test_探索で合法手を返す(self):
+        game = Game(use_bitboard=True)
+        ai = AI(difficulty="hard", evaluator=PATTERN_EVALUATOR, max_depth=3)
+        move = ai.get_move(game)
+        assert move in game.get_valid_moves()
+        assert ai.last_search["depth"] == 3
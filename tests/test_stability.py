@@ -0,0 +1,118 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI
+from game.bitboard import BitBoard
+from game.board import Board
+from game.endgame import EndgameSolver
+from game.stability import (
+    EDGE_TABLE_SIZE,
+    build_edge_table,
+    count_stable,
+    get_edge_stable,
+    get_stable,
+    load_edge_table,
+)
+
+
+class TestEdgeTable:
+    def test_隅から続く石は確定(self):
+        table = load_edge_table()
+        assert table[0b00000111 * 256 + 0b00001000] == 0b00000111
+        assert table[0b00000001 * 256] == 0b00000001
+
+    def test_隅がなければ確定しない(self):
+        table = load_edge_table()
+        assert table[0b00011000 * 256 + 0b00100000] == 0
+
+    def test_埋まった辺は全て確定(self):
+        table = load_edge_table()
+        assert table[0b10101010 * 256 + 0b01010101] == 0b10101010
+
+    def test_キャッシュファイル(self, tmp_path):
+        path = tmp_path / "edge.bin"
+        table = load_edge_table(path)
+        assert path.read_bytes() == table
+        assert load_edge_table(path) == table
+
+    def test_壊れたキャッシュは作り直す(self, tmp_path):
+        path = tmp_path / "edge.bin"
+        path.write_bytes(b"broken")
+        table = load_edge_table(path)
+        assert len(table) == EDGE_TABLE_SIZE
+        assert table == build_edge_table()
+        assert path.stat().st_size == EDGE_TABLE_SIZE
+
+
+class TestStableDiscs:
+    def test_初期配置に確定石はない(self):
+        own, opp = BitBoard().get_bits(Board.BLACK)
+        assert get_stable(own, opp) == 0
+
+    def test_埋まった盤面は全て確定(self):
+        board = BitBoard()
+        board.grid = [
+            [Board.BLACK if (row * col) % 3 else Board.WHITE for col in range(8)]
+            for row in range(8)
+        ]
+        own, opp = board.get_bits(Board.BLACK)
+        assert get_stable(own, opp) == own
+        assert get_stable(opp, own) == opp
+
+    def test_左の辺も引ける(self):
+        own = 1 << 0 | 1 << 8 | 1 << 16
+        assert get_edge_stable(own, 0) == own
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_確定石は最後まで返されない(self, seed, random_position):
+        board, player = random_position(seed, 30 + seed)
+        rng = random.Random(seed)
+        stable = {
+            color: get_stable(*board.get_bits(color))
+            for color in (Board.BLACK, Board.WHITE)
+        }
+        while True:
+            moves = board.get_valid_moves(player)
+            if not moves:
+                player = board.get_opponent(player)
+                moves = board.get_valid_moves(player)
+                if not moves:
+                    break
+            board.place_stone(*rng.choice(moves), player)
+            player = board.get_opponent(player)
+            for color, mask in stable.items():
+                own, _ = board.get_bits(color)
+                assert own & mask == mask
+
+
+class TestStabilityInSearch:
+    def test_評価関数に確定石を加える(self):
+        board = BitBoard()
+        board.place_stone(2, 3, Board.BLACK)
+        board.set_cell(0, 0, Board.BLACK)
+        board.set_cell(0, 1, Board.BLACK)
+
+        ai = AI()
+        without = AI()
+        without.stability_weight = 0
+        own, opp = board.get_bits(Board.BLACK)
+        expected = (count_stable(own, opp) - count_stable(opp, own)) * 10
+        assert expected == 20
+        diff = ai.evaluate_board(board, Board.BLACK) - without.evaluate_board(
+            board, Board.BLACK
+        )
+        assert diff == expected
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_確定石の枝刈りで結果が変わらない(self, seed, random_position):
+        board, player = random_position(seed, 50)
+        with_cutoff = EndgameSolver()
+        without_cutoff = EndgameSolver(stability_cutoff=False)
+        score, _ = with_cutoff.solve(board, player)
+        assert without_cutoff.solve(board, player)[0] == score
+        assert with_cutoff.nodes <= without_cutoff.nodes
@@ -0,0 +1,85 @@
+import asyncio
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.auto_play_manager import GameResult
+from game.board import Board
+from game.tournament import (
+    GAUNTLET,
+    ROUND_ROBIN,
+    Standings,
+    main,
+    make_pairings,
+    run_tournament,
+)
+
+
+class TestPairings:
+    def test_総当たり(self):
+        pairings = make_pairings(["a", "b", "c"], ROUND_ROBIN, 2)
+        assert len(pairings) == 6
+        assert ("a", "b", 2) in pairings and ("b", "a", 2) in pairings
+        assert ("c", "b", 2) in pairings
+
+    def test_ガントレット(self):
+        pairings = make_pairings(["a", "b", "c"], GAUNTLET, 1)
+        assert pairings == [("a", "b", 1), ("b", "a", 1), ("a", "c", 1), ("c", "a", 1)]
+
+    def test_参加者が足りない(self):
+        with pytest.raises(ValueError):
+            make_pairings(["a"], ROUND_ROBIN, 1)
+
+
+class TestStandings:
+    def test_勝ち点と石差(self):
+        standings = Standings(["a", "b"])
+        standings.add_result(GameResult(Board.BLACK, 40, 24, 60, "a", "b"))
+        standings.add_result(GameResult(0, 32, 32, 60, "b", "a"))
+        a = standings.players["a"]
+        assert (a.games, a.wins, a.losses, a.draws) == (2, 1, 0, 1)
+        assert a.points == 1.5
+        assert a.average_disc_diff == 8.0
+        assert [player for player, _ in standings.rows()] == ["a", "b"]
+        assert "75.0%" in standings.format()
+
+
+class TestRunTournament:
+    def test_終局ごとにJSONを1行書く(self):
+        output = io.StringIO()
+        pairings = make_pairings(["easy", "medium"], ROUND_ROBIN, 2)
+        standings = asyncio.run(
+            run_tournament(pairings, output, seed=0, record_moves=True)
+        )
+
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 4
+        records = [json.loads(line) for line in lines]
+        assert [record["game"] for record in records] == [1, 2, 3, 4]
+        assert all(len(record["moves"]) == record["total_moves"] for record in records)
+        assert standings.players["easy"].games == 4
+        assert standings.players["medium"].games == 4
+
+    def test_コマンドライン(self, tmp_path, capsys):
+        path = tmp_path / "games.jsonl"
+        main(["easy", "medium", "--games", "1", "--workers", "2", "-o", str(path)])
+        assert len(path.read_text().splitlines()) == 2
+        summary = capsys.readouterr().out
+        assert summary.splitlines()[0].startswith("player")
+        assert "easy" in summary and "medium" in summary
+
+    def test_標準出力にはJSONだけを書く(self, capsys):
+        main(["easy", "hard:max_depth=1,time_limit=0.05", "--games", "1"])
+        captured = capsys.readouterr()
+        records = [json.loads(line) for line in captured.out.splitlines()]
+        assert all(record["moves"] is None for record in records)
+        assert {record["black_ai_difficulty"] for record in records} == {
+            "easy",
+            "hard:max_depth=1,time_limit=0.05",
+        }
+        assert "score%" in captured.err
@@ -0,0 +1,183 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.ai import AI
+from game.bitboard import BitBoard
+from game.board import Board
+from game.transposition import (
+    ENTRY_BYTES,
+    EXACT,
+    LOWER,
+    UPPER,
+    SharedTranspositionTable,
+    TranspositionTable,
+)
+
+
+class TestTranspositionTable:
+    def test_保存と取得(self):
+        tt = TranspositionTable(16)
+        tt.store(12345, 3, 10.0, EXACT, (2, 3))
+        assert tt.probe(12345) == (12345, 3, 10.0, EXACT, (2, 3))
+        assert tt.hits == 1
+
+    def test_未登録キーはミス(self):
+        tt = TranspositionTable(16)
+        assert tt.probe(1) is None
+        assert tt.misses == 1
+        assert tt.collisions == 0
+
+    def test_深さ優先スロットを浅い結果で上書きしない(self):
+        tt = TranspositionTable(2)  # 1バケットのみ
+        tt.store(1, 5, 1.0, EXACT, None)
+        tt.store(2, 1, 2.0, LOWER, None)
+        tt.store(3, 2, 3.0, UPPER, None)
+
+        assert tt.probe(1) is not None
+        assert tt.probe(2) is None
+        assert tt.probe(3) is not None
+        assert tt.collisions == 1
+        assert tt.overwrites == 1
+
+    def test_深い結果は深さ優先スロットを置き換える(self):
+        tt = TranspositionTable(2)
+        tt.store(1, 2, 1.0, EXACT, None)
+        tt.store(2, 4, 2.0, EXACT, None)
+        assert tt.probe(2)[1] == 4
+        assert tt.probe(1) is None
+
+    def test_統計とクリア(self):
+        tt = TranspositionTable(8)
+        tt.store(1, 1, 0.0, EXACT, None)
+        tt.probe(1)
+        tt.probe(2)
+        stats = tt.get_stats()
+        assert stats["size"] == 8
+        assert stats["used"] == 1
+        assert stats["hit_rate"] == 0.5
+
+        tt.clear()
+        assert tt.get_stats()["used"] == 0
+        assert tt.hits == 0
+
+
+class TestMinimaxWithTable:
+    @pytest.mark.parametrize("seed", range(4))
+    def test_置換表の有無で評価値が一致(self, seed, random_position):
+        board, player = random_position(seed, 10)
+        with_tt = AI(difficulty="hard")
+        without_tt = AI(difficulty="hard", tt_size=0)
+
+        score1, _ = with_tt.minimax(board, 3, player, float("-inf"), float("inf"), True)
+        score2, _ = without_tt.minimax(
+            board, 3, player, float("-inf"), float("inf"), True
+        )
+        assert score1 == score2
+
+    def test_再探索は置換表で打ち切られる(self):
+        ai = AI(difficulty="hard")
+        board = BitBoard()
+        ai.minimax(board, 3, Board.BLACK, float("-inf"), float("inf"), True)
+        ai.nodes = 0
+        _, move = ai.minimax(board, 3, Board.BLACK, float("-inf"), float("inf"), True)
+        assert ai.nodes == 1
+        assert move in board.get_valid_moves(Board.BLACK)
+        assert ai.tt.get_stats()["hits"] > 0
+
+    def test_最小化側は符号反転(self):
+        ai = AI(tt_size=0)
+        board = Board()
+        score_max, _ = ai.minimax(
+            board, 2, Board.BLACK, float("-inf"), float("inf"), True
+        )
+        score_min, _ = ai.minimax(
+            board, 2, Board.BLACK, float("-inf"), float("inf"), False
+        )
+        assert score_min == -score_max
+
+
+class TestSharedTranspositionTable:
+    def test_保存と取得(self):
+        tt = SharedTranspositionTable(16)
+        try:
+            tt.store(12345, 3, -10.5, LOWER, (7, 7))
+            tt.store(99, 0, float("-inf"), UPPER, None)
+            assert tt.probe(12345) == (12345, 3, -10.5, LOWER, (7, 7))
+            assert tt.probe(99) == (99, 0, float("-inf"), UPPER, None)
+            assert tt.probe(1) is None
+            assert tt.get_stats()["hit_rate"] == 2 / 3
+        finally:
+            tt.close()
+
+    def test_64ビットのキー(self):
+        tt = SharedTranspositionTable(16)
+        try:
+            key = (1 << 64) - 3
+            tt.store(key, 2, 1.0, EXACT, (0, 0))
+            assert tt.probe(key)[0] == key
+        finally:
+            tt.close()
+
+    def test_置換方針は通常の表と同じ(self):
+        tt = SharedTranspositionTable(2)
+        try:
+            tt.store(1, 5, 1.0, EXACT, None)
+            tt.store(2, 1, 2.0, LOWER, None)
+            tt.store(3, 2, 3.0, UPPER, None)
+            assert tt.probe(1) is not None
+            assert tt.probe(2) is None
+            assert tt.overwrites == 1
+        finally:
+            tt.close()
+
+    def test_メモリ上限(self):
+        tt = SharedTranspositionTable(1 << 20, max_bytes=ENTRY_BYTES * 100)
+        try:
+            assert tt.size == 100
+            assert tt.get_stats()["bytes"] <= ENTRY_BYTES * 100
+        finally:
+            tt.close()
+
+    def test_壊れたエントリはミスになる(self):
+        tt = SharedTranspositionTable(2)
+        try:
+            tt.store(1, 5, 1.0, EXACT, None)
+            # 書き込み途中を模してキー検証用のワードだけ書き換える
+            tt._words[0] ^= 1 << 40
+            assert tt.probe(1) is None
+        finally:
+            tt.close()
+
+    def test_別プロセスから読み書きできる(self):
+        tt = SharedTranspositionTable(64)
+        try:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                executor.submit(_store_in_worker, tt, 42).result()
+            assert tt.probe(42) == (42, 4, 7.0, EXACT, (2, 3))
+            assert tt.get_stats()["used"] == 1
+        finally:
+            tt.close()
+
+    def test_共有置換表でのAI探索(self, random_position):
+        board, player = random_position(1, 10)
+        tt = SharedTranspositionTable(1 << 12)
+        ai = AI(difficulty="hard", tt_size=0)
+        ai.tt = tt
+        try:
+            score1, _ = ai.minimax(board, 3, player, float("-inf"), float("inf"), True)
+            ai.nodes = 0
+            score2, _ = ai.minimax(board, 3, player, float("-inf"), float("inf"), True)
+        finally:
+            tt.close()
+        assert score1 == score2
+        assert ai.nodes == 1
+
+
+def _store_in_worker(tt, key):
+    tt.store(key, 4, 7.0, EXACT, (2, 3))
+    tt.close()
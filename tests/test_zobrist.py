@@ -0,0 +1,94 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from game.bitboard import BitBoard
+from game.board import Board
+from game.game import Game
+from game.zobrist import compute_hash, side_key
+
+
+def recomputed_hash(board):
+    black, _ = board.get_bits(Board.BLACK)
+    white, _ = board.get_bits(Board.WHITE)
+    return compute_hash(black, white)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+class TestIncrementalHash:
+    def test_初期局面(self, board_class):
+        board = board_class()
+        assert board.hash == recomputed_hash(board)
+        assert board.hash == Board().hash
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_着手と取り消しで再計算と一致(self, board_class, seed):
+        rng = random.Random(seed)
+        board = board_class()
+        player = Board.BLACK
+        records = []
+        hashes = [board.hash]
+
+        while True:
+            moves = board.get_valid_moves(player)
+            if not moves:
+                player = board.get_opponent(player)
+                moves = board.get_valid_moves(player)
+                if not moves:
+                    break
+            row, col = rng.choice(moves)
+            records.append(board.apply_move(row, col, player))
+            assert board.hash == recomputed_hash(board)
+            hashes.append(board.hash)
+            player = board.get_opponent(player)
+
+        for record in reversed(records):
+            board.unmake_move(record)
+            hashes.pop()
+            assert board.hash == hashes[-1] == recomputed_hash(board)
+
+    def test_セルの直接書き換えで再計算と一致(self, board_class):
+        board = board_class()
+        board.set_cell(0, 0, Board.BLACK)
+        board.set_cell(3, 3, Board.BLACK)
+        board.grid[7][7] = Board.WHITE
+        board.set_cell(3, 4, Board.EMPTY)
+        assert board.hash == recomputed_hash(board)
+
+        board.grid = [[Board.WHITE for _ in range(8)] for _ in range(8)]
+        assert board.hash == recomputed_hash(board)
+
+    def test_コピーは同じハッシュ(self, board_class):
+        board = board_class()
+        board.place_stone(2, 3, Board.BLACK)
+        assert board.copy().hash == board.hash
+
+
+class TestPositionKey:
+    def test_手番で値が変わる(self):
+        board = Board()
+        assert board.position_hash(Board.BLACK) != board.position_hash(Board.WHITE)
+        assert board.position_hash(Board.WHITE) == board.hash ^ side_key(Board.WHITE)
+
+    def test_手順違いの同一局面(self):
+        game1 = Game()
+        for move in [(2, 3), (2, 2), (3, 2)]:
+            game1.make_move(*move)
+        game2 = Game(use_bitboard=True)
+        for move in [(3, 2), (2, 2), (2, 3)]:
+            game2.make_move(*move)
+
+        assert game1.get_board_state() == game2.get_board_state()
+        assert game1.position_key() == game2.position_key()
+
+    def test_アンドゥで元のキーに戻る(self):
+        game = Game()
+        key = game.position_key()
+        game.make_move(2, 3)
+        assert game.position_key() != key
+        game.undo()
+        assert game.position_key() == key